@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Benchmark A/B: Esquema Original frente a Compacto (id_zona y estado SMALLINT)
+Proyecto: Fredys Food Database Performance Analysis
+
+Para cada escala se siembra la base original con main.py (--fast-faker), se
+crean los índices de measure_performance.py y se copian ZonaEntrega, Pedido,
+Vive y Cubre en su forma compacta al esquema SCHEMA
+(compact.build_compact_copy), con los mismos índices reescritos. Las
+consultas originales se ejecutan sobre public y las de compact.COMPACT_QUERIES
+con search_path apuntando a SCHEMA; el resto de tablas son las mismas.
+
+Se reporta por tabla el ancho medio de fila, el tamaño del heap y de sus
+índices, y por consulta el tiempo de ejecución (EXPLAIN ANALYZE, mediana de
+RUNS).
+
+Uso: python benchmark_compact.py [escala ...]   (por defecto: 1000 10000 100000 1000000)
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+import main as seeder
+from compact import COMPACT_QUERIES, COMPACT_TABLES, build_compact_copy, compact_index, is_compact
+from measure_performance import DatabasePerformanceTester
+
+SCALES = [1000, 10000, 100000, 1000000]
+RUNS = 5
+SCHEMA = 'compacto'
+# Variante -> esquema de las tablas compactables
+VARIANTS = {'original': 'public', 'compacto': SCHEMA}
+
+
+def seed(scale):
+    command = [sys.executable, 'main.py', str(scale), '--fast-faker']
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"❌ Error sembrando {scale:,} registros: {result.stderr}")
+        return False
+    return True
+
+
+def table_sizes(cursor, schema):
+    """tabla -> ancho medio de fila (bytes), tamaño del heap y de sus índices"""
+    sizes = {}
+    for table in COMPACT_TABLES:
+        relation = f"{schema}.{table}"
+        cursor.execute(f"SELECT COALESCE(avg(pg_column_size(t.*)), 0)::float, "
+                       f"pg_table_size(%s::regclass), pg_indexes_size(%s::regclass) FROM {relation} t",
+                       (relation, relation))
+        width, heap, indexes = cursor.fetchone()
+        sizes[table] = {'row_bytes': width, 'heap_bytes': heap, 'index_bytes': indexes}
+    return sizes
+
+
+def measure(cursor, sql):
+    times = []
+    for i in range(RUNS + 1):
+        cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}")
+        if i > 0:
+            times.append(cursor.fetchone()[0][0]['Execution Time'])
+    return statistics.median(times)
+
+
+def run_scale(scale, tester, queries):
+    print(f"\n🔄 Sembrando {scale:,} registros base...")
+    if not seed(scale):
+        return None
+    conn = seeder.connect_db()
+    conn.autocommit = True
+    cur = conn.cursor()
+    if is_compact(cur):
+        print("❌ La base ya usa el esquema compacto: cree el original con create_schema.sql para comparar")
+        conn.close()
+        return None
+
+    tester.drop_indexes()
+    tester.create_indexes()
+    build_compact_copy(cur, SCHEMA)
+    for group in tester.get_index_definitions().values():
+        for sql in filter(None, (compact_index(sql, SCHEMA) for sql in group)):
+            cur.execute(sql)
+    cur.execute("ANALYZE")
+
+    results = {'tables': {variant: table_sizes(cur, schema) for variant, schema in VARIANTS.items()},
+               'queries': {}}
+    for query_id, query in queries.items():
+        cur.execute("RESET search_path")
+        original = measure(cur, query['sql'])
+        cur.execute(f"SET search_path TO {SCHEMA}, public")
+        compacted = measure(cur, COMPACT_QUERIES[query_id])
+        results['queries'][query_id] = {'original_ms': original, 'compacto_ms': compacted}
+        print(f"  {query_id}: original {original:.2f} ms, compacto {compacted:.2f} ms")
+    cur.execute("RESET search_path")
+
+    cur.execute(f"DROP SCHEMA {SCHEMA} CASCADE")
+    cur.close()
+    conn.close()
+    return results
+
+
+def print_summary(results):
+    print("\n" + "=" * 84)
+    print("📊 ESQUEMA ORIGINAL FRENTE A COMPACTO (id_zona entero, estado SMALLINT)")
+    print("=" * 84)
+    print(f"{'Escala':>10}  {'Tabla':<12}{'Fila B':>9}{'→':>3}{'Fila B':>8}{'Heap MB':>10}{'→':>3}"
+          f"{'Heap MB':>9}{'Índ. MB':>10}{'→':>3}{'Índ. MB':>9}")
+    for scale, result in results.items():
+        original, compacted = result['tables']['original'], result['tables']['compacto']
+        for table in COMPACT_TABLES:
+            a, b = original[table], compacted[table]
+            print(f"{scale:>10,}  {table:<12}{a['row_bytes']:>9.1f}{'':>3}{b['row_bytes']:>8.1f}"
+                  f"{a['heap_bytes'] / 1e6:>10.2f}{'':>3}{b['heap_bytes'] / 1e6:>9.2f}"
+                  f"{a['index_bytes'] / 1e6:>10.2f}{'':>3}{b['index_bytes'] / 1e6:>9.2f}")
+    print(f"\n{'Escala':>10}  {'Consulta':<12}{'Original (ms)':>15}{'Compacto (ms)':>15}{'Mejora':>9}")
+    for scale, result in results.items():
+        for query_id, entry in result['queries'].items():
+            original, compacted = entry['original_ms'], entry['compacto_ms']
+            ratio = f"{original / compacted:>8.2f}x" if compacted > 0 else f"{'N/A':>9}"
+            print(f"{scale:>10,}  {query_id:<12}{original:>15.2f}{compacted:>15.2f}{ratio}")
+
+
+def main():
+    try:
+        scales = [int(arg) for arg in sys.argv[1:]] or SCALES
+    except ValueError:
+        print(__doc__)
+        sys.exit(1)
+
+    print(f"🎯 BENCHMARK DE ESQUEMA COMPACTO - escalas: {', '.join(f'{s:,}' for s in scales)}")
+    tester = DatabasePerformanceTester()
+    queries = tester.get_query_definitions()
+    results = {}
+    for scale in scales:
+        result = run_scale(scale, tester, queries)
+        if result:
+            results[scale] = result
+
+    if not results:
+        return
+    print_summary(results)
+    output = "compact_benchmark.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'timestamp': datetime.now().isoformat(),
+            'runs': RUNS,
+            'results': results
+        }, f, indent=2, ensure_ascii=False)
+    print(f"\n📁 Resultados guardados en: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Benchmark de Controladores: psycopg2 frente a psycopg 3
+Proyecto: Fredys Food Database Performance Analysis
+
+Dos mediciones con cada controlador de db_driver.py:
+- Carga: siembra la misma base (misma semilla) con cada estrategia de
+  loader.py y reporta filas/segundo y esperas de respuesta del servidor
+  (round trips) estimadas según el protocolo de cada estrategia, no medidas. psycopg 3 envía los INSERT en pipeline mode y los COPY con
+  write_row. Solo se cronometra el envío de filas, no su generación.
+- Consultas: ejecuta QUERY_RUNS veces cada consulta de measure_performance.py
+  con psycopg2, con psycopg 3 sin preparar y con psycopg 3 preparada en el
+  servidor (se analiza y planifica una sola vez). Cada controlador estima
+  las esperas de respuesta de sus execute() de la misma forma.
+
+Uso: python benchmark_driver.py <num_registros_base> [estrategia ...]
+"""
+
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+import main as seeder
+from db_driver import DRIVERS, get_driver
+from loader import STRATEGIES
+from measure_performance import DatabasePerformanceTester
+
+BENCHMARK_SEED = 2025
+QUERY_RUNS = 30
+# Modo de consulta -> (controlador, preparar en el servidor)
+QUERY_MODES = {
+    'psycopg2': ('psycopg2', False),
+    'psycopg': ('psycopg', False),
+    'psycopg+prepare': ('psycopg', True),
+}
+
+
+class _MaterializedLoader:
+    """Genera todas las filas de la tabla antes de cronometrar la inserción"""
+
+    def __init__(self, loader):
+        self.loader = loader
+        self.cursor = loader.cursor
+        self.stats = loader.stats
+
+    def insert(self, table, columns, rows):
+        return self.loader.insert(table, columns, list(rows))
+
+
+def run_load(driver, strategy, n):
+    """Sembrar n registros base; devuelve las estadísticas por tabla del loader"""
+    conn = driver.connect(seeder.DB_PARAMS)
+    cur = conn.cursor()
+    cur.execute(f"TRUNCATE {', '.join(seeder.ALL_TABLES)} RESTART IDENTITY CASCADE")
+    conn.commit()
+
+    gen = seeder.DataGenerator(seed=BENCHMARK_SEED, workers=os.cpu_count() or 1)
+    loader = driver.loader(cur, strategy)
+    seeder.seed_database(_MaterializedLoader(loader), gen, n)
+    conn.commit()
+    cur.close()
+    conn.close()
+    return loader.stats
+
+
+def run_queries(driver, prepare, queries):
+    """Milisegundos (cliente) de cada ejecución de cada consulta, tras una de calentamiento"""
+    conn = driver.connect(seeder.DB_PARAMS)
+    conn.autocommit = True
+    cur = conn.cursor()
+    results = {}
+    for query_id, query in queries.items():
+        times = []
+        trips = driver.round_trips
+        for i in range(QUERY_RUNS + 1):
+            start = time.perf_counter()
+            driver.execute(cur, query['sql'], prepare=prepare)
+            cur.fetchall()
+            if i > 0:
+                times.append((time.perf_counter() - start) * 1000)
+        results[query_id] = {
+            'mean_ms': statistics.mean(times),
+            'median_ms': statistics.median(times),
+            'min_ms': min(times),
+            # Incluye la ejecución de calentamiento
+            'round_trips_est': driver.round_trips - trips,
+        }
+    cur.close()
+    conn.close()
+    return results
+
+
+def totals(stats):
+    rows = sum(e['rows'] for e in stats.values())
+    seconds = sum(e['seconds'] for e in stats.values())
+    trips = sum(e['round_trips_est'] for e in stats.values())
+    return rows, seconds, trips
+
+
+def print_summary(loads, queries):
+    print("\n" + "=" * 72)
+    print("📊 CARGA POR CONTROLADOR Y ESTRATEGIA")
+    print("=" * 72)
+    print(f"{'Controlador':<12}{'Estrategia':<16}{'Filas':>12}{'Segundos':>10}{'Filas/s':>12}{'RT (est.)':>12}")
+    for key, stats in loads.items():
+        driver, strategy = key.split(':')
+        rows, seconds, trips = totals(stats)
+        rate = f"{rows / seconds:>12,.0f}" if seconds > 0 else f"{'N/A':>12}"
+        print(f"{driver:<12}{strategy:<16}{rows:>12,}{seconds:>10.2f}{rate}{trips:>12,}")
+
+    if not queries:
+        return
+    modes = list(queries.keys())
+    print("\n" + "=" * (14 + 18 * len(modes)))
+    print(f"📊 CONSULTAS REPETIDAS ({QUERY_RUNS} ejecuciones, ms de media en el cliente)")
+    print("=" * (14 + 18 * len(modes)))
+    print(f"{'Consulta':<14}" + ''.join(f"{m:>18}" for m in modes))
+    for query_id in next(iter(queries.values())):
+        print(f"{query_id:<14}" + ''.join(f"{queries[m][query_id]['mean_ms']:>18.2f}" for m in modes))
+
+    print(f"\n📊 ROUND TRIPS ESTIMADOS POR CONSULTA ({QUERY_RUNS + 1} ejecuciones con la de calentamiento)")
+    print(f"{'Consulta':<14}" + ''.join(f"{m:>18}" for m in modes))
+    for query_id in next(iter(queries.values())):
+        print(f"{query_id:<14}" + ''.join(f"{queries[m][query_id]['round_trips_est']:>18,}" for m in modes))
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python benchmark_driver.py <num_registros_base> [estrategia ...]")
+        print(f"Estrategias disponibles: {', '.join(STRATEGIES)}")
+        sys.exit(1)
+
+    n = int(sys.argv[1])
+    strategies = sys.argv[2:] or STRATEGIES
+    for strategy in strategies:
+        if strategy not in STRATEGIES:
+            print(f"❌ Estrategia desconocida: {strategy}")
+            sys.exit(1)
+
+    drivers = {}
+    for name in DRIVERS:
+        try:
+            drivers[name] = get_driver(name)
+        except RuntimeError as e:
+            print(f"⚠️  Se omite {name}: {e}")
+
+    print(f"🎯 BENCHMARK DE CONTROLADORES - {n:,} registros base")
+    loads = {}
+    for name, driver in drivers.items():
+        for strategy in strategies:
+            print(f"\n🔄 Sembrando con {name} y estrategia '{strategy}'...")
+            loads[f"{name}:{strategy}"] = stats = run_load(driver, strategy, n)
+            rows, seconds, trips = totals(stats)
+            print(f"✅ {rows:,} filas en {seconds:.2f} s con {trips:,} round trips (estimados)")
+
+    # Las consultas se miden sobre la última carga (todas tienen los mismos datos)
+    queries = {}
+    definitions = DatabasePerformanceTester().get_query_definitions()
+    for mode, (name, prepare) in QUERY_MODES.items():
+        if name in drivers:
+            print(f"\n🔄 Consultas con {mode}...")
+            queries[mode] = run_queries(drivers[name], prepare, definitions)
+
+    print_summary(loads, queries)
+
+    output = f"driver_benchmark_{n}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'timestamp': datetime.now().isoformat(),
+            'num_registros_base': n,
+            'query_runs': QUERY_RUNS,
+            'loads': loads,
+            'queries': queries
+        }, f, indent=2, ensure_ascii=False)
+    print(f"\n📁 Resultados guardados en: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark de Estrategias de Inserción
+Proyecto: Fredys Food Database Performance Analysis
+
+Siembra la misma base de datos (misma semilla) con cada estrategia de
+loader.py y reporta filas/segundo por tabla. Solo se cronometra el envío
+de filas a PostgreSQL, no la generación con Faker.
+
+Añadiendo "+unlogged" a una estrategia (p. ej. copy_text+unlogged) se carga
+como en main.py --unlogged; el total incluye el paso final a LOGGED.
+
+Uso: python benchmark_loader.py <num_registros_base> [estrategia[+unlogged] ...]
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+
+import main as seeder
+from fast_load import UnloggedLoad
+from loader import BulkLoader, STRATEGIES
+
+BENCHMARK_SEED = 2025
+UNLOGGED_SUFFIX = '+unlogged'
+
+
+class _MaterializedLoader(BulkLoader):
+    """Genera todas las filas de la tabla antes de cronometrar la inserción"""
+
+    def insert(self, table, columns, rows):
+        return super().insert(table, columns, list(rows))
+
+
+def run_strategy(name, n):
+    """Sembrar n registros base con una estrategia; devuelve (estadísticas, segundos de SET LOGGED)"""
+    strategy = name.removesuffix(UNLOGGED_SUFFIX)
+    conn = seeder.connect_db()
+    cur = conn.cursor()
+    cur.execute(f"TRUNCATE {', '.join(seeder.ALL_TABLES)} RESTART IDENTITY CASCADE")
+    conn.commit()
+
+    # Misma semilla para que todas las estrategias inserten los mismos datos
+    gen = seeder.DataGenerator(seed=BENCHMARK_SEED, workers=os.cpu_count() or 1)
+    loader = _MaterializedLoader(cur, strategy)
+    switch_seconds = 0.0
+    if strategy != name:
+        unlogged = UnloggedLoad(cur, seeder.ALL_TABLES)
+        unlogged.prepare()
+        seeder.seed_database(loader, gen, n)
+        unlogged.finish()
+        switch_seconds = unlogged.timer.phases['SET LOGGED']
+    else:
+        seeder.seed_database(loader, gen, n)
+    conn.commit()
+    cur.close()
+    conn.close()
+    return loader.stats, switch_seconds
+
+
+def print_summary(results, switch_seconds):
+    """Mostrar tabla comparativa de filas/segundo"""
+    strategies = list(results.keys())
+    tables = list(next(iter(results.values())).keys())
+
+    print("\n" + "=" * (16 + 16 * len(strategies)))
+    print("📊 FILAS/SEGUNDO POR TABLA Y ESTRATEGIA")
+    print("=" * (16 + 16 * len(strategies)))
+    print(f"{'Tabla':<16}" + ''.join(f"{s:>16}" for s in strategies))
+    for table in tables + ['TOTAL']:
+        row = f"{table:<16}"
+        for strategy in strategies:
+            stats = results[strategy]
+            if table == 'TOTAL':
+                rows = sum(e['rows'] for e in stats.values())
+                seconds = sum(e['seconds'] for e in stats.values()) + switch_seconds[strategy]
+            else:
+                rows, seconds = stats[table]['rows'], stats[table]['seconds']
+            row += f"{rows / seconds:>16,.0f}" if seconds > 0 else f"{'N/A':>16}"
+        print(row)
+    if any(switch_seconds.values()):
+        print(f"{'SET LOGGED (s)':<16}" + ''.join(f"{switch_seconds[s]:>16.2f}" for s in strategies))
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python benchmark_loader.py <num_registros_base> [estrategia[+unlogged] ...]")
+        print(f"Estrategias disponibles: {', '.join(STRATEGIES)}")
+        sys.exit(1)
+
+    n = int(sys.argv[1])
+    strategies = sys.argv[2:] or STRATEGIES
+    for strategy in strategies:
+        if strategy.removesuffix(UNLOGGED_SUFFIX) not in STRATEGIES:
+            print(f"❌ Estrategia desconocida: {strategy}")
+            sys.exit(1)
+
+    print(f"🎯 BENCHMARK DE INSERCIÓN MASIVA - {n:,} registros base")
+    results = {}
+    switch_seconds = {}
+    for strategy in strategies:
+        print(f"\n🔄 Sembrando con estrategia '{strategy}'...")
+        results[strategy], switch_seconds[strategy] = run_strategy(strategy, n)
+        total_seconds = sum(e['seconds'] for e in results[strategy].values()) + switch_seconds[strategy]
+        print(f"✅ '{strategy}' completada en {total_seconds:.2f} s de inserción")
+
+    print_summary(results, switch_seconds)
+
+    output = f"loader_benchmark_{n}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'timestamp': datetime.now().isoformat(),
+            'num_registros_base': n,
+            'results': results,
+            'set_logged_seconds': switch_seconds
+        }, f, indent=2, ensure_ascii=False)
+    print(f"\n📁 Resultados guardados en: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark de Partition Pruning: Pedido Plano frente a Particionado
+Proyecto: Fredys Food Database Performance Analysis
+
+Para cada escala se siembra la base plana con main.py (--fast-faker y
+HISTORY_DAYS días de historial, para que los pedidos ocupen muchos meses) y
+se crea una copia de Pedido particionada por mes en el esquema SCHEMA
+(partitions.build_partitioned_copy), con los mismos datos e índices. Las
+consultas de measure_performance.py se ejecutan con search_path apuntando a
+una u otra; el resto de tablas son las mismas.
+
+Se reporta el tiempo de ejecución (EXPLAIN ANALYZE, mediana de RUNS) y
+cuántas particiones de Pedido llegó a leer cada consulta.
+
+Uso: python benchmark_partitions.py [escala ...]   (por defecto: 1000 10000 100000)
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+import main as seeder
+from measure_performance import DatabasePerformanceTester
+from partitions import PARENT, build_partitioned_copy, is_partitioned
+
+SCALES = [1000, 10000, 100000]
+HISTORY_DAYS = 730
+RUNS = 5
+SCHEMA = 'particionado'
+# Variante -> search_path con el que se resuelve Pedido
+VARIANTS = {'plana': 'public', 'particionada': f'{SCHEMA}, public'}
+
+
+def seed(scale):
+    """Sembrar la base plana con scale registros base repartidos en HISTORY_DAYS días"""
+    command = [sys.executable, 'main.py', str(scale), '--fast-faker', '--history-days', str(HISTORY_DAYS)]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"❌ Error sembrando {scale:,} registros: {result.stderr}")
+        return False
+    return True
+
+
+def _partitions_read(plan):
+    """Particiones de Pedido que aparecen en el plan ejecutado (las podadas no aparecen)"""
+    names = set()
+    if plan.get('Relation Name', '').startswith(f"{PARENT.lower()}_"):
+        names.add(plan['Relation Name'])
+    for child in plan.get('Plans', []):
+        names |= _partitions_read(child)
+    return names
+
+
+def measure(cursor, sql):
+    """Mediana de RUNS ejecuciones (tras una de calentamiento) y particiones leídas"""
+    times, planning = [], []
+    for i in range(RUNS + 1):
+        cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}")
+        result = cursor.fetchone()[0][0]
+        if i > 0:
+            times.append(result['Execution Time'])
+            planning.append(result['Planning Time'])
+    return {
+        'median_ms': statistics.median(times),
+        'planning_ms': statistics.median(planning),
+        'partitions_read': sorted(_partitions_read(result['Plan'])),
+    }
+
+
+def run_scale(scale, queries):
+    print(f"\n🔄 Sembrando {scale:,} registros base con {HISTORY_DAYS} días de historial...")
+    if not seed(scale):
+        return None
+    conn = seeder.connect_db()
+    conn.autocommit = True
+    cur = conn.cursor()
+    if is_partitioned(cur):
+        print("❌ Pedido ya está particionada: cree el esquema plano con create_schema.sql para comparar")
+        conn.close()
+        return None
+    partitions = build_partitioned_copy(cur, SCHEMA)
+    print(f"✅ Copia particionada en {SCHEMA}.Pedido: {len(partitions)} particiones")
+
+    results = {'partitions': len(partitions), 'queries': {}}
+    for query_id, query in queries.items():
+        entry = results['queries'][query_id] = {}
+        for variant, search_path in VARIANTS.items():
+            cur.execute(f"SET search_path TO {search_path}")
+            entry[variant] = measure(cur, query['sql'])
+        cur.execute("RESET search_path")
+        flat, parted = entry['plana']['median_ms'], entry['particionada']['median_ms']
+        print(f"  {query_id}: plana {flat:.2f} ms, particionada {parted:.2f} ms "
+              f"({len(entry['particionada']['partitions_read'])}/{len(partitions)} particiones leídas)")
+
+    cur.execute(f"DROP SCHEMA {SCHEMA} CASCADE")
+    cur.close()
+    conn.close()
+    return results
+
+
+def print_summary(results):
+    print("\n" + "=" * 78)
+    print("📊 PARTITION PRUNING: PEDIDO PLANO FRENTE A PARTICIONADO POR MES")
+    print("=" * 78)
+    print(f"{'Escala':>10}  {'Consulta':<12}{'Plana (ms)':>12}{'Partic. (ms)':>14}{'Mejora':>9}{'Particiones':>14}")
+    for scale, result in results.items():
+        for query_id, entry in result['queries'].items():
+            flat, parted = entry['plana']['median_ms'], entry['particionada']['median_ms']
+            ratio = f"{flat / parted:>8.2f}x" if parted > 0 else f"{'N/A':>9}"
+            read = f"{len(entry['particionada']['partitions_read'])}/{result['partitions']}"
+            print(f"{scale:>10,}  {query_id:<12}{flat:>12.2f}{parted:>14.2f}{ratio}{read:>14}")
+
+
+def main():
+    try:
+        scales = [int(arg) for arg in sys.argv[1:]] or SCALES
+    except ValueError:
+        print(__doc__)
+        sys.exit(1)
+
+    print(f"🎯 BENCHMARK DE PARTICIONADO - escalas: {', '.join(f'{s:,}' for s in scales)}")
+    queries = DatabasePerformanceTester().get_query_definitions()
+    results = {}
+    for scale in scales:
+        result = run_scale(scale, queries)
+        if result:
+            results[scale] = result
+
+    if not results:
+        return
+    print_summary(results)
+    output = "partition_benchmark.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'timestamp': datetime.now().isoformat(),
+            'history_days': HISTORY_DAYS,
+            'runs': RUNS,
+            'results': results
+        }, f, indent=2, ensure_ascii=False)
+    print(f"\n📁 Resultados guardados en: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Esquema Compacto: Clave Entera de Zona y Estado como SMALLINT
+Proyecto: Fredys Food Database Performance Analysis
+
+En el esquema original Pedido, Cubre y Vive unen y agrupan por
+zona_entrega VARCHAR(50), y Pedido.estado es un VARCHAR(20). En la variante
+compacta (create_schema_compact.sql):
+- ZonaEntrega tiene una clave entera id_zona, y Pedido, Vive y Cubre la
+  referencian en lugar del nombre
+- Pedido.estado es un código SMALLINT de EstadoPedido (orden de ESTADOS)
+- Pedido ordena sus columnas de ancho fijo para no dejar relleno de alineación
+
+CompactLoader traduce nombres de zona y estados a sus códigos mientras
+main.py carga, así que los generadores no cambian. COMPACT_QUERIES son las
+consultas de measure_performance.py reescritas para unir por id_zona y
+filtrar por código. build_compact_copy crea las tablas compactas en otro
+esquema a partir de las originales, para compararlas sobre los mismos datos
+(benchmark_compact.py).
+"""
+
+import os
+import re
+
+from estados import ESTADOS
+from loader import COLUMN_TYPES
+
+# Código de cada estado: su posición (igual que EstadoPedido en create_schema_compact.sql)
+ESTADO_CODES = {estado: code for code, estado in enumerate(ESTADOS)}
+
+# Tablas que cambian en la variante compacta
+COMPACT_TABLES = ['ZonaEntrega', 'Pedido', 'Vive', 'Cubre']
+
+COMPACT_COLUMN_TYPES = dict(COLUMN_TYPES,
+    ZonaEntrega={'id_zona': 'int4', 'nombre': 'text', 'costo': 'numeric'},
+    Pedido={'id_pedido': 'int4', 'id_zona': 'int4', 'fecha': 'timestamp', 'hora_salida': 'time',
+            'hora_entrega': 'time', 'hora_entrega_estimada': 'time', 'estado': 'int2',
+            'direccion_exacta': 'text'},
+    Vive={'id_zona': 'int4', 'id_usuario': 'int4'},
+    Cubre={'id_zona': 'int4', 'id_usuario': 'int4'},
+)
+
+# Script de la variante; build_compact_copy toma de él las tablas que cambian
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'create_schema_compact.sql')
+
+
+def is_compact(cursor, table='Pedido'):
+    cursor.execute("SELECT EXISTS (SELECT 1 FROM pg_attribute "
+                   "WHERE attrelid = to_regclass(%s) AND attname = 'id_zona' AND NOT attisdropped)",
+                   (table.lower(),))
+    return cursor.fetchone()[0]
+
+
+class CompactLoader:
+    """Envuelve el loader: traduce zona_entrega a id_zona y estado a su código"""
+
+    def __init__(self, loader):
+        self.loader = loader
+        self.cursor = loader.cursor
+        self.stats = loader.stats
+        loader.column_types = COMPACT_COLUMN_TYPES
+        self.zone_ids = {}
+
+    def _load_zone_ids(self):
+        self.cursor.execute("SELECT nombre, id_zona FROM ZonaEntrega")
+        self.zone_ids = dict(self.cursor.fetchall())
+
+    def _insert_zones(self, columns, rows):
+        # id_zona consecutivo tras las zonas existentes, en el orden de las filas
+        self.cursor.execute("SELECT COALESCE(max(id_zona), 0) FROM ZonaEntrega")
+        first = self.cursor.fetchone()[0] + 1
+        rows = [(first + i, *row) for i, row in enumerate(rows)]
+        count = self.loader.insert('ZonaEntrega', ['id_zona', *columns], rows)
+        self._load_zone_ids()
+        return count
+
+    def _map_rows(self, columns, rows):
+        zone = columns.index('zona_entrega')
+        estado = columns.index('estado') if 'estado' in columns else None
+        for row in rows:
+            row = list(row)
+            row[zone] = self.zone_ids[row[zone]]
+            if estado is not None:
+                row[estado] = ESTADO_CODES[row[estado]]
+            yield row
+
+    def insert(self, table, columns, rows):
+        columns = list(columns)
+        if table == 'ZonaEntrega':
+            return self._insert_zones(columns, rows)
+        if 'zona_entrega' not in columns:
+            return self.loader.insert(table, columns, rows)
+        if not self.zone_ids:
+            self._load_zone_ids()
+        mapped = ['id_zona' if c == 'zona_entrega' else c for c in columns]
+        return self.loader.insert(table, mapped, self._map_rows(columns, rows))
+
+    def report(self):
+        self.loader.report()
+
+
+def compact_ddl(schema, path=SCHEMA_FILE):
+    """CREATE TABLE e índices de EstadoPedido y COMPACT_TABLES del script, movidos a schema
+
+    Las referencias entre esas tablas pasan a schema; las demás (Usuario,
+    Repartidor) siguen apuntando a las originales.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        sql = f.read()
+    tables = ['EstadoPedido', *COMPACT_TABLES]
+    statements = [f"CREATE TABLE {table} ({body}\n)"
+                  for table, body in re.findall(r"CREATE TABLE (\w+)\s*\((.*?)\n\);", sql, re.S)
+                  if table in tables]
+    statements += [statement for statement, table in re.findall(r"(CREATE INDEX \w+ ON (\w+)\(.*?\));", sql)
+                   if table in tables]
+    qualify = re.compile(r"\b({})\b(?=\s*\()".format('|'.join(tables)))
+    return [qualify.sub(lambda m: f"{schema}.{m.group(1)}", statement) for statement in statements]
+
+
+def build_compact_copy(cursor, schema):
+    """Crear las tablas compactas en schema con los datos de las originales (esquema public)"""
+    prefix = f"{schema}."
+    cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+    cursor.execute(f"CREATE SCHEMA {schema}")
+    for sql in compact_ddl(schema):
+        cursor.execute(sql)
+    cursor.execute(f"INSERT INTO {prefix}EstadoPedido (codigo, nombre) SELECT * FROM unnest(%s::int2[], %s::text[])",
+                   (list(ESTADO_CODES.values()), list(ESTADO_CODES)))
+    cursor.execute(f"""
+        INSERT INTO {prefix}ZonaEntrega (id_zona, nombre, costo)
+        SELECT row_number() OVER (ORDER BY nombre), nombre, costo FROM public.ZonaEntrega
+    """)
+    cursor.execute(f"""
+        INSERT INTO {prefix}Pedido (id_pedido, id_zona, fecha, hora_salida, hora_entrega,
+                                    hora_entrega_estimada, estado, direccion_exacta)
+        SELECT p.id_pedido, z.id_zona, p.fecha, p.hora_salida, p.hora_entrega,
+               p.hora_entrega_estimada, e.codigo, p.direccion_exacta
+        FROM public.Pedido p
+        JOIN {prefix}ZonaEntrega z ON z.nombre = p.zona_entrega
+        JOIN {prefix}EstadoPedido e ON e.nombre = p.estado
+    """)
+    for table in ['Vive', 'Cubre']:
+        cursor.execute(f"""
+            INSERT INTO {prefix}{table} (id_zona, id_usuario)
+            SELECT z.id_zona, t.id_usuario
+            FROM public.{table} t JOIN {prefix}ZonaEntrega z ON z.nombre = t.zona_entrega
+        """)
+    cursor.execute(f"ANALYZE {', '.join(prefix + table for table in COMPACT_TABLES)}")
+
+
+_ESTADO_LITERAL = re.compile(r"'({})'".format('|'.join(ESTADOS)))
+
+
+def compact_index(sql, schema=None):
+    """Reescribir un índice de measure_performance.py para las tablas compactas (None si no aplica)"""
+    head, _, target = sql.partition(' ON ')
+    match = re.match(r"(\w+)\s*\(", target)
+    if match is None or match.group(1) not in COMPACT_TABLES:
+        return None
+    target = target.replace('ZonaEntrega(nombre', 'ZonaEntrega(id_zona').replace('zona_entrega', 'id_zona')
+    target = _ESTADO_LITERAL.sub(lambda m: str(ESTADO_CODES[m.group(1)]), target)
+    return f"{head} ON {schema + '.' if schema else ''}{target}"
+
+
+# Consultas de measure_performance.py sobre el esquema compacto: mismas columnas
+# de salida, con el nombre de la zona tomado de ZonaEntrega
+COMPACT_QUERIES = {
+    "consulta_1": """
+        SELECT
+            p.nombre AS nombre_plato,
+            p.categoria,
+            p.precio,
+            u.nombre || ' ' || u.apellido AS administrador_creador,
+            ze.nombre AS zona_entrega,
+            COUNT(DISTINCT pd.id_pedido) AS total_pedidos,
+            ROUND(AVG(h.calificacion::numeric), 2) AS calificacion_promedio,
+            COUNT(h.calificacion) AS total_calificaciones,
+            SUM(p.precio) AS ingresos_generados
+        FROM Plato p
+        JOIN Pertenece pe ON p.id_plato = pe.id_plato
+        JOIN Menu m ON pe.id_menu = m.id_menu
+        JOIN Administrador a ON m.id_administrador = a.id_usuario
+        JOIN Usuario u ON a.id_usuario = u.id_usuario
+        JOIN Tiene t ON m.id_menu = t.id_menu
+        JOIN Pedido pd ON t.id_pedido = pd.id_pedido
+        JOIN ZonaEntrega ze ON pd.id_zona = ze.id_zona
+        LEFT JOIN Hace h ON pd.id_pedido = h.id_pedido
+        WHERE pd.fecha >= CURRENT_DATE - INTERVAL '30 days'
+          AND pd.estado = {Entregado}
+        GROUP BY p.id_plato, p.nombre, p.categoria, p.precio,
+                 u.nombre, u.apellido, ze.id_zona
+        HAVING COUNT(DISTINCT pd.id_pedido) >= 5
+        ORDER BY total_pedidos DESC, calificacion_promedio DESC
+        LIMIT 15;
+    """,
+    "consulta_2": """
+        SELECT
+            ze.nombre AS zona_entrega,
+            ze.costo AS costo_zona,
+            COUNT(pd.id_pedido) AS total_entregas,
+            COUNT(CASE WHEN pd.estado = {Entregado} THEN 1 END) AS entregas_exitosas,
+            ROUND(
+                COUNT(CASE WHEN pd.estado = {Entregado} THEN 1 END)::numeric /
+                COUNT(pd.id_pedido)::numeric * 100, 2
+            ) AS porcentaje_exito,
+            ROUND(AVG(
+                EXTRACT(EPOCH FROM (pd.hora_entrega - pd.hora_salida)) / 60
+            ), 2) AS tiempo_promedio_minutos,
+            ROUND(AVG(
+                EXTRACT(EPOCH FROM (pd.hora_entrega - pd.hora_entrega_estimada)) / 60
+            ), 2) AS diferencia_estimado_real,
+            COUNT(DISTINCT c.id_usuario) AS repartidores_activos,
+            STRING_AGG(DISTINCT u.nombre || ' ' || u.apellido, ', ') AS nombres_repartidores
+        FROM Pedido pd
+        JOIN ZonaEntrega ze ON pd.id_zona = ze.id_zona
+        JOIN Cubre c ON pd.id_zona = c.id_zona
+        JOIN Usuario u ON c.id_usuario = u.id_usuario
+        WHERE pd.fecha >= CURRENT_DATE - INTERVAL '30 days'
+          AND pd.hora_salida IS NOT NULL
+          AND pd.hora_entrega IS NOT NULL
+          AND pd.hora_entrega_estimada IS NOT NULL
+        GROUP BY ze.id_zona
+        HAVING COUNT(pd.id_pedido) >= 5
+        ORDER BY porcentaje_exito DESC, tiempo_promedio_minutos ASC;
+    """,
+    "consulta_3": """
+        SELECT
+            u.nombre || ' ' || u.apellido AS nombre_repartidor,
+            t.nro_telef_emergencia AS telefono_emergencia,
+            ze.nombre AS zona_entrega,
+            COUNT(pd.id_pedido) AS entregas_realizadas,
+            COUNT(CASE WHEN pd.estado = {Entregado} THEN 1 END) AS entregas_exitosas,
+            ROUND(
+                COUNT(CASE WHEN pd.estado = {Entregado} THEN 1 END)::numeric /
+                COUNT(pd.id_pedido)::numeric * 100, 2
+            ) AS tasa_exito,
+            ROUND(AVG(h.calificacion::numeric), 2) AS calificacion_promedio,
+            ROUND(AVG(
+                EXTRACT(EPOCH FROM (pd.hora_entrega - pd.hora_salida)) / 60
+            ), 2) AS tiempo_promedio_entrega,
+            COUNT(DISTINCT DATE(pd.fecha)) AS dias_trabajados,
+            ROW_NUMBER() OVER (
+                PARTITION BY ze.id_zona
+                ORDER BY COUNT(CASE WHEN pd.estado = {Entregado} THEN 1 END) DESC,
+                         AVG(h.calificacion::numeric) DESC
+            ) AS ranking_zona
+        FROM Usuario u
+        JOIN Trabajador t ON u.id_usuario = t.id_usuario
+        JOIN Repartidor r ON t.id_usuario = r.id_usuario
+        JOIN Cubre c ON r.id_usuario = c.id_usuario
+        JOIN ZonaEntrega ze ON c.id_zona = ze.id_zona
+        JOIN Pedido pd ON pd.id_zona = c.id_zona
+        LEFT JOIN Hace h ON pd.id_pedido = h.id_pedido
+        WHERE pd.estado IN ({Entregado}, {En reparto})
+          AND pd.fecha >= CURRENT_DATE - INTERVAL '30 days'
+          AND pd.hora_salida IS NOT NULL
+          AND pd.hora_entrega IS NOT NULL
+        GROUP BY u.id_usuario, u.nombre, u.apellido, t.nro_telef_emergencia, ze.id_zona
+        HAVING COUNT(pd.id_pedido) >= 3
+        ORDER BY ze.nombre, ranking_zona;
+    """,
+    "consulta_4": """
+        SELECT
+            u.nombre || ' ' || u.apellido AS nombre_cliente,
+            cl.empresa,
+            ze.nombre AS zona_entrega,
+            COUNT(pd.id_pedido) AS total_pedidos,
+            ROUND(AVG(p.precio), 2) AS ticket_promedio,
+            SUM(p.precio) AS valor_total_consumido,
+            COUNT(DISTINCT pe.id_plato) AS variedad_platos_consumidos,
+            COUNT(DISTINCT DATE(pd.fecha)) AS dias_activos,
+            ROUND(AVG(h.calificacion::numeric), 2) AS calificacion_promedio,
+            MAX(pd.fecha) AS ultimo_pedido,
+            STRING_AGG(DISTINCT p.categoria, ', ') AS categorias_preferidas,
+            CASE
+                WHEN COUNT(pd.id_pedido) >= 20 THEN 'Cliente VIP'
+                WHEN COUNT(pd.id_pedido) >= 10 THEN 'Cliente Frecuente'
+                WHEN COUNT(pd.id_pedido) >= 5 THEN 'Cliente Regular'
+                ELSE 'Cliente Ocasional'
+            END AS categoria_fidelidad,
+            EXTRACT(DAYS FROM (CURRENT_DATE - MAX(pd.fecha))) AS dias_sin_pedido
+        FROM Usuario u
+        JOIN Cliente cl ON u.id_usuario = cl.id_usuario
+        JOIN Vive v ON u.id_usuario = v.id_usuario
+        JOIN ZonaEntrega ze ON v.id_zona = ze.id_zona
+        JOIN Hace ha ON u.id_usuario = ha.id_usuario
+        JOIN Pedido pd ON ha.id_pedido = pd.id_pedido
+        JOIN Tiene t ON pd.id_pedido = t.id_pedido
+        JOIN Menu m ON t.id_menu = m.id_menu
+        JOIN Pertenece pe ON m.id_menu = pe.id_menu
+        JOIN Plato p ON pe.id_plato = p.id_plato
+        LEFT JOIN Hace h ON pd.id_pedido = h.id_pedido
+        WHERE pd.fecha >= CURRENT_DATE - INTERVAL '60 days'
+          AND pd.estado = {Entregado}
+        GROUP BY u.id_usuario, u.nombre, u.apellido, cl.empresa, ze.id_zona
+        HAVING COUNT(pd.id_pedido) >= 3
+        ORDER BY total_pedidos DESC, valor_total_consumido DESC
+        LIMIT 20;
+    """,
+}
+COMPACT_QUERIES = {query_id: sql.format_map(ESTADO_CODES) for query_id, sql in COMPACT_QUERIES.items()}
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Carga Concurrente por Tablas Según el DAG de Claves Foráneas
+Proyecto: Fredys Food Database Performance Analysis
+
+Las dependencias se leen de las cláusulas REFERENCES de create_schema.sql.
+Cada tabla cuyas tablas padre ya están confirmadas se carga en su propia
+conexión del pool (ThreadedConnectionPool) y se confirma al terminar, así
+Cliente y Trabajador avanzan juntas tras Usuario, Plato junto a Menu y
+ZonaEntrega desde el principio.
+
+Al final se compara el camino crítico (la cadena de dependencias más larga
+según las duraciones medidas) con el tiempo total y con la suma secuencial.
+"""
+
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from psycopg2.pool import ThreadedConnectionPool
+
+from dataset_artifact import SCHEMA_FILE
+from loader import BulkLoader
+
+
+def parse_dependencies(path=SCHEMA_FILE):
+    """{tabla: {tablas que referencia}} según los CREATE TABLE del script de esquema"""
+    with open(path, 'r', encoding='utf-8') as f:
+        sql = f.read()
+    dependencies = {}
+    for table, body in re.findall(r"CREATE TABLE (\w+)\s*\((.*?)\n\);", sql, re.S):
+        dependencies[table] = set(re.findall(r"REFERENCES\s+(\w+)\s*\(", body)) - {table}
+    return dependencies
+
+
+class DagScheduler:
+    """Ejecuta los pasos de carga de cada tabla en cuanto sus tablas padre terminan"""
+
+    def __init__(self, db_params, connections, dependencies=None):
+        self.db_params = db_params
+        self.connections = connections
+        self.dependencies = parse_dependencies() if dependencies is None else dependencies
+        # tabla -> (inicio, fin) en segundos desde el arranque
+        self.timeline = {}
+        self.elapsed = 0.0
+
+    def _load_table(self, pool, table, step, loader, gen, plan):
+        conn = pool.getconn()
+        try:
+            table_loader = BulkLoader(conn.cursor(), loader.strategy, loader.page_size)
+            start = time.perf_counter() - self._t0
+            step(table_loader, gen, plan)
+            conn.commit()
+            self.timeline[table] = (start, time.perf_counter() - self._t0)
+            return table_loader.stats
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            pool.putconn(conn)
+
+    def run(self, steps, loader, gen, plan):
+        """Cargar todas las tablas de steps ({tabla: paso}); las estadísticas se suman a loader"""
+        pending = {table: self.dependencies.get(table, set()) & set(steps) for table in steps}
+        done = set()
+        running = {}
+        pool = ThreadedConnectionPool(1, self.connections, **self.db_params)
+        self._t0 = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self.connections) as executor:
+                while pending or running:
+                    # Las tablas listas se lanzan en el orden de steps
+                    for table in [t for t in steps if t in pending and pending[t] <= done]:
+                        del pending[table]
+                        running[executor.submit(self._load_table, pool, table, steps[table],
+                                                loader, gen, plan)] = table
+                    if not running:
+                        raise ValueError(f"Dependencias circulares entre: {', '.join(pending)}")
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        table = running.pop(future)
+                        loader.stats.update(future.result())
+                        done.add(table)
+        finally:
+            pool.closeall()
+        self.elapsed = time.perf_counter() - self._t0
+        return self.timeline
+
+    def critical_path(self):
+        """Cadena de tablas más larga según las duraciones medidas: (tablas, segundos)"""
+        finish, previous = {}, {}
+        for table in sorted(self.timeline, key=lambda t: self.timeline[t][1]):
+            start, end = self.timeline[table]
+            parents = [p for p in self.dependencies.get(table, ()) if p in finish]
+            parent = max(parents, key=finish.get) if parents else None
+            finish[table] = (end - start) + (finish[parent] if parent else 0.0)
+            previous[table] = parent
+        if not finish:
+            return [], 0.0
+        table = max(finish, key=finish.get)
+        length = finish[table]
+        chain = []
+        while table:
+            chain.append(table)
+            table = previous[table]
+        return chain[::-1], length
+
+    def report(self):
+        print(f"\n🕸️  Carga por DAG de claves foráneas ({self.connections} conexiones)")
+        for table, (start, end) in sorted(self.timeline.items(), key=lambda item: item[1][0]):
+            print(f"  {table:<14} {start:>8.2f} s → {end:>8.2f} s  ({end - start:>7.2f} s)")
+        chain, length = self.critical_path()
+        sequential = sum(end - start for start, end in self.timeline.values())
+        print(f"  Camino crítico: {' → '.join(chain)} = {length:.2f} s")
+        print(f"  Tiempo total:   {self.elapsed:.2f} s (secuencial: {sequential:.2f} s)")
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Artefactos de Dataset Portables (--export / --import)
+Proyecto: Fredys Food Database Performance Analysis
+
+Un artefacto es un directorio con:
+- <Tabla>.copy.gz: la tabla en formato COPY binario, comprimida con gzip
+- manifest.json:   versión, semilla, escala, columnas y tipos de cada tabla
+                   en la base de origen (y su hash), filas por tabla y valor
+                   de cada secuencia SERIAL
+
+La importación vacía las tablas, quita FKs e índices secundarios (ver
+fast_load.py), restaura todas las tablas en paralelo con una conexión por
+tabla y al final reconstruye índices, FKs y secuencias. No se importa sobre
+Pedido particionado: las FKs NOT VALID no se admiten en tablas particionadas
+y las particiones de los meses del artefacto no existirían.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from checkpoint import discard_run
+from fast_load import FastLoad, PhaseTimer
+from partitions import is_partitioned
+
+# v2: el esquema se identifica por el catálogo de la base, no por create_schema.sql
+ARTIFACT_VERSION = 2
+MANIFEST_NAME = 'manifest.json'
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'create_schema.sql')
+
+
+def table_columns(cursor, tables):
+    """tabla -> [[columna, tipo], ...] en el orden físico, que es el que usa COPY binario"""
+    columns = {}
+    for table in tables:
+        cursor.execute("SELECT attname, format_type(atttypid, atttypmod) FROM pg_attribute "
+                       "WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped "
+                       "ORDER BY attnum", (table,))
+        columns[table] = [list(row) for row in cursor.fetchall()]
+    return columns
+
+
+def schema_hash(columns):
+    """SHA-256 de las columnas y tipos; un artefacto solo se importa sobre el mismo esquema"""
+    return hashlib.sha256(json.dumps(columns, sort_keys=True).encode()).hexdigest()
+
+
+# Campos del manifiesto que describen cómo se generaron los datos
+META_KEYS = ['seed', 'num_registros_base', 'fast_faker', 'skew', 'history_days', 'stats_profile']
+
+
+def record_dataset_meta(cursor, meta):
+    """Guardar en la tabla de control dataset_meta cómo se generaron los datos"""
+    cursor.execute("CREATE TABLE IF NOT EXISTS dataset_meta "
+                   "(clave VARCHAR(50) PRIMARY KEY, valor JSONB NOT NULL)")
+    for key, value in meta.items():
+        cursor.execute("INSERT INTO dataset_meta VALUES (%s, %s) "
+                       "ON CONFLICT (clave) DO UPDATE SET valor = EXCLUDED.valor",
+                       (key, json.dumps(value)))
+
+
+def read_dataset_meta(cursor):
+    """Contenido de dataset_meta como diccionario ({} si la tabla no existe)"""
+    cursor.execute("SELECT to_regclass('dataset_meta') IS NOT NULL")
+    if not cursor.fetchone()[0]:
+        return {}
+    cursor.execute("SELECT clave, valor FROM dataset_meta ORDER BY clave")
+    return dict(cursor.fetchall())
+
+
+def _table_file(table):
+    return f"{table}.copy.gz"
+
+
+def read_manifest(directory):
+    with open(os.path.join(directory, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def is_artifact(directory):
+    return os.path.exists(os.path.join(directory, MANIFEST_NAME))
+
+
+def export_dataset(cursor, directory, tables, serial_columns, info):
+    """Volcar las tablas a directory y escribir el manifiesto (info: semilla, escala...)"""
+    os.makedirs(directory, exist_ok=True)
+    timer = PhaseTimer()
+    columns = table_columns(cursor, tables)
+    manifest = dict(info, version=ARTIFACT_VERSION, created_at=datetime.now().isoformat(),
+                    schema_sha256=schema_hash(columns), columns=columns, tables={}, sequences={})
+
+    for table in tables:
+        path = os.path.join(directory, _table_file(table))
+        with timer.phase(table):
+            with gzip.open(path, 'wb', compresslevel=6) as f:
+                # COPY (TABLE ...) también vuelca una tabla particionada (Pedido en
+                # create_schema_partitioned.sql); COPY tabla TO no lee sus particiones
+                cursor.copy_expert(f"COPY (TABLE {table}) TO STDOUT WITH (FORMAT binary)", f)
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            manifest['tables'][table] = {
+                'file': _table_file(table),
+                'rows': cursor.fetchone()[0],
+                'bytes': os.path.getsize(path),
+            }
+
+    for table, column in serial_columns.items():
+        cursor.execute("SELECT pg_get_serial_sequence(%s, %s)", (table, column))
+        cursor.execute(f"SELECT last_value, is_called FROM {cursor.fetchone()[0]}")
+        manifest['sequences'][table] = list(cursor.fetchone())
+
+    with open(os.path.join(directory, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    timer.report(f"Exportación a {directory}")
+    return manifest
+
+
+def _restore_table(connect, directory, table, entry):
+    conn = connect()
+    try:
+        cur = conn.cursor()
+        with gzip.open(os.path.join(directory, entry['file']), 'rb') as f:
+            cur.copy_expert(f"COPY {table} FROM STDIN WITH (FORMAT binary)", f, size=1 << 20)
+        conn.commit()
+    finally:
+        conn.close()
+    return table
+
+
+def import_dataset(connect, directory, tables, serial_columns, workers=4):
+    """Restaurar un artefacto sobre la base de datos usando hasta workers conexiones"""
+    manifest = read_manifest(directory)
+    if manifest.get('version') != ARTIFACT_VERSION:
+        raise ValueError(f"Versión de artefacto no soportada: {manifest.get('version')}")
+
+    conn = connect()
+    cur = conn.cursor()
+    if is_partitioned(cur):
+        conn.close()
+        raise ValueError("--import no admite Pedido particionado (create_schema_partitioned.sql); "
+                         "importe sobre create_schema.sql")
+    columns = table_columns(cur, tables)
+    if manifest['schema_sha256'] != schema_hash(columns):
+        conn.close()
+        changed = [t for t in tables if manifest['columns'].get(t) != columns[t]]
+        raise ValueError(f"El artefacto se exportó con otro esquema (difieren: {', '.join(changed)}); "
+                         f"cree el mismo esquema de origen o regenérelo con --export")
+    fast = FastLoad(cur, tables)
+    fast.prepare()
+    conn.commit()
+
+    try:
+        # Sin FKs, el orden entre tablas no importa: cada una por su conexión
+        with fast.load():
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_restore_table, connect, directory, t, manifest['tables'][t])
+                           for t in tables if t in manifest['tables']]
+                for future in futures:
+                    print(f"  ✅ {future.result()} restaurada")
+        fast.restore()
+        record_dataset_meta(cur, {key: manifest.get(key) for key in META_KEYS if key in manifest})
+        # Los datos importados reemplazan a los de cualquier carga con checkpoints
+        discard_run(cur)
+        for table, column in serial_columns.items():
+            if table in manifest['sequences']:
+                last_value, is_called = manifest['sequences'][table]
+                cur.execute("SELECT setval(pg_get_serial_sequence(%s, %s), %s, %s)",
+                            (table, column, last_value, is_called))
+        conn.commit()
+    except BaseException:
+        # No dejar el esquema sin FKs ni índices (también si falla VALIDATE
+        # CONSTRAINT): vaciar y reconstruir
+        conn.rollback()
+        cur.execute(f"TRUNCATE {', '.join(tables)} RESTART IDENTITY CASCADE")
+        fast.restore()
+        conn.commit()
+        raise
+
+    cur.close()
+    conn.close()
+
+    fast.timer.report(f"Importación de {directory} ({workers} conexiones)")
+    return manifest
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Controladores de PostgreSQL: psycopg2 (por defecto) y psycopg 3
+Proyecto: Fredys Food Database Performance Analysis
+
+Una capa mínima para que main.py y benchmark_driver.py elijan con qué
+controlador hablar con PostgreSQL (--driver):
+- psycopg2: el comportamiento original (BulkLoader de loader.py)
+- psycopg:  psycopg 3 con pipeline mode para las sentencias masivas
+            dependientes (se envían sin esperar la respuesta de cada una),
+            cursor.copy() con write_row y tipos binarios para las cargas COPY
+            y sentencias preparadas en el servidor para consultas repetidas
+
+Cada loader estima sus esperas de respuesta del servidor (round_trips_est en
+sus estadísticas) según el protocolo: en pipeline mode solo se espera en cada
+sincronización. Cada controlador estima igual las de execute() en su atributo
+round_trips. No se observan en el socket.
+"""
+
+from contextlib import nullcontext
+from decimal import Decimal
+
+import psycopg2
+
+from loader import BulkLoader, DEFAULT_PAGE_SIZE, DEFAULT_STRATEGY, _as_time, _batches
+
+DRIVERS = ['psycopg2', 'psycopg']
+DEFAULT_DRIVER = 'psycopg2'
+
+
+def _as_decimal(value):
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+# Conversión previa a write_row en binario: los generadores dan las horas como
+# texto (modo Faker) y los importes como float
+_BINARY_CONVERTERS = {'time': _as_time, 'numeric': _as_decimal}
+
+
+class PipelineLoader(BulkLoader):
+    """BulkLoader sobre psycopg 3: pipeline mode para INSERT y COPY con write_row"""
+
+    def _pipeline(self):
+        return self.cursor.connection.pipeline()
+
+    def _insert_executemany(self, table, columns, rows):
+        count = 0
+        placeholders = ', '.join(['%s'] * len(columns))
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+        # Todas las filas salen seguidas; solo se espera al sincronizar al final
+        with self._pipeline():
+            for batch in _batches(rows, self.page_size):
+                self.cursor.executemany(sql, batch)
+                count += len(batch)
+        self.round_trips += 1
+        return count
+
+    def _insert_execute_values(self, table, columns, rows):
+        # psycopg 3 no tiene execute_values: INSERT con VALUES de varias filas
+        count = 0
+        row_placeholder = f"({', '.join(['%s'] * len(columns))})"
+        # Una sentencia admite como máximo 65535 parámetros
+        page_size = min(self.page_size, 65535 // len(columns))
+        with self._pipeline():
+            for batch in _batches(rows, page_size):
+                values = ', '.join([row_placeholder] * len(batch))
+                self.cursor.execute(f"INSERT INTO {table} ({', '.join(columns)}) VALUES {values}",
+                                    [value for row in batch for value in row])
+                count += len(batch)
+        self.round_trips += 1
+        return count
+
+    def _insert_unnest(self, table, columns, rows):
+        count = 0
+        arrays = ', '.join([f"%s::{t}[]" for t in self._types(table, columns)])
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) SELECT * FROM unnest({arrays})"
+        with self._pipeline():
+            for batch in _batches(rows, self.page_size):
+                self.cursor.execute(sql, [list(col) for col in zip(*batch)])
+                count += len(batch)
+        self.round_trips += 1
+        return count
+
+    def _copy_rows(self, sql, rows, types=None):
+        count = 0
+        with self.cursor.copy(sql) as copy:
+            if types:
+                copy.set_types(types)
+                converters = [_BINARY_CONVERTERS.get(t) for t in types]
+                if any(converters):
+                    rows = (tuple(v if f is None or v is None else f(v) for f, v in zip(converters, row))
+                            for row in rows)
+            for row in rows:
+                copy.write_row(row)
+                count += 1
+        # Inicio del COPY (CopyInResponse) y fin (CommandComplete)
+        self.round_trips += 2
+        return count
+
+    def _insert_copy_text(self, table, columns, rows):
+        return self._copy_rows(f"COPY {table} ({', '.join(columns)}) FROM STDIN", rows)
+
+    def _insert_copy_binary(self, table, columns, rows):
+        return self._copy_rows(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT binary)",
+                               rows, self._types(table, columns))
+
+
+class Psycopg2Driver:
+    """El controlador original: sin pipeline mode ni sentencias preparadas en el servidor"""
+
+    name = 'psycopg2'
+
+    def __init__(self):
+        self.round_trips = 0
+
+    def connect(self, db_params):
+        return psycopg2.connect(**db_params)
+
+    def pipeline(self, conn):
+        return nullcontext()
+
+    def loader(self, cursor, strategy=DEFAULT_STRATEGY, page_size=DEFAULT_PAGE_SIZE):
+        return BulkLoader(cursor, strategy, page_size)
+
+    def execute(self, cursor, sql, params=None, prepare=False):
+        """Ejecutar sql; psycopg2 siempre envía el texto completo (prepare se ignora)"""
+        cursor.execute(sql, params)
+        # Consulta simple: una espera, el resultado llega completo al cliente
+        self.round_trips += 1
+
+
+class PsycopgDriver:
+    """psycopg 3: pipeline mode, COPY por filas y sentencias preparadas"""
+
+    name = 'psycopg'
+
+    def __init__(self):
+        try:
+            import psycopg
+        except ImportError:
+            raise RuntimeError("psycopg 3 no está instalado: pip install 'psycopg[binary]'") from None
+        self.psycopg = psycopg
+        self.round_trips = 0
+        # (conexión, sql) ya preparadas en el servidor
+        self._prepared = set()
+
+    def connect(self, db_params):
+        params = dict(db_params)
+        # libpq llama dbname a lo que psycopg2 también acepta como database
+        if 'database' in params:
+            params['dbname'] = params.pop('database')
+        return self.psycopg.connect(**params)
+
+    def pipeline(self, conn):
+        """Enviar las sentencias del bloque sin esperar a cada respuesta (una sola sincronización)"""
+        return conn.pipeline()
+
+    def loader(self, cursor, strategy=DEFAULT_STRATEGY, page_size=DEFAULT_PAGE_SIZE):
+        return PipelineLoader(cursor, strategy, page_size)
+
+    def execute(self, cursor, sql, params=None, prepare=False):
+        """Ejecutar sql; con prepare=True se prepara una vez en el servidor y se reutiliza"""
+        cursor.execute(sql, params, prepare=prepare)
+        # La primera ejecución preparada espera también a la respuesta del Parse
+        key = (id(cursor.connection), sql)
+        if prepare and key not in self._prepared:
+            self._prepared.add(key)
+            self.round_trips += 1
+        self.round_trips += 1
+
+
+def get_driver(name=DEFAULT_DRIVER):
+    if name not in DRIVERS:
+        raise ValueError(f"Controlador desconocido: {name}")
+    return Psycopg2Driver() if name == 'psycopg2' else PsycopgDriver()
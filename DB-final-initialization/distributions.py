@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Perfiles de Sesgo para las Claves Foráneas Generadas
+Proyecto: Fredys Food Database Performance Analysis
+
+Por defecto main.py elige cada clave foránea de forma uniforme. Un perfil de
+sesgo por relación reproduce los platos populares, clientes recurrentes y
+zonas con más demanda:
+- uniform:            todas las claves igual de probables
+- zipf:S              la clave de rango k tiene peso 1/k^S
+- hotset:PCT[:SHARE]  el PCT% de las claves recibe el SHARE% de las elecciones
+                      (por defecto 80)
+
+stats_profile.py añade un perfil "empirical" que no se elige por línea de
+comandos: reproduce el histograma de filas hijas por clave padre medido en
+otra base de datos (--stats-profile).
+
+Los sorteos son vectorizados con NumPy. Qué claves son "populares" lo fija una
+permutación que depende solo del tamaño de la población, así que no coincide
+con el orden de los ids ni cambia entre bloques o procesos.
+"""
+
+import numpy as np
+
+# Relación -> clave foránea que controla
+RELATIONS = {
+    'administrador': 'Menu.id_administrador',
+    'plato': 'Pertenece.id_plato',
+    'menu': 'Tiene.id_menu',
+    'usuario': 'Hace.id_usuario',
+    'zona': 'Pedido/Vive/Cubre.zona_entrega',
+}
+
+PROFILES = ['uniform', 'zipf', 'hotset']
+
+# Caches por proceso: población -> permutación; (población, s) -> CDF
+_PERMUTATIONS = {}
+_ZIPF_CDFS = {}
+
+
+def _permutation(population):
+    if population not in _PERMUTATIONS:
+        _PERMUTATIONS[population] = np.random.default_rng(population).permutation(population)
+    return _PERMUTATIONS[population]
+
+
+def _zipf_cdf(population, s):
+    key = (population, s)
+    if key not in _ZIPF_CDFS:
+        weights = 1.0 / np.arange(1, population + 1, dtype=np.float64) ** s
+        cdf = np.cumsum(weights)
+        _ZIPF_CDFS[key] = cdf / cdf[-1]
+    return _ZIPF_CDFS[key]
+
+
+class SkewProfile:
+    """Distribución de las elecciones sobre una población de claves"""
+
+    def __init__(self, kind='uniform', s=1.0, hot_pct=10.0, hot_share=80.0, fanout=None):
+        if kind not in PROFILES and not (kind == 'empirical' and fanout):
+            raise ValueError(f"Perfil de sesgo desconocido: {kind}")
+        self.kind = kind
+        self.s = s
+        self.hot_pct = hot_pct
+        self.hot_share = hot_share
+        # empirical: [[filas hijas, claves padre con ese número], ...]
+        self.fanout = fanout
+        self._cdfs = {}
+
+    @property
+    def is_uniform(self):
+        return self.kind == 'uniform'
+
+    def sample(self, nrng, population, size):
+        """Índices en range(population) con la forma size"""
+        if self.kind == 'uniform':
+            return nrng.integers(0, population, size=size)
+
+        if self.kind in ('zipf', 'empirical'):
+            cdf = _zipf_cdf(population, self.s) if self.kind == 'zipf' else self._empirical_cdf(population)
+            ranks = np.searchsorted(cdf, nrng.random(size), side='right')
+            ranks = np.minimum(ranks, population - 1)
+        else:
+            hot = min(population, max(1, int(round(population * self.hot_pct / 100))))
+            cold = population - hot
+            in_hot = nrng.random(size) < self.hot_share / 100 if cold else np.ones(size, dtype=bool)
+            ranks = np.where(in_hot, nrng.integers(0, hot, size=size),
+                             hot + nrng.integers(0, max(cold, 1), size=size))
+        return _permutation(population)[ranks]
+
+    def _empirical_cdf(self, population):
+        """El rango i pesa lo que el cuantil 1 - (i + 0.5) / population del fan-out medido"""
+        if population not in self._cdfs:
+            values, counts = np.array(self.fanout, dtype=np.float64).T
+            cumulative = np.cumsum(counts) / counts.sum()
+            quantiles = 1.0 - (np.arange(population) + 0.5) / population
+            weights = values[np.minimum(np.searchsorted(cumulative, quantiles), len(values) - 1)]
+            # Un peso mínimo evita que distinct_draws se quede sin claves elegibles
+            weights = np.maximum(weights, 1e-3 * max(weights.mean(), 1e-9))
+            cdf = np.cumsum(weights)
+            self._cdfs[population] = cdf / cdf[-1]
+        return self._cdfs[population]
+
+    def spec(self):
+        if self.kind == 'empirical':
+            values, counts = np.array(self.fanout, dtype=np.float64).T
+            return f"empirical:media={np.dot(values, counts) / counts.sum():.2f}:max={values.max():g}"
+        if self.kind == 'zipf':
+            return f"zipf:{self.s:g}"
+        if self.kind == 'hotset':
+            return f"hotset:{self.hot_pct:g}:{self.hot_share:g}"
+        return 'uniform'
+
+
+UNIFORM = SkewProfile()
+
+
+def parse_profile(spec):
+    """'uniform' | 'zipf:S' | 'hotset:PCT[:SHARE]' -> SkewProfile"""
+    kind, _, params = spec.partition(':')
+    try:
+        values = [float(v) for v in params.split(':')] if params else []
+    except ValueError:
+        raise ValueError(f"Parámetros no numéricos en el perfil de sesgo: {spec}")
+    if kind == 'zipf':
+        s = values[0] if values else 1.0
+        if not s > 0:
+            raise ValueError(f"El exponente de zipf debe ser mayor que 0: {spec}")
+        return SkewProfile('zipf', s=s)
+    if kind == 'hotset':
+        hot_pct = values[0] if values else 10.0
+        hot_share = values[1] if len(values) > 1 else 80.0
+        if not 0 < hot_pct <= 100:
+            raise ValueError(f"El porcentaje de claves calientes debe estar en (0, 100]: {spec}")
+        if not 0 <= hot_share <= 100:
+            raise ValueError(f"La cuota de elecciones calientes debe estar en [0, 100]: {spec}")
+        return SkewProfile('hotset', hot_pct=hot_pct, hot_share=hot_share)
+    return SkewProfile(kind)
+
+
+def parse_skew(specs):
+    """['plato=zipf:1.1', 'all=hotset:5'] -> {relación: SkewProfile}, todas las relaciones presentes"""
+    skew = {relation: UNIFORM for relation in RELATIONS}
+    for item in specs or []:
+        relation, _, spec = item.partition('=')
+        if relation != 'all' and relation not in RELATIONS:
+            raise ValueError(f"Relación desconocida en --skew: {relation} "
+                             f"(use {', '.join(RELATIONS)} o all)")
+        profile = parse_profile(spec)
+        for target in (RELATIONS if relation == 'all' else [relation]):
+            skew[target] = profile
+    return skew
+
+
+def describe(skew):
+    """{relación: especificación} para el manifiesto y los resultados"""
+    return {relation: profile.spec() for relation, profile in skew.items()}
@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+"""
+Estados de un Pedido
+Proyecto: Fredys Food Database Performance Analysis
+
+Los valores de Pedido.estado en create_schema.sql, en el orden de su ciclo de
+vida. Los usan el generador (main.py), el flujo de pedidos, la matriz de
+índices y la variante compacta, donde cada estado se guarda como su posición.
+"""
+
+ESTADOS = ['Pendiente', 'En preparación', 'En reparto', 'Entregado', 'Cancelado']
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Modo de Carga Rápida (--fast-load)
+Proyecto: Fredys Food Database Performance Analysis
+
+Prepara las tablas para una carga masiva y las deja como estaban al final:
+1. TRUNCATE ... RESTART IDENTITY en lugar de DELETE (sin cascadas fila a fila
+   ni tuplas muertas)
+2. Elimina las claves foráneas y los índices secundarios antes de cargar
+3. Tras la carga, recrea los índices y las claves foráneas con NOT VALID +
+   VALIDATE CONSTRAINT
+
+Todo ocurre en la transacción del llamador: si la carga falla, el ROLLBACK
+devuelve también las restricciones y los índices eliminados.
+
+Modo --unlogged (UnloggedLoad): las tablas se cargan como UNLOGGED, sin WAL
+por fila y con synchronous_commit=off, y se conmutan con SET LOGGED al final
+de la misma transacción.
+"""
+
+import time
+from contextlib import contextmanager
+
+
+class PhaseTimer:
+    """Acumula el tiempo de cada fase con nombre, en orden de ejecución"""
+
+    def __init__(self):
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def report(self, title):
+        print(f"\n⏱️  {title}")
+        for name, seconds in self.phases.items():
+            print(f"  {name:<28} {seconds:>9.2f} s")
+        print(f"  {'TOTAL':<28} {sum(self.phases.values()):>9.2f} s")
+
+
+def truncate_tables(cursor, tables):
+    """Vaciar las tablas y reiniciar sus secuencias en una sola sentencia"""
+    cursor.execute(f"TRUNCATE {', '.join(tables)} RESTART IDENTITY CASCADE")
+
+
+def capture_foreign_keys(cursor, tables):
+    """Definición de las claves foráneas de las tablas: [(tabla, nombre, definición)]"""
+    cursor.execute("""
+        SELECT c.conrelid::regclass::text, quote_ident(c.conname), pg_get_constraintdef(c.oid)
+        FROM pg_constraint c
+        WHERE c.contype = 'f' AND c.conrelid = ANY(%s::regclass[])
+        ORDER BY c.conrelid::regclass::text, c.conname
+    """, ([t.lower() for t in tables],))
+    return cursor.fetchall()
+
+
+def capture_secondary_indexes(cursor, tables):
+    """Índices que no respaldan una PK/UNIQUE: [(nombre, definición)]"""
+    cursor.execute("""
+        SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid)
+        FROM pg_index i
+        WHERE i.indrelid = ANY(%s::regclass[])
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)
+        ORDER BY 1
+    """, ([t.lower() for t in tables],))
+    return cursor.fetchall()
+
+
+class FastLoad:
+    """Ciclo TRUNCATE → quitar FKs/índices → cargar → reconstruir, con tiempos por fase"""
+
+    def __init__(self, cursor, tables):
+        self.cursor = cursor
+        self.tables = tables
+        self.timer = PhaseTimer()
+        self.foreign_keys = []
+        self.indexes = []
+
+    def prepare(self):
+        """Vaciar las tablas y eliminar claves foráneas e índices secundarios"""
+        with self.timer.phase('TRUNCATE'):
+            truncate_tables(self.cursor, self.tables)
+
+        with self.timer.phase('Eliminar FKs e índices'):
+            self.foreign_keys = capture_foreign_keys(self.cursor, self.tables)
+            self.indexes = capture_secondary_indexes(self.cursor, self.tables)
+            for table, name, _ in self.foreign_keys:
+                self.cursor.execute(f"ALTER TABLE {table} DROP CONSTRAINT {name}")
+            for name, _ in self.indexes:
+                self.cursor.execute(f"DROP INDEX {name}")
+
+    def load(self):
+        """Contexto que cronometra la fase de carga de datos"""
+        return self.timer.phase('Carga de datos')
+
+    def restore(self):
+        """Recrear índices y claves foráneas (NOT VALID + VALIDATE CONSTRAINT)"""
+        with self.timer.phase('Recrear índices'):
+            for _, definition in self.indexes:
+                self.cursor.execute(definition)
+
+        with self.timer.phase('Añadir FKs (NOT VALID)'):
+            for table, name, definition in self.foreign_keys:
+                self.cursor.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition} NOT VALID")
+
+        with self.timer.phase('Validar FKs'):
+            for table, name, _ in self.foreign_keys:
+                self.cursor.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+
+    def report(self):
+        self.timer.report(f"Fases de --fast-load ({len(self.foreign_keys)} FKs, "
+                          f"{len(self.indexes)} índices secundarios)")
+
+
+class UnloggedLoad:
+    """Ciclo TRUNCATE → SET UNLOGGED → cargar → SET LOGGED en una sola transacción
+
+    Una tabla permanente no puede referenciar a una UNLOGGED: se pasan a
+    UNLOGGED de hijas a padres y se devuelven a LOGGED de padres a hijas
+    (tables va en orden de hijas a padres, como main.ALL_TABLES).
+    """
+
+    def __init__(self, cursor, tables):
+        self.cursor = cursor
+        self.tables = tables
+        self.timer = PhaseTimer()
+
+    def prepare(self):
+        with self.timer.phase('TRUNCATE'):
+            truncate_tables(self.cursor, self.tables)
+        with self.timer.phase('SET UNLOGGED'):
+            self.cursor.execute("SET synchronous_commit = off")
+            for table in self.tables:
+                self.cursor.execute(f"ALTER TABLE {table} SET UNLOGGED")
+
+    def load(self):
+        return self.timer.phase('Carga de datos (UNLOGGED)')
+
+    def finish(self):
+        """Volver a LOGGED: cada tabla se escribe una vez, secuencialmente, en el WAL"""
+        with self.timer.phase('SET LOGGED'):
+            for table in reversed(self.tables):
+                self.cursor.execute(f"ALTER TABLE {table} SET LOGGED")
+            self.cursor.execute("SET synchronous_commit = on")
+
+    def report(self):
+        self.timer.report("Fases de --unlogged")
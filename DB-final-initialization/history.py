@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Historial de Pedidos con Estacionalidad (--history-days)
+Proyecto: Fredys Food Database Performance Analysis
+
+Reparte los pedidos sobre un periodo de varios días/años en lugar de los
+últimos 30 días:
+- Peso por hora = perfil diario (almuerzo y cena) × perfil semanal
+  (más demanda de viernes a domingo) × tendencia de crecimiento del negocio
+- El pedido en la posición i de N toma el cuantil (i + u) / N de esa
+  distribución, así que las fechas salen ya ordenadas y cada bloque se
+  genera de forma independiente
+- Las horas son causales: salida = fecha + preparación, entrega estimada =
+  salida + trayecto estimado, entrega = salida + trayecto real
+- El estado depende de la antigüedad: los pedidos viejos están entregados o
+  cancelados; solo los de las últimas horas siguen pendientes o en reparto
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+# Peso relativo de cada hora del día (0-23): picos de almuerzo y cena
+HOUR_WEIGHTS = np.array([0.2, 0.1, 0.05, 0.05, 0.05, 0.1, 0.3, 0.6, 0.9, 1.0, 1.2, 2.0,
+                         3.2, 3.0, 1.8, 1.0, 0.9, 1.2, 2.0, 3.0, 3.4, 2.6, 1.4, 0.6])
+# Lunes a domingo
+WEEKDAY_WEIGHTS = np.array([0.85, 0.85, 0.9, 0.95, 1.2, 1.35, 1.15])
+# Volumen relativo al inicio del periodo respecto al final (crecimiento lineal)
+TREND_START = 0.6
+CANCEL_RATE = 0.07
+
+# Cache por proceso: (días, hoy) -> CDF horaria
+_CDFS = {}
+
+
+def _end(today):
+    return np.datetime64(datetime.combine(today, datetime.min.time()), 's')
+
+
+def hourly_cdf(days, today):
+    """CDF acumulada de la demanda por hora sobre los days días anteriores a today"""
+    key = (days, today)
+    if key not in _CDFS:
+        hours = days * 24
+        start = _end(today) - np.timedelta64(hours, 'h')
+        stamps = start + np.arange(hours).astype('timedelta64[h]')
+        hour_of_day = (stamps.astype('datetime64[h]').astype(np.int64)) % 24
+        # 1970-01-01 fue jueves: desplazar para que 0 sea lunes
+        weekday = (stamps.astype('datetime64[D]').astype(np.int64) + 3) % 7
+        trend = np.linspace(TREND_START, 1.0, hours)
+        cdf = np.cumsum(HOUR_WEIGHTS[hour_of_day] * WEEKDAY_WEIGHTS[weekday] * trend)
+        _CDFS[key] = cdf / cdf[-1]
+    return _CDFS[key]
+
+
+def order_timestamps(nrng, days, today, offset, count, total):
+    """Fechas (datetime64[s], ordenadas) de los pedidos en las posiciones offset..offset+count de total"""
+    cdf = hourly_cdf(days, today)
+    u = (offset + np.arange(count) + nrng.random(count)) / total
+    bins = np.minimum(np.searchsorted(cdf, u, side='right'), len(cdf) - 1)
+    lower = np.where(bins > 0, cdf[bins - 1], 0.0)
+    within = (u - lower) / np.maximum(cdf[bins] - lower, 1e-12)
+    seconds = bins * 3600 + np.minimum(within * 3600, 3599).astype(np.int64)
+    return _end(today) - np.timedelta64(days * 24, 'h') + seconds.astype('timedelta64[s]')
+
+
+def delivery(nrng, fechas, today):
+    """Estado y horas (segundos del día o -1 si es NULL) coherentes con la antigüedad de cada pedido
+
+    Devuelve (estados, salida, entrega, entrega_estimada).
+    """
+    count = len(fechas)
+    prep = np.clip(nrng.gamma(4.0, 5.0, count), 5, 60) * 60
+    estimated = nrng.integers(15, 36, count) * 60.0
+    travel = estimated * nrng.lognormal(0.0, 0.25, count)
+
+    base = fechas.astype(np.int64)
+    salida = base + prep.astype(np.int64)
+    estimada = salida + estimated.astype(np.int64)
+    entrega = salida + travel.astype(np.int64)
+
+    age = (_end(today).astype(np.int64) - base).astype(np.float64)
+    estados = np.full(count, 'Entregado', dtype=object)
+    estados[nrng.random(count) < CANCEL_RATE] = 'Cancelado'
+    estados[age < prep + travel] = 'En reparto'
+    estados[age < prep] = 'En preparación'
+    estados[age < prep / 2] = 'Pendiente'
+
+    no_salida = np.isin(estados, ['Pendiente', 'En preparación', 'Cancelado'])
+    no_entrega = no_salida | (estados == 'En reparto')
+    salida = np.where(no_salida, -1, salida % 86400)
+    entrega = np.where(no_entrega, -1, entrega % 86400)
+    return estados.tolist(), salida, entrega, estimada % 86400
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Matriz de Tipos de Índice: B-tree frente a BRIN, hash, bloom y parciales
+Proyecto: Fredys Food Database Performance Analysis
+
+get_index_definitions (measure_performance.py) solo construye B-tree, varios
+sobre columnas de baja cardinalidad o en orden de inserción. Para cada
+columna candidata este experimento prueba métodos de acceso alternativos:
+- Pedido.fecha:         B-tree frente a BRIN (los pedidos llegan en orden de fecha)
+- zona_entrega:         B-tree frente a hash para los joins de igualdad por zona
+- estado+zona_entrega:  B-tree multicolumna frente a bloom (contrib, solo igualdad)
+- estado:               B-tree (estado, fecha) frente a un índice parcial de
+                        fecha por cada estado
+
+Antes de empezar se retiran los índices secundarios de las tablas afectadas
+(se restauran al terminar), así que cada variante se compara con la misma
+base sin índices. Por variante se informa el tiempo de construcción, el
+tamaño en disco, la mediana de ejecución de cada consulta (EXPLAIN ANALYZE,
+caché caliente) y si el plan llegó a usar el índice.
+
+Uso: python index_matrix.py [candidato ...] [--runs N]
+"""
+
+import json
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from estados import ESTADOS
+from fast_load import capture_secondary_indexes
+
+RUNS = 5
+BASELINE = 'sin_indice'
+# Tablas cuyos índices secundarios se retiran durante el experimento
+TABLES = ['Pedido', 'Cubre']
+
+# candidato -> variante -> sentencias; los índices se llaman idx_mx_*
+CANDIDATES = {
+    'pedido_fecha': {
+        'btree': ["CREATE INDEX idx_mx_pedido_fecha ON Pedido (fecha)"],
+        'brin': ["CREATE INDEX idx_mx_pedido_fecha ON Pedido USING brin (fecha) WITH (pages_per_range = 32)"],
+    },
+    'zona_entrega': {
+        'btree': ["CREATE INDEX idx_mx_pedido_zona ON Pedido (zona_entrega)",
+                  "CREATE INDEX idx_mx_cubre_zona ON Cubre (zona_entrega)"],
+        'hash': ["CREATE INDEX idx_mx_pedido_zona ON Pedido USING hash (zona_entrega)",
+                 "CREATE INDEX idx_mx_cubre_zona ON Cubre USING hash (zona_entrega)"],
+    },
+    'estado_zona': {
+        'btree': ["CREATE INDEX idx_mx_pedido_estado_zona ON Pedido (estado, zona_entrega)"],
+        'bloom': ["CREATE EXTENSION IF NOT EXISTS bloom",
+                  "CREATE INDEX idx_mx_pedido_estado_zona ON Pedido USING bloom (estado, zona_entrega) "
+                  "WITH (length = 64, col1 = 2, col2 = 2)"],
+    },
+    'estado': {
+        'btree': ["CREATE INDEX idx_mx_pedido_estado_fecha ON Pedido (estado, fecha)"],
+        'parcial': [f"CREATE INDEX idx_mx_pedido_fecha_estado_{i} ON Pedido (fecha) WHERE estado = '{estado}'"
+                    for i, estado in enumerate(ESTADOS)],
+    },
+}
+
+
+def _used_indexes(plan):
+    """Nombres de los índices idx_mx_* que aparecen en el plan ejecutado"""
+    names = set()
+    if plan.get('Index Name', '').startswith('idx_mx_'):
+        names.add(plan['Index Name'])
+    for child in plan.get('Plans', []):
+        names |= _used_indexes(child)
+    return names
+
+
+def measure_queries(cursor, queries, runs):
+    """query_id -> {mediana en ms, índices idx_mx_* usados}"""
+    results = {}
+    for query_id, query in queries.items():
+        times = []
+        for i in range(runs + 1):
+            cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {query['sql']}")
+            plan = cursor.fetchone()[0][0]
+            if i > 0:
+                times.append(plan['Execution Time'])
+        results[query_id] = {'median_ms': statistics.median(times),
+                             'indexes_used': sorted(_used_indexes(plan['Plan']))}
+    return results
+
+
+def matrix_indexes(cursor):
+    cursor.execute("SELECT indexname FROM pg_indexes WHERE schemaname = 'public' AND indexname LIKE 'idx_mx_%'")
+    return [row[0] for row in cursor.fetchall()]
+
+
+def run_variant(cursor, statements, queries, runs):
+    """Construir la variante, medir construcción, tamaño y consultas, y eliminarla"""
+    start = time.perf_counter()
+    for sql in statements:
+        cursor.execute(sql)
+    build = time.perf_counter() - start
+    names = matrix_indexes(cursor)
+    cursor.execute("SELECT COALESCE(sum(pg_relation_size(to_regclass(n))), 0) FROM unnest(%s::text[]) n",
+                   (names,))
+    size = cursor.fetchone()[0]
+    cursor.execute(f"ANALYZE {', '.join(TABLES)}")
+    result = {'build_seconds': build, 'size_bytes': size, 'indexes': names,
+              'queries': measure_queries(cursor, queries, runs)}
+    for name in names:
+        cursor.execute(f"DROP INDEX {name}")
+    return result
+
+
+def run_matrix(cursor, queries, candidates, runs=RUNS):
+    """Medir la base sin índices y cada variante de cada candidato; restaura los índices retirados"""
+    secondary = capture_secondary_indexes(cursor, TABLES)
+    for name, _ in secondary:
+        cursor.execute(f"DROP INDEX {name}")
+    results = {}
+    try:
+        cursor.execute(f"ANALYZE {', '.join(TABLES)}")
+        print(f"\n🔄 Base sin índices secundarios en {', '.join(TABLES)}...")
+        results[BASELINE] = {'build_seconds': 0.0, 'size_bytes': 0, 'indexes': [],
+                             'queries': measure_queries(cursor, queries, runs)}
+        for candidate in candidates:
+            for variant, statements in CANDIDATES[candidate].items():
+                key = f"{candidate}:{variant}"
+                print(f"🔄 {key}...")
+                try:
+                    results[key] = run_variant(cursor, statements, queries, runs)
+                except Exception as e:
+                    # Sin la extensión bloom (contrib) esa variante no se puede construir
+                    print(f"  ⚠️  Variante omitida: {e}")
+                    for name in matrix_indexes(cursor):
+                        cursor.execute(f"DROP INDEX {name}")
+    finally:
+        for _, definition in secondary:
+            cursor.execute(definition)
+        cursor.execute(f"ANALYZE {', '.join(TABLES)}")
+    return results
+
+
+def print_matrix(results):
+    query_ids = list(next(iter(results.values()))['queries'])
+    width = 26 + 10 + 10 + 14 * len(query_ids)
+    print("\n" + "=" * width)
+    print("📊 MATRIZ DE TIPOS DE ÍNDICE (mediana en ms; * = el plan usa el índice)")
+    print("=" * width)
+    print(f"{'Variante':<26}{'Constr. s':>10}{'MB':>10}" + ''.join(f"{q:>14}" for q in query_ids))
+    for key, result in results.items():
+        cells = ''.join(f"{result['queries'][q]['median_ms']:>13.2f}{'*' if result['queries'][q]['indexes_used'] else ' '}"
+                        for q in query_ids)
+        print(f"{key:<26}{result['build_seconds']:>10.2f}{result['size_bytes'] / 1e6:>10.2f}{cells}")
+
+
+def main():
+    from main import connect_db
+    from measure_performance import DatabasePerformanceTester
+
+    args = sys.argv[1:]
+    runs = RUNS
+    if '--runs' in args:
+        position = args.index('--runs')
+        try:
+            runs = int(args[position + 1])
+        except (IndexError, ValueError):
+            print("❌ --runs requiere un número")
+            return
+        del args[position:position + 2]
+    candidates = args or list(CANDIDATES)
+    unknown = [c for c in candidates if c not in CANDIDATES]
+    if unknown:
+        print(f"❌ Candidatos desconocidos: {', '.join(unknown)}")
+        print(f"Candidatos disponibles: {', '.join(CANDIDATES)}")
+        return
+
+    print(f"🎯 MATRIZ DE TIPOS DE ÍNDICE - {', '.join(candidates)} ({runs} ejecuciones por consulta)")
+    conn = connect_db()
+    conn.autocommit = True
+    cursor = conn.cursor()
+    results = run_matrix(cursor, DatabasePerformanceTester().get_query_definitions(), candidates, runs)
+    cursor.close()
+    conn.close()
+
+    print_matrix(results)
+    output = "index_matrix.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'timestamp': datetime.now().isoformat(), 'runs': runs, 'results': results},
+                  f, indent=2, ensure_ascii=False)
+    print(f"\n📁 Resultados guardados en: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Capa de Carga Masiva para el Sembrado de Datos
+Proyecto: Fredys Food Database Performance Analysis
+
+Envía las tuplas generadas por main.py a PostgreSQL con distintas estrategias:
+- executemany:    una sentencia INSERT por fila (comportamiento original)
+- execute_values: INSERT ... VALUES con muchas filas por sentencia
+- unnest:         INSERT ... SELECT unnest(...) con un array por columna
+- copy_text:      COPY ... FROM STDIN en formato texto
+- copy_binary:    COPY ... FROM STDIN en formato binario
+
+Las estrategias COPY consumen las filas en streaming, sin construir el
+archivo completo en memoria.
+"""
+
+import struct
+import time
+from datetime import date, datetime, time as dtime
+from decimal import Decimal
+from itertools import islice
+
+from psycopg2.extras import execute_values
+
+
+# Tipo de cada columna del esquema (create_schema.sql), necesario para
+# codificar COPY binario y para tipar los arrays de la estrategia unnest
+COLUMN_TYPES = {
+    'Usuario': {'id_usuario': 'int4', 'nombre': 'text', 'apellido': 'text', 'numero_telef': 'text'},
+    'Cliente': {'id_usuario': 'int4', 'empresa': 'text'},
+    'Trabajador': {'id_usuario': 'int4', 'nro_telef_emergencia': 'text'},
+    'Repartidor': {'id_usuario': 'int4'},
+    'Administrador': {'id_usuario': 'int4', 'correo': 'text'},
+    'Menu': {'id_menu': 'int4', 'id_administrador': 'int4', 'variacion': 'text', 'fecha': 'date'},
+    'Plato': {'id_plato': 'int4', 'nombre': 'text', 'foto': 'text', 'tipo': 'text',
+              'categoria': 'text', 'codigo_info_nutricional': 'text', 'precio': 'numeric'},
+    'Pertenece': {'id_menu': 'int4', 'id_plato': 'int4'},
+    'ZonaEntrega': {'nombre': 'text', 'costo': 'numeric'},
+    'Pedido': {'id_pedido': 'int4', 'fecha': 'timestamp', 'estado': 'text', 'hora_salida': 'time',
+               'hora_entrega': 'time', 'hora_entrega_estimada': 'time',
+               'direccion_exacta': 'text', 'zona_entrega': 'text'},
+    'Tiene': {'id_pedido': 'int4', 'id_menu': 'int4'},
+    'Hace': {'id_pedido': 'int4', 'id_usuario': 'int4', 'calificacion': 'int4', 'comentario': 'text'},
+    'Vive': {'zona_entrega': 'text', 'id_usuario': 'int4'},
+    'Cubre': {'zona_entrega': 'text', 'id_usuario': 'int4'},
+}
+
+STRATEGIES = ['executemany', 'execute_values', 'unnest', 'copy_text', 'copy_binary']
+DEFAULT_STRATEGY = 'copy_text'
+
+# Filas por sentencia (execute_values, unnest) o por bloque enviado (COPY)
+DEFAULT_PAGE_SIZE = 5000
+
+_PG_EPOCH_DATE = date(2000, 1, 1)
+_PG_EPOCH_DATETIME = datetime(2000, 1, 1)
+
+_BINARY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('!ii', 0, 0)
+_BINARY_TRAILER = struct.pack('!h', -1)
+
+
+# --- Codificación COPY texto ---
+
+def _text_field(value):
+    """Serializar un valor según el formato texto de COPY"""
+    if value is None:
+        return '\\N'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def encode_text_rows(rows):
+    """Codificar filas como líneas del formato texto de COPY"""
+    lines = ['\t'.join([_text_field(v) for v in row]) for row in rows]
+    lines.append('')
+    return '\n'.join(lines).encode('utf-8')
+
+
+# --- Codificación COPY binario ---
+
+def _as_time(value):
+    if isinstance(value, str):
+        return dtime.fromisoformat(value)
+    return value
+
+
+def _encode_numeric(value):
+    """Codificar un DECIMAL en el formato binario de PostgreSQL (base 10000)"""
+    d = Decimal(str(value))
+    sign = 0x4000 if d.is_signed() else 0x0000
+    dscale = max(0, -d.as_tuple().exponent)
+    int_part, _, frac_part = format(abs(d), 'f').partition('.')
+    int_part = int_part.zfill((len(int_part) + 3) // 4 * 4)
+    frac_part = frac_part.ljust((len(frac_part) + 3) // 4 * 4, '0')
+    digits = [int(int_part[i:i + 4]) for i in range(0, len(int_part), 4)]
+    weight = len(digits) - 1
+    digits += [int(frac_part[i:i + 4]) for i in range(0, len(frac_part), 4)]
+    while digits and digits[0] == 0:
+        digits.pop(0)
+        weight -= 1
+    while digits and digits[-1] == 0:
+        digits.pop()
+    if not digits:
+        weight = 0
+    return struct.pack(f'!hhHH{len(digits)}H', len(digits), weight, sign, dscale, *digits)
+
+
+def _encode_binary(pg_type, value):
+    if pg_type == 'int4':
+        return struct.pack('!i', value)
+    if pg_type == 'int2':
+        return struct.pack('!h', value)
+    if pg_type == 'text':
+        return str(value).encode('utf-8')
+    if pg_type == 'date':
+        return struct.pack('!i', (value - _PG_EPOCH_DATE).days)
+    if pg_type == 'timestamp':
+        delta = value - _PG_EPOCH_DATETIME
+        return struct.pack('!q', (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds)
+    if pg_type == 'time':
+        t = _as_time(value)
+        return struct.pack('!q', ((t.hour * 60 + t.minute) * 60 + t.second) * 1000000 + t.microsecond)
+    if pg_type == 'numeric':
+        return _encode_numeric(value)
+    raise ValueError(f"Tipo no soportado en COPY binario: {pg_type}")
+
+
+def encode_binary_rows(rows, types):
+    """Codificar filas como tuplas del formato binario de COPY (sin cabecera)"""
+    out = bytearray()
+    field_count = struct.pack('!h', len(types))
+    for row in rows:
+        out += field_count
+        for pg_type, value in zip(types, row):
+            if value is None:
+                out += b'\xff\xff\xff\xff'
+            else:
+                data = _encode_binary(pg_type, value)
+                out += struct.pack('!i', len(data))
+                out += data
+    return bytes(out)
+
+
+class _StreamingFile:
+    """Adaptador de un iterador de bloques de bytes a objeto tipo archivo para copy_expert"""
+
+    def __init__(self, blocks):
+        self._blocks = iter(blocks)
+        self._buffer = bytearray()
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._blocks)
+            except StopIteration:
+                break
+        if size < 0 or size >= len(self._buffer):
+            data = bytes(self._buffer)
+            self._buffer.clear()
+        else:
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+        self.bytes_read += len(data)
+        return data
+
+    readline = read
+
+
+def _batches(rows, size):
+    """Agrupar un iterable de filas en listas de tamaño fijo"""
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class BulkLoader:
+    """Inserta filas en una tabla con la estrategia seleccionada y registra estadísticas"""
+
+    def __init__(self, cursor, strategy=DEFAULT_STRATEGY, page_size=DEFAULT_PAGE_SIZE):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Estrategia de inserción desconocida: {strategy}")
+        self.cursor = cursor
+        self.strategy = strategy
+        self.page_size = page_size
+        # tabla -> {'rows': filas insertadas, 'seconds': tiempo de inserción,
+        #           'round_trips_est': esperas de respuesta del servidor,
+        #           'bytes_est': bytes enviados}
+        # Las esperas y los bytes son estimaciones: se cuentan según el protocolo
+        # de cada estrategia (una espera por sentencia, dos por COPY...), no se
+        # observan en el socket
+        self.stats = {}
+        self.round_trips = 0
+        self.bytes_sent = 0
+        # Tipos por tabla y columna (otro esquema, ver compact.py, los reemplaza)
+        self.column_types = COLUMN_TYPES
+
+    def insert(self, table, columns, rows):
+        """Insertar filas (lista o iterable) en table; devuelve el número de filas"""
+        start = time.perf_counter()
+        trips, sent = self.round_trips, self.bytes_sent
+        count = getattr(self, f'_insert_{self.strategy}')(table, list(columns), rows)
+        elapsed = time.perf_counter() - start
+
+        entry = self.stats.setdefault(table, {'rows': 0, 'seconds': 0.0, 'round_trips_est': 0, 'bytes_est': 0})
+        entry['rows'] += count
+        entry['seconds'] += elapsed
+        entry['round_trips_est'] += self.round_trips - trips
+        entry['bytes_est'] += self.bytes_sent - sent
+        return count
+
+    def _types(self, table, columns):
+        return [self.column_types[table][c] for c in columns]
+
+    def _insert_executemany(self, table, columns, rows):
+        count = 0
+        placeholders = ', '.join(['%s'] * len(columns))
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+        for batch in _batches(rows, self.page_size):
+            self.cursor.executemany(sql, batch)
+            count += len(batch)
+            # psycopg2 ejecuta y espera cada fila por separado; cursor.query es
+            # la última sentencia, así que los bytes son una estimación
+            self.round_trips += len(batch)
+            self.bytes_sent += len(self.cursor.query) * len(batch)
+        return count
+
+    def _insert_execute_values(self, table, columns, rows):
+        count = 0
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s"
+        for batch in _batches(rows, self.page_size):
+            execute_values(self.cursor, sql, batch, page_size=len(batch))
+            count += len(batch)
+            self.round_trips += 1
+            self.bytes_sent += len(self.cursor.query)
+        return count
+
+    def _insert_unnest(self, table, columns, rows):
+        count = 0
+        arrays = ', '.join([f"%s::{t}[]" for t in self._types(table, columns)])
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) SELECT * FROM unnest({arrays})"
+        for batch in _batches(rows, self.page_size):
+            self.cursor.execute(sql, [list(col) for col in zip(*batch)])
+            count += len(batch)
+            self.round_trips += 1
+            self.bytes_sent += len(self.cursor.query)
+        return count
+
+    def _copy(self, sql, blocks):
+        stream = _StreamingFile(blocks)
+        self.cursor.copy_expert(sql, stream, size=65536)
+        # Inicio del COPY (CopyInResponse) y fin (CommandComplete)
+        self.round_trips += 2
+        self.bytes_sent += stream.bytes_read
+
+    def _insert_copy_text(self, table, columns, rows):
+        counter = [0]
+
+        def blocks():
+            for batch in _batches(rows, self.page_size):
+                counter[0] += len(batch)
+                yield encode_text_rows(batch)
+
+        self._copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN", blocks())
+        return counter[0]
+
+    def _insert_copy_binary(self, table, columns, rows):
+        types = self._types(table, columns)
+        counter = [0]
+
+        def blocks():
+            yield _BINARY_HEADER
+            for batch in _batches(rows, self.page_size):
+                counter[0] += len(batch)
+                yield encode_binary_rows(batch, types)
+            yield _BINARY_TRAILER
+
+        self._copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT binary)", blocks())
+        return counter[0]
+
+    def report(self):
+        """Mostrar filas/segundo por tabla"""
+        print(f"\n📊 Inserción por tabla (estrategia: {self.strategy})")
+        for table, entry in self.stats.items():
+            rate = entry['rows'] / entry['seconds'] if entry['seconds'] > 0 else float('inf')
+            print(f"  {table:<14} {entry['rows']:>10,} filas  {entry['seconds']:>8.2f} s  {rate:>12,.0f} filas/s")
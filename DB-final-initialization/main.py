@@ -1,177 +1,987 @@
 import psycopg2
 from faker import Faker
 from faker_food import FoodProvider
-from random import randint, choice, sample
-import sys
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from datetime import date, datetime, timedelta, time as dtime
+from itertools import chain, islice
+import argparse
+import array
+import hashlib
+import os
+import random
+import resource
+import threading
+
+import numpy as np
+
+from checkpoint import CheckpointLoader, discard_run, finish_run, read_run, start_run
+from dag_loader import DagScheduler
+from dataset_artifact import export_dataset, import_dataset, record_dataset_meta
+from db_driver import DEFAULT_DRIVER, DRIVERS, get_driver
+from distributions import RELATIONS, UNIFORM, describe, parse_skew
+from estados import ESTADOS
+import history
+from fast_load import FastLoad, UnloggedLoad, truncate_tables
+from compact import CompactLoader, is_compact
+from partitions import ensure_partitions, is_partitioned
+from pipeline import AsyncPipeline
+from profiling import SeedProfiler, run_profiled
+from stats_profile import StatsProfile
+from loader import STRATEGIES, DEFAULT_STRATEGY
+import value_pools
+from value_pools import draw, distinct_draws
 
 # Inicializar Faker con proveedor de comida
 fake = Faker()
 fake.add_provider(FoodProvider)
 
+DEFAULT_SEED = 42
+# Filas por bloque de generación; fija los límites de los bloques y, con ellos,
+# las semillas, así que los datos no dependen del número de procesos
+CHUNK_SIZE = 10000
+# Bloques en vuelo en la cola de --pipeline: la memoria queda acotada a esto
+PIPELINE_QUEUE_CHUNKS = 8
+
+DB_PARAMS = {
+    'host': "localhost",
+    'database': "final_project",
+    'user': "postgres",
+    'password': "password123",
+    'port': 5433
+}
+
 def connect_db():
-    return psycopg2.connect(
-        host="localhost",
-        database="final_project",
-        user="postgres",
-        password="password123",
-        port=5433
-    )
+    return psycopg2.connect(**DB_PARAMS)
+
+# --- Generación paralela por bloques ---
+
+# Datos compartidos por todos los bloques de una tabla (ids padre, zonas)
+_shared = {}
+# Sin pool de procesos, _shared, fake y random son globales de este proceso:
+# varias tablas generadas a la vez desde hilos (dag_loader.py) se turnan
+_serial_lock = threading.Lock()
+
+
+def chunk_seed(seed, table, index):
+    """Semilla de un bloque, derivada de la semilla global, la tabla y la posición del bloque"""
+    digest = hashlib.blake2b(f"{seed}:{table}:{index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def _init_worker(shared):
+    _shared.clear()
+    _shared.update(shared)
+
+
+def _sub_seed(seed, stream):
+    """Semilla independiente para cada fuente de azar de un bloque"""
+    digest = hashlib.blake2b(f"{seed}:{stream}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def _run_chunk(task):
+    row_fn, seed, args = task
+    # Faker, el random global (faker_food elige con él) y el rng de las filas
+    # no comparten secuencia: con la misma semilla sus sorteos irían correlacionados
+    fake.seed_instance(_sub_seed(seed, 'faker'))
+    random.seed(_sub_seed(seed, 'faker_food'))
+    return row_fn(random.Random(_sub_seed(seed, 'filas')), *args)
+
+
+class DataGenerator:
+    """Genera las filas de cada tabla por bloques, repartidos en un pool de procesos
+
+    Los bloques se producen bajo demanda: como mucho 2 por proceso están en
+    vuelo a la vez, así que la memoria no crece con el tamaño de la tabla.
+    """
+
+    def __init__(self, seed=DEFAULT_SEED, workers=1, chunk_size=CHUNK_SIZE, fast=False, scope=None,
+                 skew=None, history_days=None, stats=None, profiler=None):
+        self.seed = seed
+        # Periodo del historial de pedidos (None: últimos 30 días sin estacionalidad)
+        self.history_days = history_days
+        # Perfil de sesgo de cada clave foránea (distributions.RELATIONS)
+        self.skew = skew or parse_skew([])
+        # Perfil de estadísticas de producción (stats_profile.StatsProfile) o None
+        self.stats = stats
+        # Con --profile (profiling.SeedProfiler): tiempos y pilas de cada bloque
+        self.profiler = profiler
+        # Ámbito de las semillas: las filas de --grow-to no repiten las del sembrado base
+        self.scope = scope
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.max_pending = 2 * max(1, workers)
+        # Modo --fast-faker: vocabularios por columna + sorteos vectorizados con NumPy
+        self.fast = fast
+        self.pools = value_pools.load_pools(fake, seed) if fast else None
+        # Decisiones tomadas en el proceso principal (subconjuntos de usuarios)
+        self.rng = random.Random(seed if scope is None else f"{seed}:{scope}")
+        # Referencia temporal fija para toda la ejecución (las fechas no dependen
+        # de cuándo se genera cada bloque)
+        self.today = date.today()
+
+    def split_items(self, items):
+        return ((items[i:i + self.chunk_size],) for i in range(0, len(items), self.chunk_size))
+
+    def split_positions(self, items):
+        """Como split_items, añadiendo la posición del primer elemento de cada bloque"""
+        return ((items[i:i + self.chunk_size], i) for i in range(0, len(items), self.chunk_size))
+
+    def chunks(self, table, row_fn, chunk_args, shared=None, start=0):
+        """Iterar los bloques de filas en orden, a medida que los procesos los terminan
+
+        Con start se omiten (sin generarlos) los primeros bloques; los demás
+        conservan su índice y, por tanto, su semilla.
+        """
+        if self.fast:
+            row_fn = FAST_ROWS.get(row_fn, row_fn)
+            shared = dict(shared or {}, pools=self.pools)
+        key = table if self.scope is None else f"{self.scope}:{table}"
+        tasks = ((row_fn, chunk_seed(self.seed, key, i), args)
+                 for i, args in islice(enumerate(chunk_args), start, None))
+        shared = dict(shared or {}, today=self.today, skew=self.skew, stats=self.stats)
+        profiler = self.profiler
+        if self.workers <= 1:
+            for task in tasks:
+                with _serial_lock:
+                    _init_worker(shared)
+                    rows = _run_chunk(task) if profiler is None else profiler.run(table, _run_chunk, task)
+                yield rows
+            return
+        with ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                 initargs=(shared,)) as pool:
+            pending = deque()
+            for task in tasks:
+                if profiler is None:
+                    pending.append(pool.submit(_run_chunk, task))
+                else:
+                    pending.append(pool.submit(run_profiled, _run_chunk, task, profiler.sample))
+                if len(pending) >= self.max_pending:
+                    yield self._result(table, pending.popleft())
+            while pending:
+                yield self._result(table, pending.popleft())
+
+    def _result(self, table, future):
+        if self.profiler is None:
+            return future.result()
+        return self.profiler.collect(table, future)
+
+    def rows(self, table, row_fn, chunk_args, shared=None):
+        """Iterar las filas de todos los bloques, sin materializar la tabla completa"""
+        return TableRows(self, table, row_fn, chunk_args, shared)
+
+
+class TableRows:
+    """Filas de una tabla: se recorren como una sola secuencia o bloque a bloque (ver checkpoint.py)"""
+
+    def __init__(self, gen, table, row_fn, chunk_args, shared):
+        self.gen = gen
+        self.args = (table, row_fn, chunk_args, shared)
+
+    def __iter__(self):
+        return chain.from_iterable(self.gen.chunks(*self.args))
+
+    def chunks(self, start=0):
+        return self.gen.chunks(*self.args, start=start)
+
+
+# Columna SERIAL de cada tabla con clave generada
+SERIAL_COLUMNS = {'Usuario': 'id_usuario', 'Menu': 'id_menu', 'Plato': 'id_plato', 'Pedido': 'id_pedido'}
+
+
+def reserve_ids(cursor, table, n):
+    """Reservar n valores de la secuencia SERIAL de table en una sola ida y vuelta
+
+    Devuelve un range si el bloque es contiguo (lo normal sin escrituras
+    concurrentes) o, si no, un array con los valores reservados.
+    """
+    cursor.execute("""
+        WITH r AS (SELECT nextval(pg_get_serial_sequence(%s, %s)) AS v FROM generate_series(1, %s))
+        SELECT min(v), max(v),
+               CASE WHEN max(v) - min(v) + 1 = count(*) THEN NULL ELSE array_agg(v ORDER BY v) END
+        FROM r
+    """, (table, SERIAL_COLUMNS[table], n))
+    first, last, values = cursor.fetchone()
+    if first is None:
+        return range(0)
+    if values is None:
+        return range(first, last + 1)
+    return array.array('l', values)
+
+
+def peak_memory_mb():
+    """Pico de memoria residente (MB) del proceso principal y del mayor proceso generador"""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    return own, children
+
+# --- Filas de cada tabla (un bloque por llamada) ---
+
+def _skew(relation):
+    return _shared.get('skew', {}).get(relation, UNIFORM)
+
+
+def _fk_indices(rng, relation, population, count):
+    """Índices sesgados para las count filas de un bloque, o None si la relación es uniforme"""
+    profile = _skew(relation)
+    if profile.is_uniform:
+        return None
+    return profile.sample(_np_rng(rng), population, count).tolist()
+
+
+def _profiled(nrng, table, column, default, offset=None):
+    """Valores de la columna según --stats-profile (stats_profile.py); default si no está perfilada"""
+    stats = _shared.get('stats')
+    sampler = stats.column(table, column) if stats else None
+    if sampler is None:
+        return default
+    return sampler.sample(nrng, len(default), offset, _shared.get('total'))
 
-# --- Generadores de datos para cada tabla ---
 
-def create_usuario(cursor, n):
-    usuarios = []
-    for _ in range(n):
-        nombre = fake.first_name()[:20]
-        apellido = fake.last_name()[:25]
-        telefono = fake.phone_number()[:30]
-        usuarios.append((nombre, apellido, telefono))
-    cursor.executemany(
-        "INSERT INTO Usuario (nombre, apellido, numero_telef) VALUES (%s, %s, %s)", usuarios)
-    cursor.execute("SELECT id_usuario FROM Usuario ORDER BY id_usuario DESC LIMIT %s", (n,))
-    return [row[0] for row in cursor.fetchall()][::-1]
-
-
-def create_cliente(cursor, usuario_ids):
-    clientes = [(uid, fake.company()[:50]) for uid in usuario_ids]
-    cursor.executemany("INSERT INTO Cliente (id_usuario, empresa) VALUES (%s, %s)", clientes)
-    return usuario_ids.copy()
+def _fanout_width(table, default):
+    """Máximo de filas hijas por fila padre de table"""
+    stats = _shared.get('stats')
+    fanout = stats.rows_per_parent(table) if stats else None
+    return max(fanout.max, 1) if fanout else default
 
 
-def create_trabajador(cursor, usuario_ids):
-    trabajadores = [(uid, fake.phone_number()[:30]) for uid in usuario_ids]
-    cursor.executemany("INSERT INTO Trabajador (id_usuario, nro_telef_emergencia) VALUES (%s, %s)", trabajadores)
-    return usuario_ids.copy()
+def _rows_per_parent(nrng, table, width, count):
+    """Filas hijas de cada fila padre: histograma de --stats-profile o uniforme entre 1 y width"""
+    stats = _shared.get('stats')
+    fanout = stats.rows_per_parent(table) if stats else None
+    if fanout is None:
+        return nrng.integers(1, width + 1, size=count)
+    return np.minimum(fanout.sample(nrng, count), width)
 
 
-def create_repartidor(cursor, trabajador_ids, k):
-    repart = sample(trabajador_ids, k)
-    cursor.executemany("INSERT INTO Repartidor (id_usuario) VALUES (%s)", [(rid,) for rid in repart])
-    return repart
+def _usuario_rows(rng, ids):
+    return [(uid, fake.first_name()[:20], fake.last_name()[:25], fake.phone_number()[:30])
+            for uid in ids]
 
 
-def create_administrador(cursor, trabajador_ids, k):
-    admins = sample(trabajador_ids, k)
-    registros = [(uid, fake.email()[:50]) for uid in admins]
-    cursor.executemany("INSERT INTO Administrador (id_usuario, correo) VALUES (%s, %s)", registros)
-    return admins
+def _cliente_rows(rng, usuario_ids):
+    return [(uid, fake.company()[:50]) for uid in usuario_ids]
+
+
+def _trabajador_rows(rng, usuario_ids):
+    return [(uid, fake.phone_number()[:30]) for uid in usuario_ids]
 
 
-def create_menu(cursor, admin_ids, m):
+def _administrador_rows(rng, usuario_ids):
+    return [(uid, fake.email()[:50]) for uid in usuario_ids]
+
+
+def _menu_rows(rng, ids):
+    admin_ids = _shared['admin_ids']
+    hoy = _shared['today']
+    picks = _fk_indices(rng, 'administrador', len(admin_ids), len(ids))
     menus = []
-    for _ in range(m):
-        id_admin = choice(admin_ids)
+    for i, mid in enumerate(ids):
+        id_admin = admin_ids[picks[i]] if picks is not None else rng.choice(admin_ids)
         variacion = fake.word()[:50]
-        fecha = fake.date_between(start_date='-1y', end_date='today')
-        menus.append((id_admin, variacion, fecha))
-    cursor.executemany(
-        "INSERT INTO Menu (id_administrador, variacion, fecha) VALUES (%s, %s, %s)", menus)
-    cursor.execute("SELECT id_menu FROM Menu ORDER BY id_menu DESC LIMIT %s", (m,))
-    return [row[0] for row in cursor.fetchall()][::-1]
+        fecha = fake.date_between(start_date=hoy - timedelta(days=365), end_date=hoy)
+        menus.append((mid, id_admin, variacion, fecha))
+    return menus
 
 
-def create_plato(cursor, p):
+def _plato_rows(rng, ids):
     platos = []
-    for _ in range(p):
+    for pid in ids:
         # Generar nombre coherente de plato usando faker-food
         nombre = fake.dish()
         foto = fake.image_url()
-        tipo = choice(['Entrante', 'Principal', 'Postre', 'Bebida'])[:30]
-        categoria = choice(['Vegano', 'Vegetariano', 'Carne', 'Pescado', 'Sin Gluten'])[:30]
+        tipo = rng.choice(['Entrante', 'Principal', 'Postre', 'Bebida'])[:30]
+        categoria = rng.choice(['Vegano', 'Vegetariano', 'Carne', 'Pescado', 'Sin Gluten'])[:30]
         cod_nutri = fake.uuid4()[:36]
-        platos.append((nombre, foto, tipo, categoria, cod_nutri))
-    cursor.executemany(
-        "INSERT INTO Plato (nombre, foto, tipo, categoria, codigo_info_nutricional) VALUES (%s, %s, %s, %s, %s)", platos)
-    cursor.execute("SELECT id_plato FROM Plato ORDER BY id_plato DESC LIMIT %s", (p,))
-    return [row[0] for row in cursor.fetchall()][::-1]
+        platos.append((pid, nombre, foto, tipo, categoria, cod_nutri))
+    return platos
 
 
-def create_pertenece(cursor, menu_ids, plato_ids):
+def _pertenece_rows(rng, menu_ids):
+    if not _skew('plato').is_uniform:
+        # Sin columnas de Faker: con sesgo se usa directamente el sorteo vectorizado
+        return _pertenece_rows_fast(rng, menu_ids)
+    plato_ids = _shared['plato_ids']
     relaciones = []
     for mid in menu_ids:
-        seleccion = sample(plato_ids, k=randint(1, min(4, len(plato_ids))))
+        seleccion = rng.sample(plato_ids, k=rng.randint(1, min(4, len(plato_ids))))
         for pid in seleccion:
             relaciones.append((mid, pid))
-    cursor.executemany("INSERT INTO Pertenece (id_menu, id_plato) VALUES (%s, %s)", relaciones)
+    return relaciones
+
+
+def _pedido_rows(rng, ids, offset=0):
+    zonas = _shared['zonas']
+    ahora = datetime.combine(_shared['today'], datetime.min.time())
+    picks = _fk_indices(rng, 'zona', len(zonas), len(ids))
+    if _shared.get('history'):
+        columns = zip(*_history_columns(_np_rng(rng), offset, len(ids)))
+        return [(pid, fecha, estado, hs, he, he_est, fake.address()[:200],
+                 zonas[picks[i]] if picks is not None else rng.choice(zonas))
+                for i, (pid, (fecha, estado, hs, he, he_est)) in enumerate(zip(ids, columns))]
+    pedidos = []
+    for i, pid in enumerate(ids):
+        fecha = fake.date_time_between(start_date=ahora - timedelta(days=30), end_date=ahora)
+        estado = rng.choice(ESTADOS)
+        hs, he, he_est = (fake.time(end_datetime=ahora) for _ in range(3))
+        direccion = fake.address()[:200]
+        zona = zonas[picks[i]] if picks is not None else rng.choice(zonas)
+        pedidos.append((pid, fecha, estado, hs, he, he_est, direccion, zona))
+    return pedidos
 
 
-def create_zona_entrega(cursor):
-    zonas = [('Zona Norte', 5.00), ('Zona Sur', 7.50), ('Centro', 6.25)]
-    cursor.executemany("INSERT INTO ZonaEntrega (nombre, costo) VALUES (%s, %s)", zonas)
-    return [z[0] for z in zonas]
+def _tiene_rows(rng, pedido_ids):
+    if not _skew('menu').is_uniform:
+        return _tiene_rows_fast(rng, pedido_ids)
+    menu_ids = _shared['menu_ids']
+    return [(pid, mid) for pid in pedido_ids for mid in rng.sample(menu_ids, k=rng.randint(1,3))]
 
 
-def create_pedido(cursor, usuario_ids, zonas, t):
-    pedidos = []
-    for _ in range(t):
-        fecha = fake.date_time_between(start_date='-30d', end_date='now')
-        estado = choice(['Pendiente', 'En preparación', 'En reparto', 'Entregado', 'Cancelado'])
-        hs, he, he_est = fake.time(), fake.time(), fake.time()
-        direccion = fake.address()[:200]
-        zona = choice(zonas)
-        pedidos.append((fecha, estado, hs, he, he_est, direccion, zona))
-    cursor.executemany(
-        "INSERT INTO Pedido (fecha, estado, hora_salida, hora_entrega, hora_entrega_estimada, direccion_exacta, zona_entrega) VALUES (%s,%s,%s,%s,%s,%s,%s)", pedidos)
-    cursor.execute("SELECT id_pedido FROM Pedido ORDER BY id_pedido DESC LIMIT %s", (t,))
-    return [row[0] for row in cursor.fetchall()][::-1]
+def _hace_rows(rng, pedido_ids):
+    user_ids = _shared['user_ids']
+    picks = _fk_indices(rng, 'usuario', len(user_ids), len(pedido_ids))
+    if picks is not None:
+        return [(pid, user_ids[picks[i]], rng.randint(1,5), fake.text(max_nb_chars=100))
+                for i, pid in enumerate(pedido_ids)]
+    return [(pid, rng.choice(user_ids), rng.randint(1,5), fake.text(max_nb_chars=100)) for pid in pedido_ids]
+
+
+def _zona_rows(rng, usuario_ids):
+    zonas = _shared['zonas']
+    picks = _fk_indices(rng, 'zona', len(zonas), len(usuario_ids))
+    if picks is not None:
+        return [(zonas[picks[i]], uid) for i, uid in enumerate(usuario_ids)]
+    return [(rng.choice(zonas), uid) for uid in usuario_ids]
+
+# --- Filas de cada tabla en modo --fast-faker (vectorizado con NumPy) ---
+
+ESTADO_POOL = np.array(ESTADOS)
+TIPOS = np.array(['Entrante', 'Principal', 'Postre', 'Bebida'])
+CATEGORIAS = np.array(['Vegano', 'Vegetariano', 'Carne', 'Pescado', 'Sin Gluten'])
+HORAS = ['hora_salida', 'hora_entrega', 'hora_entrega_estimada']
+_DAY_TIMES = None
+
+
+def _np_rng(rng):
+    return np.random.default_rng(rng.getrandbits(64))
+
+
+def _times_of_day(seconds):
+    global _DAY_TIMES
+    if _DAY_TIMES is None:
+        _DAY_TIMES = np.array([dtime(s // 3600, s // 60 % 60, s % 60) for s in range(86400)], dtype=object)
+    return _DAY_TIMES[seconds].tolist()
+
+
+def _times_or_null(seconds):
+    times = _times_of_day(np.maximum(seconds, 0))
+    return [t if s >= 0 else None for t, s in zip(times, seconds.tolist())]
+
+
+def _history_columns(nrng, offset, count):
+    """fecha, estado y horas de los pedidos offset..offset+count del historial (ver history.py)"""
+    h, hoy = _shared['history'], _shared['today']
+    fechas = history.order_timestamps(nrng, h['days'], hoy, offset, count, h['total'])
+    estados, salida, entrega, estimada = history.delivery(nrng, fechas, hoy)
+    return (fechas.tolist(), estados, _times_or_null(salida), _times_or_null(entrega),
+            _times_or_null(estimada))
+
+
+def _usuario_rows_fast(rng, ids):
+    nrng, pools, count = _np_rng(rng), _shared['pools'], len(ids)
+    return list(zip(ids, draw(nrng, pools['nombre'], count), draw(nrng, pools['apellido'], count),
+                    draw(nrng, pools['telefono'], count)))
+
+
+def _cliente_rows_fast(rng, usuario_ids):
+    nrng = _np_rng(rng)
+    return list(zip(usuario_ids, draw(nrng, _shared['pools']['empresa'], len(usuario_ids))))
+
+
+def _trabajador_rows_fast(rng, usuario_ids):
+    nrng = _np_rng(rng)
+    return list(zip(usuario_ids, draw(nrng, _shared['pools']['telefono'], len(usuario_ids))))
+
+
+def _administrador_rows_fast(rng, usuario_ids):
+    nrng = _np_rng(rng)
+    return list(zip(usuario_ids, draw(nrng, _shared['pools']['correo'], len(usuario_ids))))
+
+
+def _menu_rows_fast(rng, ids):
+    nrng, pools, count = _np_rng(rng), _shared['pools'], len(ids)
+    admin_ids = np.asarray(_shared['admin_ids'])
+    fechas = np.datetime64(_shared['today'], 'D') - nrng.integers(0, 366, size=count).astype('timedelta64[D]')
+    return list(zip(ids, admin_ids[_skew('administrador').sample(nrng, len(admin_ids), count)].tolist(),
+                    draw(nrng, pools['variacion'], count), _profiled(nrng, 'Menu', 'fecha', fechas.tolist())))
+
+
+def _plato_rows_fast(rng, ids):
+    nrng, pools, count = _np_rng(rng), _shared['pools'], len(ids)
+    return list(zip(ids, draw(nrng, pools['plato'], count), draw(nrng, pools['foto'], count),
+                    _profiled(nrng, 'Plato', 'tipo', draw(nrng, TIPOS, count)),
+                    _profiled(nrng, 'Plato', 'categoria', draw(nrng, CATEGORIAS, count)),
+                    draw(nrng, pools['codigo_nutricional'], count)))
+
+
+def _pertenece_rows_fast(rng, menu_ids):
+    nrng = _np_rng(rng)
+    plato_ids = np.asarray(_shared['plato_ids'])
+    seleccion = distinct_draws(nrng, len(plato_ids), len(menu_ids), _fanout_width('Pertenece', 4),
+                               _skew('plato'))
+    k = _rows_per_parent(nrng, 'Pertenece', seleccion.shape[1], len(menu_ids))
+    mask = np.arange(seleccion.shape[1]) < k[:, None]
+    menus = np.repeat(np.asarray(menu_ids), seleccion.shape[1]).reshape(seleccion.shape)
+    return list(zip(menus[mask].tolist(), plato_ids[seleccion[mask]].tolist()))
+
+
+def _pedido_rows_fast(rng, ids, offset=0):
+    nrng, pools, count = _np_rng(rng), _shared['pools'], len(ids)
+    if _shared.get('history'):
+        fechas, estados, *horas = _history_columns(nrng, offset, count)
+        return list(zip(ids, fechas, estados, *horas, draw(nrng, pools['direccion'], count),
+                        draw(nrng, np.asarray(_shared['zonas']), count, _skew('zona'))))
+    ahora = np.datetime64(datetime.combine(_shared['today'], datetime.min.time()), 's')
+    fechas = (ahora - nrng.integers(0, 30 * 86400, size=count).astype('timedelta64[s]')).tolist()
+    horas = [_times_of_day(nrng.integers(0, 86400, size=count)) for _ in range(3)]
+    estados = draw(nrng, ESTADO_POOL, count)
+    if _shared.get('stats'):
+        fechas = _profiled(nrng, 'Pedido', 'fecha', fechas, offset)
+        estados = _profiled(nrng, 'Pedido', 'estado', estados, offset)
+        horas = [_profiled(nrng, 'Pedido', column, values, offset) for column, values in zip(HORAS, horas)]
+    return list(zip(ids, fechas, estados, *horas,
+                    draw(nrng, pools['direccion'], count),
+                    draw(nrng, np.asarray(_shared['zonas']), count, _skew('zona'))))
+
+
+def _tiene_rows_fast(rng, pedido_ids):
+    nrng = _np_rng(rng)
+    menu_ids = np.asarray(_shared['menu_ids'])
+    seleccion = distinct_draws(nrng, len(menu_ids), len(pedido_ids), _fanout_width('Tiene', 3),
+                               _skew('menu'))
+    k = _rows_per_parent(nrng, 'Tiene', seleccion.shape[1], len(pedido_ids))
+    mask = np.arange(seleccion.shape[1]) < k[:, None]
+    pedidos = np.repeat(np.asarray(pedido_ids), seleccion.shape[1]).reshape(seleccion.shape)
+    return list(zip(pedidos[mask].tolist(), menu_ids[seleccion[mask]].tolist()))
+
+
+def _hace_rows_fast(rng, pedido_ids):
+    nrng = _np_rng(rng)
+    count = len(pedido_ids)
+    return list(zip(pedido_ids, draw(nrng, np.asarray(_shared['user_ids']), count, _skew('usuario')),
+                    _profiled(nrng, 'Hace', 'calificacion', nrng.integers(1, 6, size=count).tolist()),
+                    draw(nrng, _shared['pools']['comentario'], count)))
+
+
+def _zona_rows_fast(rng, usuario_ids):
+    nrng = _np_rng(rng)
+    return list(zip(draw(nrng, np.asarray(_shared['zonas']), len(usuario_ids), _skew('zona')), usuario_ids))
+
+
+# Variante vectorizada de cada generador de filas, usada con --fast-faker
+FAST_ROWS = {
+    _usuario_rows: _usuario_rows_fast,
+    _cliente_rows: _cliente_rows_fast,
+    _trabajador_rows: _trabajador_rows_fast,
+    _administrador_rows: _administrador_rows_fast,
+    _menu_rows: _menu_rows_fast,
+    _plato_rows: _plato_rows_fast,
+    _pertenece_rows: _pertenece_rows_fast,
+    _pedido_rows: _pedido_rows_fast,
+    _tiene_rows: _tiene_rows_fast,
+    _hace_rows: _hace_rows_fast,
+    _zona_rows: _zona_rows_fast,
+}
+
+# --- Generadores de datos para cada tabla ---
+
+def create_usuario(loader, gen, ids):
+    loader.insert('Usuario', ('id_usuario', 'nombre', 'apellido', 'numero_telef'),
+                  gen.rows('Usuario', _usuario_rows, gen.split_items(ids)))
+    return ids
+
+
+def create_cliente(loader, gen, usuario_ids):
+    loader.insert('Cliente', ('id_usuario', 'empresa'),
+                  gen.rows('Cliente', _cliente_rows, gen.split_items(usuario_ids)))
+    return usuario_ids.copy()
+
+
+def create_trabajador(loader, gen, usuario_ids):
+    loader.insert('Trabajador', ('id_usuario', 'nro_telef_emergencia'),
+                  gen.rows('Trabajador', _trabajador_rows, gen.split_items(usuario_ids)))
+    return usuario_ids.copy()
+
+
+def create_repartidor(loader, gen, repart):
+    loader.insert('Repartidor', ('id_usuario',), [(rid,) for rid in repart])
+    return repart
+
+
+def create_administrador(loader, gen, admins):
+    loader.insert('Administrador', ('id_usuario', 'correo'),
+                  gen.rows('Administrador', _administrador_rows, gen.split_items(admins)))
+    return admins
+
+
+def create_menu(loader, gen, admin_ids, ids):
+    loader.insert('Menu', ('id_menu', 'id_administrador', 'variacion', 'fecha'),
+                  gen.rows('Menu', _menu_rows, gen.split_items(ids), shared={'admin_ids': admin_ids}))
+    return ids
 
 
-def create_tiene(cursor, pedido_ids, menu_ids):
-    rel = [(pid, mid) for pid in pedido_ids for mid in sample(menu_ids, k=randint(1,3))]
-    cursor.executemany("INSERT INTO Tiene (id_pedido, id_menu) VALUES (%s, %s)", rel)
+def create_plato(loader, gen, ids):
+    loader.insert('Plato', ('id_plato', 'nombre', 'foto', 'tipo', 'categoria', 'codigo_info_nutricional'),
+                  gen.rows('Plato', _plato_rows, gen.split_items(ids)))
+    return ids
 
 
-def create_hace(cursor, pedido_ids, user_ids):
-    rel = [(pid, choice(user_ids), randint(1,5), fake.text(max_nb_chars=100)) for pid in pedido_ids]
-    cursor.executemany("INSERT INTO Hace (id_pedido, id_usuario, calificacion, comentario) VALUES (%s,%s,%s,%s)", rel)
+def create_pertenece(loader, gen, menu_ids, plato_ids):
+    loader.insert('Pertenece', ('id_menu', 'id_plato'),
+                  gen.rows('Pertenece', _pertenece_rows, gen.split_items(menu_ids),
+                           shared={'plato_ids': plato_ids}))
 
 
-def create_vive(cursor, usuario_ids, zonas):
-    rel = [(choice(zonas), uid) for uid in usuario_ids]
-    cursor.executemany("INSERT INTO Vive (zona_entrega, id_usuario) VALUES (%s, %s)", rel)
+ZONAS = [('Zona Norte', 5.00), ('Zona Sur', 7.50), ('Centro', 6.25)]
 
 
-def create_cubre(cursor, repartidor_ids, zonas):
-    rel = [(choice(zonas), rid) for rid in repartidor_ids]
-    cursor.executemany("INSERT INTO Cubre (zona_entrega, id_usuario) VALUES (%s,%s)", rel)
+def create_zona_entrega(loader):
+    loader.insert('ZonaEntrega', ('nombre', 'costo'), ZONAS)
+    return [z[0] for z in ZONAS]
+
+
+def create_pedido(loader, gen, zonas, ids):
+    shared = {'zonas': zonas, 'total': len(ids)}
+    if gen.history_days:
+        # Los ids se insertan en orden de fecha: cada bloque conoce su posición
+        shared['history'] = {'days': gen.history_days, 'total': len(ids)}
+    loader.insert('Pedido', ('id_pedido', 'fecha', 'estado', 'hora_salida', 'hora_entrega',
+                             'hora_entrega_estimada', 'direccion_exacta', 'zona_entrega'),
+                  gen.rows('Pedido', _pedido_rows, gen.split_positions(ids), shared=shared))
+    return ids
+
+
+def create_tiene(loader, gen, pedido_ids, menu_ids):
+    loader.insert('Tiene', ('id_pedido', 'id_menu'),
+                  gen.rows('Tiene', _tiene_rows, gen.split_items(pedido_ids),
+                           shared={'menu_ids': menu_ids}))
+
+
+def create_hace(loader, gen, pedido_ids, user_ids):
+    loader.insert('Hace', ('id_pedido', 'id_usuario', 'calificacion', 'comentario'),
+                  gen.rows('Hace', _hace_rows, gen.split_items(pedido_ids),
+                           shared={'user_ids': user_ids}))
+
+
+def create_vive(loader, gen, usuario_ids, zonas):
+    loader.insert('Vive', ('zona_entrega', 'id_usuario'),
+                  gen.rows('Vive', _zona_rows, gen.split_items(usuario_ids), shared={'zonas': zonas}))
+
+
+def create_cubre(loader, gen, repartidor_ids, zonas):
+    loader.insert('Cubre', ('zona_entrega', 'id_usuario'),
+                  gen.rows('Cubre', _zona_rows, gen.split_items(repartidor_ids), shared={'zonas': zonas}))
 
 
 def clear_tables(cursor, tables):
     for t in tables:
         cursor.execute(f"DELETE FROM {t} CASCADE")
+    # Reiniciar las secuencias para que la misma semilla dé los mismos ids
+    for t, col in SERIAL_COLUMNS.items():
+        cursor.execute("SELECT setval(pg_get_serial_sequence(%s, %s), 1, false)", (t, col))
+
+
+ALL_TABLES = ['Hace','Cubre','Vive','Tiene','Pedido','ZonaEntrega','Pertenece','Plato','Menu','Administrador','Repartidor','Trabajador','Cliente','Usuario']
+
+
+def plan_database(cursor, gen, n):
+    """Reservar las claves y elegir los subconjuntos de usuarios antes de insertar nada
+
+    Con el plan completo ninguna tabla espera datos de otra: solo el orden
+    de sus claves foráneas (ver dag_loader.py).
+    """
+    counts = plan_counts(gen, n)
+    return build_plan(gen, n, {table: reserve_ids(cursor, table, counts[table]) for table in SERIAL_COLUMNS})
+
+
+def plan_counts(gen, n):
+    """Filas de cada tabla del plan: proporciones fijas o, con --stats-profile, las del perfil"""
+    counts = {'Usuario': n, 'Menu': n, 'Plato': n, 'Pedido': n,
+              'Cliente': n//2, 'Trabajador': n//2, 'Repartidor': n//4, 'Administrador': n//8}
+    if gen.stats:
+        counts.update(gen.stats.counts(n))
+    return counts
+
+
+def build_plan(gen, n, ids):
+    """Completar el plan a partir de las claves reservadas (también al reanudar con --resume)"""
+    counts = plan_counts(gen, n)
+    plan = dict(ids)
+    plan['Cliente'] = gen.rng.sample(plan['Usuario'], k=counts['Cliente'])
+    plan['Trabajador'] = gen.rng.sample(plan['Usuario'], k=counts['Trabajador'])
+    plan['Repartidor'] = gen.rng.sample(plan['Trabajador'], k=counts['Repartidor'])
+    plan['Administrador'] = gen.rng.sample(plan['Trabajador'], k=counts['Administrador'])
+    plan['ZonaEntrega'] = [z[0] for z in ZONAS]
+    return plan
+
+
+# Carga de cada tabla a partir del plan, en el orden secuencial de seed_database
+LOAD_STEPS = {
+    'Usuario': lambda loader, gen, plan: create_usuario(loader, gen, plan['Usuario']),
+    'Cliente': lambda loader, gen, plan: create_cliente(loader, gen, plan['Cliente']),
+    'Trabajador': lambda loader, gen, plan: create_trabajador(loader, gen, plan['Trabajador']),
+    'Repartidor': lambda loader, gen, plan: create_repartidor(loader, gen, plan['Repartidor']),
+    'Administrador': lambda loader, gen, plan: create_administrador(loader, gen, plan['Administrador']),
+    'Menu': lambda loader, gen, plan: create_menu(loader, gen, plan['Administrador'], plan['Menu']),
+    'Plato': lambda loader, gen, plan: create_plato(loader, gen, plan['Plato']),
+    'Pertenece': lambda loader, gen, plan: create_pertenece(loader, gen, plan['Menu'], plan['Plato']),
+    'ZonaEntrega': lambda loader, gen, plan: create_zona_entrega(loader),
+    'Pedido': lambda loader, gen, plan: create_pedido(loader, gen, plan['ZonaEntrega'], plan['Pedido']),
+    'Tiene': lambda loader, gen, plan: create_tiene(loader, gen, plan['Pedido'], plan['Menu']),
+    'Hace': lambda loader, gen, plan: create_hace(loader, gen, plan['Pedido'], plan['Usuario']),
+    'Vive': lambda loader, gen, plan: create_vive(loader, gen, plan['Usuario'], plan['ZonaEntrega']),
+    'Cubre': lambda loader, gen, plan: create_cubre(loader, gen, plan['Repartidor'], plan['ZonaEntrega']),
+}
+
+
+def seed_database(loader, gen, n):
+    # Todas las claves se reservan antes de insertar: las tablas hijas se generan
+    # sin volver a consultar la base
+    plan = plan_database(loader.cursor, gen, n)
+    for step in LOAD_STEPS.values():
+        step(loader, gen, plan)
+
+
+def read_ids(cursor, table, column):
+    cursor.execute(f"SELECT {column} FROM {table} ORDER BY {column}")
+    return array.array('l', (row[0] for row in cursor))
+
+
+def read_counts(cursor, tables):
+    counts = {}
+    for t in tables:
+        cursor.execute(f"SELECT COUNT(*) FROM {t}")
+        counts[t] = cursor.fetchone()[0]
+    return counts
+
+
+def grow_database(loader, gen, n):
+    """Llevar la base actual a n registros base generando solo las filas que faltan
+
+    Se mantienen las proporciones de seed_database: los clientes y trabajadores
+    nuevos salen de los usuarios nuevos, y los repartidores y administradores
+    nuevos de los trabajadores nuevos. Las tablas hijas referencian todas las
+    filas padre, existentes y nuevas.
+    """
+    cur = loader.cursor
+    counts = read_counts(cur, ['Usuario', 'Cliente', 'Trabajador', 'Repartidor',
+                               'Administrador', 'Menu', 'Plato', 'Pedido'])
+    if counts['Usuario'] >= n:
+        print(f"La base ya tiene {counts['Usuario']:,} usuarios; nada que generar para {n:,}.")
+        return counts['Usuario']
+    print(f"Creciendo de {counts['Usuario']:,} a {n:,} registros base...")
+
+    ids = {table: reserve_ids(cur, table, max(0, n - counts[table])) for table in SERIAL_COLUMNS}
+
+    def missing(table, target, pool):
+        return min(len(pool), max(0, target - counts[table]))
+
+    new_users = create_usuario(loader, gen, ids['Usuario'])
+    create_cliente(loader, gen, gen.rng.sample(new_users, k=missing('Cliente', n//2, new_users)))
+    new_trab = create_trabajador(loader, gen, gen.rng.sample(new_users, k=missing('Trabajador', n//2, new_users)))
+    new_reparto = create_repartidor(loader, gen, gen.rng.sample(new_trab, k=missing('Repartidor', n//4, new_trab)))
+    create_administrador(loader, gen, gen.rng.sample(new_trab, k=missing('Administrador', n//8, new_trab)))
+
+    admin_ids = read_ids(cur, 'Administrador', 'id_usuario')
+    new_menus = create_menu(loader, gen, admin_ids, ids['Menu'])
+    create_plato(loader, gen, ids['Plato'])
+    create_pertenece(loader, gen, new_menus, read_ids(cur, 'Plato', 'id_plato'))
+
+    cur.execute("SELECT nombre FROM ZonaEntrega ORDER BY nombre")
+    zonas = [row[0] for row in cur.fetchall()] or create_zona_entrega(loader)
+    new_pedidos = create_pedido(loader, gen, zonas, ids['Pedido'])
+    create_tiene(loader, gen, new_pedidos, read_ids(cur, 'Menu', 'id_menu'))
+    create_hace(loader, gen, new_pedidos, read_ids(cur, 'Usuario', 'id_usuario'))
+    create_vive(loader, gen, new_users, zonas)
+    create_cubre(loader, gen, new_reparto, zonas)
+    return counts['Usuario']
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sembrado de datos de prueba para Fredys Food")
+    parser.add_argument('num_registros_base', type=int, nargs='?',
+                        help="número base de registros (usuarios, menús, platos y pedidos)")
+    parser.add_argument('--insert-strategy', choices=STRATEGIES, default=DEFAULT_STRATEGY,
+                        help=f"cómo se envían las filas a PostgreSQL (por defecto: {DEFAULT_STRATEGY})")
+    parser.add_argument('--driver', choices=DRIVERS, default=DEFAULT_DRIVER,
+                        help="controlador de PostgreSQL; psycopg (3) usa pipeline mode y COPY por filas "
+                             f"(por defecto: {DEFAULT_DRIVER})")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                        help=f"semilla global; los datos son idénticos para cualquier --workers (por defecto: {DEFAULT_SEED})")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="procesos generadores de filas (por defecto: número de CPUs)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help=f"filas por bloque de generación; acota la memoria usada (por defecto: {CHUNK_SIZE})")
+    parser.add_argument('--fast-faker', action='store_true',
+                        help="sortear valores con NumPy sobre vocabularios cacheados en vez de llamar a Faker por fila")
+    parser.add_argument('--fast-load', action='store_true',
+                        help="TRUNCATE en vez de DELETE y cargar sin FKs ni índices secundarios, recreándolos al final")
+    parser.add_argument('--skew', action='append', metavar='REL=PERFIL',
+                        help=f"sesgo de una clave foránea; REL: {', '.join(RELATIONS)} o all; "
+                             "PERFIL: uniform, zipf:S o hotset:PCT[:SHARE] (repetible)")
+    parser.add_argument('--history-days', type=int, metavar='DIAS',
+                        help="repartir los pedidos en DIAS días con estacionalidad diaria y semanal, "
+                             "horas causales e inserción en orden de fecha (por defecto: últimos 30 días)")
+    parser.add_argument('--stats-profile', metavar='PERFIL',
+                        help="generar con las cardinalidades, distribuciones de pg_stats y fan-out de un "
+                             "perfil de stats_profile.py (num_registros_base = usuarios; activa --fast-faker)")
+    parser.add_argument('--grow-to', type=int, metavar='N',
+                        help="ampliar los datos actuales hasta N registros base generando solo la diferencia")
+    parser.add_argument('--unlogged', action='store_true',
+                        help="cargar las tablas como UNLOGGED con synchronous_commit=off y pasarlas a "
+                             "LOGGED al final de la misma transacción")
+    parser.add_argument('--parallel-tables', type=int, metavar='CONEXIONES',
+                        help="cargar cada tabla en su propia conexión en cuanto sus tablas padre (FKs de "
+                             "create_schema.sql) terminan; confirma por tabla")
+    parser.add_argument('--pipeline', type=int, metavar='ESCRITORES',
+                        help="solapar generación y escritura: una cola asyncio acotada de bloques que "
+                             "vacían ESCRITORES conexiones en paralelo; confirma por tabla")
+    parser.add_argument('--queue-chunks', type=int, default=PIPELINE_QUEUE_CHUNKS, metavar='N',
+                        help=f"bloques que caben en la cola de --pipeline (por defecto: {PIPELINE_QUEUE_CHUNKS})")
+    parser.add_argument('--resume', action='store_true',
+                        help="continuar la última carga interrumpida desde su último bloque confirmado, "
+                             "con sus mismos parámetros (semilla, escala, modo, sesgos)")
+    parser.add_argument('--profile', action='store_true',
+                        help="medir tiempo de pared y de CPU, filas/s, bytes y round trips (estimados) de cada función "
+                             "create_* y guardar un resumen JSON junto al dataset")
+    parser.add_argument('--profile-stacks', action='store_true',
+                        help="con --profile, muestrear la pila de los generadores y guardar pilas "
+                             "colapsadas (.collapsed) para flamegraph")
+    parser.add_argument('--export', metavar='DIR',
+                        help="tras sembrar, guardar el dataset como artefacto (COPY binario comprimido + manifiesto)")
+    parser.add_argument('--import', dest='import_dir', metavar='DIR',
+                        help="restaurar un artefacto de --export en paralelo (una conexión por tabla, hasta --workers)")
+    args = parser.parse_args(argv)
+    if args.num_registros_base is None and not (args.import_dir or args.grow_to or args.resume):
+        parser.error("se requiere num_registros_base (o --import DIR / --grow-to N / --resume)")
+    try:
+        args.skew = parse_skew(args.skew)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.grow_to and (args.num_registros_base is not None or args.fast_load or args.unlogged
+                         or args.import_dir):
+        parser.error("--grow-to no se combina con num_registros_base, --fast-load, --unlogged ni --import")
+    if args.parallel_tables and (args.unlogged or args.grow_to):
+        parser.error("--parallel-tables no se combina con --unlogged ni --grow-to")
+    if args.stats_profile and (args.history_days or args.grow_to):
+        parser.error("--stats-profile no se combina con --history-days ni --grow-to")
+    if args.pipeline and (args.unlogged or args.grow_to or args.parallel_tables):
+        parser.error("--pipeline no se combina con --unlogged, --grow-to ni --parallel-tables")
+    if args.resume and (args.num_registros_base is not None or args.grow_to or args.fast_load
+                        or args.unlogged or args.parallel_tables or args.pipeline or args.import_dir):
+        parser.error("--resume retoma los parámetros de la carga interrumpida y no se combina con "
+                     "num_registros_base ni con otros modos de carga")
+    if args.driver != DEFAULT_DRIVER and (args.parallel_tables or args.pipeline or args.export
+                                          or args.import_dir):
+        parser.error("--driver psycopg no se combina con --parallel-tables, --pipeline, --export "
+                     "ni --import (usan conexiones psycopg2)")
+    if args.profile_stacks:
+        args.profile = True
+    if args.profile and (args.parallel_tables or args.pipeline or args.import_dir):
+        parser.error("--profile no se combina con --parallel-tables, --pipeline ni --import")
+    if args.import_dir and args.export:
+        parser.error("--import y --export no se pueden combinar")
+    return args
 
 
 def main():
-    if len(sys.argv) != 2:
-        print("Uso: python main.py <num_registros_base>")
-        sys.exit(1)
-    n = int(sys.argv[1])
-
-    conn = connect_db()
+    args = parse_args()
+    n = args.grow_to or args.num_registros_base
+
+    if args.import_dir:
+        try:
+            manifest = import_dataset(connect_db, args.import_dir, ALL_TABLES, SERIAL_COLUMNS,
+                                      workers=args.workers)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        print(f"Dataset restaurado desde {args.import_dir} "
+              f"(base {manifest['num_registros_base']} registros, semilla {manifest['seed']}).")
+        return
+
+    try:
+        driver = get_driver(args.driver)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return
+    conn = driver.connect(DB_PARAMS)
     cur = conn.cursor()
 
-    all_tables = ['Hace','Cubre','Vive','Tiene','Pedido','ZonaEntrega','Pertenece','Plato','Menu','Administrador','Repartidor','Trabajador','Cliente','Usuario']
-    clear_tables(cur, all_tables)
-    conn.commit()
-
-    user_ids = create_usuario(cur, n)
-    cliente_ids = create_cliente(cur, sample(user_ids, k=n//2))
-    trab_ids = create_trabajador(cur, sample(user_ids, k=n//2))
-    reparto_ids = create_repartidor(cur, trab_ids, k=n//4)
-    admin_ids = create_administrador(cur, trab_ids, k=n//8)
-    menu_ids = create_menu(cur, admin_ids, m=n)
-    plato_ids = create_plato(cur, p=n)
-    create_pertenece(cur, menu_ids, plato_ids)
-    zonas = create_zona_entrega(cur)
-    pedido_ids = create_pedido(cur, user_ids, zonas, t=n)
-    create_tiene(cur, pedido_ids, menu_ids)
-    create_hace(cur, pedido_ids, user_ids)
-    create_vive(cur, user_ids, zonas)
-    create_cubre(cur, reparto_ids, zonas)
-
+    if args.resume:
+        run = read_run(cur)
+        if run is None:
+            print("❌ No hay ninguna carga con checkpoints que reanudar")
+            return
+        params, ids, finished = run
+        if finished:
+            print("✅ La última carga terminó correctamente; no hay nada que reanudar")
+            return
+        # Mismos parámetros que la carga original: mismas semillas por bloque
+        n = params['num_registros_base']
+        args.seed, args.chunk_size = params['seed'], params['chunk_size']
+        args.fast_faker, args.history_days = params['fast_faker'], params['history_days']
+        args.skew = parse_skew([f"{relation}={spec}" for relation, spec in params['skew'].items()])
+        args.stats_profile = params.get('stats_profile')
+
+    stats = None
+    skew = args.skew
+    if args.stats_profile:
+        # Los valores perfilados se sortean con NumPy: solo existe el modo vectorizado
+        stats = StatsProfile.load(args.stats_profile)
+        args.fast_faker = True
+        # Las relaciones sin --skew explícito reproducen el fan-out medido
+        measured = stats.skew()
+        skew = {relation: measured.get(relation, profile) if profile.is_uniform else profile
+                for relation, profile in args.skew.items()}
+
+    loader = driver.loader(cur, args.insert_strategy)
+    if is_compact(cur):
+        # Los loaders por conexión de --parallel-tables y --pipeline no traducen zonas ni estados
+        if args.parallel_tables or args.pipeline:
+            print("❌ --parallel-tables y --pipeline no admiten el esquema compacto (create_schema_compact.sql)")
+            return
+        loader = CompactLoader(loader)
+    profiler = SeedProfiler(sample=args.profile_stacks) if args.profile else None
+    gen = DataGenerator(seed=args.seed, workers=args.workers, chunk_size=args.chunk_size,
+                        fast=args.fast_faker, scope=f"grow:{n}" if args.grow_to else None,
+                        skew=skew, history_days=args.history_days, stats=stats, profiler=profiler)
+    if args.resume:
+        gen.today = date.fromisoformat(params['today'])
+
+    if is_partitioned(cur):
+        # Sin FKs NOT VALID ni SET UNLOGGED en tablas particionadas
+        if args.fast_load or args.unlogged:
+            print("❌ --fast-load y --unlogged no admiten Pedido particionado (create_schema_partitioned.sql)")
+            return
+        # Meses que cubren las fechas de los pedidos generados (30 días sin --history-days)
+        ensure_partitions(cur, gen.today - timedelta(days=gen.history_days or 30), gen.today)
+        conn.commit()
+
+    if args.grow_to or args.parallel_tables or args.pipeline or args.fast_load or args.unlogged:
+        # Sin checkpoints: una carga interrumpida anterior deja de poder reanudarse
+        # (se confirma junto a la carga)
+        discard_run(cur)
+
+    if args.grow_to:
+        grow_database(profiler.wrap(loader) if profiler else loader, gen, n)
+    elif args.parallel_tables or args.pipeline:
+        # Cada tabla se confirma en otras conexiones: vaciar y planificar antes.
+        # Sin FKs (--fast-load) todas las tablas pueden cargarse a la vez
+        fast = FastLoad(cur, ALL_TABLES) if args.fast_load else None
+        if fast:
+            fast.prepare()
+        else:
+            with driver.pipeline(conn):
+                clear_tables(cur, ALL_TABLES)
+        plan = plan_database(cur, gen, n)
+        conn.commit()
+        if args.pipeline:
+            scheduler = AsyncPipeline(DB_PARAMS, args.pipeline, args.queue_chunks, barriers=not fast)
+        else:
+            scheduler = DagScheduler(DB_PARAMS, args.parallel_tables, {} if fast else None)
+        if fast:
+            try:
+                with fast.load():
+                    scheduler.run(LOAD_STEPS, loader, gen, plan)
+                fast.restore()
+            except BaseException:
+                # El borrado de FKs e índices ya está confirmado: vaciar y
+                # reconstruir para no dejar el esquema sin ellos
+                conn.rollback()
+                truncate_tables(cur, ALL_TABLES)
+                fast.restore()
+                conn.commit()
+                raise
+        else:
+            scheduler.run(LOAD_STEPS, loader, gen, plan)
+    elif args.fast_load or args.unlogged:
+        # Una sola transacción: un fallo deshace también el borrado de FKs e
+        # índices y el paso a UNLOGGED
+        unlogged = UnloggedLoad(cur, ALL_TABLES) if args.unlogged else None
+        fast = FastLoad(cur, ALL_TABLES) if args.fast_load else None
+        if unlogged:
+            unlogged.prepare()
+        if fast:
+            fast.prepare()
+        with (fast or unlogged).load():
+            seed_database(profiler.wrap(loader) if profiler else loader, gen, n)
+        if fast:
+            fast.restore()
+        # Conmutar a LOGGED con los datos ya cargados e indexados
+        if unlogged:
+            unlogged.finish()
+    else:
+        # Un bloque por transacción junto a su checkpoint: --resume continúa desde ahí
+        checkpointed = CheckpointLoader(loader, args.seed)
+        if args.resume:
+            plan = build_plan(gen, n, ids)
+            checkpointed.load_progress()
+        else:
+            with driver.pipeline(conn):
+                clear_tables(cur, ALL_TABLES)
+            plan = plan_database(cur, gen, n)
+            start_run(cur, {
+                'seed': args.seed,
+                'num_registros_base': n,
+                'chunk_size': args.chunk_size,
+                'fast_faker': args.fast_faker,
+                'skew': describe(args.skew),
+                'history_days': gen.history_days,
+                'stats_profile': args.stats_profile,
+                'today': gen.today.isoformat(),
+            }, {table: plan[table] for table in SERIAL_COLUMNS})
+            conn.commit()
+        target = profiler.wrap(checkpointed) if profiler else checkpointed
+        for step in LOAD_STEPS.values():
+            step(target, gen, plan)
+        finish_run(cur)
+    if profiler:
+        profiler.finish()
+
+    meta = {
+        'seed': args.seed,
+        'num_registros_base': n,
+        'fast_faker': args.fast_faker,
+        'skew': describe(gen.skew),
+        'history_days': gen.history_days,
+        'stats_profile': args.stats_profile,
+    }
+    record_dataset_meta(cur, meta)
     conn.commit()
+    if args.export:
+        export_dataset(cur, args.export, ALL_TABLES, SERIAL_COLUMNS, meta)
     cur.close()
     conn.close()
+    loader.report()
+    if profiler:
+        # Junto al artefacto de --export o, sin él, en el directorio actual
+        path = os.path.join(args.export, 'profile.json') if args.export else f"seed_profile_{n}.json"
+        summary = profiler.dump(path, dict(meta, insert_strategy=args.insert_strategy, driver=args.driver,
+                                           workers=args.workers, chunk_size=args.chunk_size))
+        profiler.report(summary)
+        print(f"📁 Perfil guardado en: {path}"
+              + (f" (pilas: {summary['stacks_file']})" if 'stacks_file' in summary else ""))
+    if args.fast_load:
+        fast.report()
+    if args.unlogged:
+        unlogged.report()
+    if args.parallel_tables or args.pipeline:
+        scheduler.report()
+    if args.resume:
+        checkpointed.report()
+    own_mb, worker_mb = peak_memory_mb()
+    print(f"Pico de memoria: {own_mb:,.1f} MB (principal), {worker_mb:,.1f} MB (mayor generador)")
     print(f"Esquema sembrado con éxito usando base {n} registros.")
 
 if __name__ == "__main__":
@@ -22,10 +22,29 @@ import sys
 import os
 from datetime import datetime
 
+from dataset_artifact import read_dataset_meta
+from rollups import WRITE_SECONDS, WRITE_TPS, benchmark_rollups, print_summary as print_rollups_summary
+from report_views import REFRESH_INTERVAL, benchmark_views, print_summary as print_views_summary
+from snapshots import SnapshotManager
+from stream_orders import OrderStream
+
+# vacuum:   VACUUM FULL + ANALYZE de toda la base antes de cada ejecución
+# snapshot: medir sobre un clon prístino (CREATE DATABASE ... TEMPLATE) por fase
+RESET_MODES = ['vacuum', 'snapshot']
+
 
 class DatabasePerformanceTester:
     def __init__(self, host="localhost", database="final_project", 
-                 user="postgres", password="password123", port=5433):
+                 user="postgres", password="password123", port=5433, reset_mode='vacuum',
+                 stream_tps=None, stream_workers=4):
+        self.database = database
+        self.reset_mode = reset_mode
+        # Flujo de pedidos en segundo plano durante cada fase (stream_orders.py)
+        self.stream_tps = stream_tps
+        self.stream_workers = stream_workers
+        self.stream_results = {}
+        self.clone_name = f"{database}_bench"
+        self.snapshots = SnapshotManager(host, database, user, password, port)
         self.connection_params = {
             'host': host,
             'database': database, 
@@ -94,6 +113,29 @@ class DatabasePerformanceTester:
         except Exception as e:
             print(f"⚠️  Error limpiando caché: {e}")
     
+    def reset_between_iterations(self, cursor):
+        """Restablecer el estado antes de cada ejecución según el modo configurado"""
+        if self.reset_mode == 'vacuum':
+            self.clean_cache_and_analyze(cursor)
+        # En modo snapshot las consultas son de solo lectura: sin --stream-tps
+        # el clon sigue prístino y se reutiliza entre iteraciones. Con el flujo
+        # activo, el clon acumula sus escrituras durante la fase: es la carga que
+        # se quiere medir, y solo el inicio de cada fase parte de datos prístinos
+    
+    def use_pristine_clone(self):
+        """Modo snapshot: clonar la base principal y dirigir las conexiones al clon
+
+        Se llama al inicio de cada fase; el flujo de --stream-tps escribe en el clon.
+        """
+        self.connection_params['database'] = self.database
+        self.snapshots.clone(self.clone_name)
+        self.connection_params['database'] = self.clone_name
+    
+    def release_clone(self):
+        """Eliminar el clon de medición y volver a la base principal"""
+        self.connection_params['database'] = self.database
+        self.snapshots.drop(self.clone_name)
+    
     def get_query_definitions(self):
         """Obtener las 4 consultas experimentales del documento"""
         return {
@@ -308,6 +350,16 @@ class DatabasePerformanceTester:
         
         # Configurar base de datos para mediciones
         self.prepare_database_for_testing(cursor)
+        if self.reset_mode == 'snapshot':
+            # Una sola vez por fase: el clon no cambia entre iteraciones
+            cursor.execute("ANALYZE")
+        
+        # Escrituras concurrentes (y el autovacuum que provocan) durante toda la fase
+        stream = None
+        if self.stream_tps:
+            stream = OrderStream(dict(self.connection_params), self.stream_tps, self.stream_workers)
+            stream.start()
+            print(f"🚚 Flujo de pedidos activo: {self.stream_tps:g} TPS con {self.stream_workers} conexiones")
         
         results = {}
         
@@ -320,7 +372,7 @@ class DatabasePerformanceTester:
             # N ejecuciones + 1 de warm-up (que se descarta)
             for i in range(iterations + 1):
                 # Limpiar caché entre ejecuciones según metodología
-                self.clean_cache_and_analyze(cursor)
+                self.reset_between_iterations(cursor)
                 
                 # Pequeña pausa para estabilizar el sistema
                 time.sleep(0.5)
@@ -357,6 +409,11 @@ class DatabasePerformanceTester:
             else:
                 print(f"  ❌ No se pudieron obtener mediciones válidas para {query_id}")
         
+        if stream:
+            summary = stream.stop()
+            stream.report(summary)
+            self.stream_results['with_indexes' if with_indexes else 'without_indexes'] = summary
+        
         cursor.close()
         conn.close()
         
@@ -443,6 +500,15 @@ class DatabasePerformanceTester:
         print(f"\n📈 Total de registros en el sistema: {total_records:,}")
         return total_records
     
+    def read_dataset_profile(self):
+        """Cómo se generaron los datos (semilla, escala, perfiles de sesgo) según dataset_meta"""
+        conn = self.connect()
+        cursor = conn.cursor()
+        meta = read_dataset_meta(cursor)
+        cursor.close()
+        conn.close()
+        return meta
+    
     def estimate_data_scale(self, total_records):
         """Estimar escala de datos basada en total de registros"""
         if total_records < 5000:
@@ -472,35 +538,57 @@ class DatabasePerformanceTester:
                 return
         
         print(f"\n📏 Escala de datos detectada: {data_scale} ({total_records:,} registros)")
+        print(f"♻️  Modo de restablecimiento: {self.reset_mode}")
+        if self.stream_tps and self.reset_mode == 'vacuum':
+            print("⚠️  VACUUM FULL bloquea el flujo de pedidos en cada iteración; use --reset-mode snapshot")
+        if self.stream_tps and self.reset_mode == 'snapshot':
+            print("ℹ️  El flujo de pedidos escribe en el clon: cada fase parte de datos prístinos, "
+                  "pero sus iteraciones ven los pedidos acumulados")
+        dataset = self.read_dataset_profile()
+        if dataset.get('skew'):
+            print(f"🎲 Perfiles de sesgo: {dataset['skew']}")
         
         # Obtener definiciones de consultas
         queries = self.get_query_definitions()
         
-        # Fase 1: Medición SIN índices
-        print("\n" + "="*60)
-        print("📊 FASE 1: MEDICIÓN SIN ÍNDICES")
-        print("="*60)
-        
-        self.drop_indexes()  # Asegurar que no hay índices personalizados
-        results_without_indexes = self.measure_query_performance(
-            queries, data_scale, with_indexes=False, iterations=num_iterations
-        )
-        
-        # Fase 2: Crear índices y medir CON índices
-        print("\n" + "="*60)
-        print("📊 FASE 2: MEDICIÓN CON ÍNDICES")
-        print("="*60)
-        
-        self.create_indexes()
-        results_with_indexes = self.measure_query_performance(
-            queries, data_scale, with_indexes=True, iterations=num_iterations
-        )
+        try:
+            # Fase 1: Medición SIN índices
+            print("\n" + "="*60)
+            print("📊 FASE 1: MEDICIÓN SIN ÍNDICES")
+            print("="*60)
+            
+            if self.reset_mode == 'snapshot':
+                self.use_pristine_clone()
+            self.drop_indexes()  # Asegurar que no hay índices personalizados
+            results_without_indexes = self.measure_query_performance(
+                queries, data_scale, with_indexes=False, iterations=num_iterations
+            )
+            
+            # Fase 2: Crear índices y medir CON índices
+            print("\n" + "="*60)
+            print("📊 FASE 2: MEDICIÓN CON ÍNDICES")
+            print("="*60)
+            
+            if self.reset_mode == 'snapshot':
+                self.use_pristine_clone()
+            self.create_indexes()
+            results_with_indexes = self.measure_query_performance(
+                queries, data_scale, with_indexes=True, iterations=num_iterations
+            )
+        finally:
+            # También si una fase falla o se interrumpe: no dejar el clon ni
+            # las conexiones apuntando a él
+            if self.reset_mode == 'snapshot':
+                self.release_clone()
         
         # Almacenar resultados
         self.results = {
             'timestamp': datetime.now().isoformat(),
             'data_scale': data_scale,
             'total_records': total_records,
+            'reset_mode': self.reset_mode,
+            'dataset': dataset,
+            'stream': self.stream_results,
             'without_indexes': results_without_indexes,
             'with_indexes': results_with_indexes
         }
@@ -511,6 +599,55 @@ class DatabasePerformanceTester:
         print("\n🎉 TEST DE RENDIMIENTO COMPLETADO")
         print(f"📁 Resultados guardados en: performance_results_{data_scale}.json")
         
+    def run_report_views_test(self, num_iterations=10, refresh_interval=REFRESH_INTERVAL):
+        """Comparar consultas en vivo con sus vistas materializadas (report_views.py)"""
+        print("🚀 COMPARACIÓN DE VISTAS MATERIALIZADAS")
+        total_records = self.check_data_volume()
+        data_scale = self.estimate_data_scale(total_records)
+        print(f"\n📏 Escala de datos detectada: {data_scale} ({total_records:,} registros)")
+        
+        # Sin escrituras concurrentes las vistas nunca quedan desfasadas
+        stream = None
+        if self.stream_tps:
+            stream = OrderStream(dict(self.connection_params), self.stream_tps, self.stream_workers)
+            stream.start()
+            print(f"🚚 Flujo de pedidos activo: {self.stream_tps:g} TPS con {self.stream_workers} conexiones")
+        try:
+            summary = benchmark_views(dict(self.connection_params), self.get_query_definitions(),
+                                      num_iterations, refresh_interval)
+        finally:
+            if stream:
+                self.stream_results['report_views'] = stream.stop()
+                stream.report(self.stream_results['report_views'])
+        
+        print_views_summary(summary)
+        output = f"report_views_{data_scale}.json"
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(dict(summary, timestamp=datetime.now().isoformat(), data_scale=data_scale,
+                           total_records=total_records, iterations=num_iterations,
+                           stream=self.stream_results), f, indent=2, ensure_ascii=False)
+        print(f"\n📁 Resultados guardados en: {output}")
+        
+    def run_rollups_test(self, num_iterations=10):
+        """Comparar consultas 1-3 con sus versiones sobre rollups diarios (rollups.py)"""
+        print("🚀 COMPARACIÓN DE ROLLUPS MANTENIDOS POR TRIGGERS")
+        total_records = self.check_data_volume()
+        data_scale = self.estimate_data_scale(total_records)
+        print(f"\n📏 Escala de datos detectada: {data_scale} ({total_records:,} registros)")
+        
+        # El coste por escritura se mide con el flujo de pedidos, con y sin triggers
+        summary = benchmark_rollups(dict(self.connection_params), self.get_query_definitions(),
+                                    num_iterations, self.stream_tps or WRITE_TPS, self.stream_workers,
+                                    WRITE_SECONDS)
+        
+        print_rollups_summary(summary)
+        output = f"rollups_{data_scale}.json"
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(dict(summary, timestamp=datetime.now().isoformat(), data_scale=data_scale,
+                           total_records=total_records, iterations=num_iterations),
+                      f, indent=2, ensure_ascii=False)
+        print(f"\n📁 Resultados guardados en: {output}")
+        
     def calculate_improvements(self):
         """Calcular mejoras de rendimiento con índices"""
         improvements = {}
@@ -651,6 +788,32 @@ def main():
     
     # Número de iteraciones por defecto
     num_iterations = 10
+    reset_mode = 'vacuum'
+    
+    if '--reset-mode' in sys.argv:
+        position = sys.argv.index('--reset-mode')
+        if position + 1 >= len(sys.argv) or sys.argv[position + 1] not in RESET_MODES:
+            print(f"❌ --reset-mode debe ser uno de: {', '.join(RESET_MODES)}")
+            return
+        reset_mode = sys.argv[position + 1]
+    
+    stream_tps = None
+    stream_workers = 4
+    refresh_interval = REFRESH_INTERVAL
+    for option in ['--stream-tps', '--stream-workers', '--refresh-interval']:
+        if option in sys.argv:
+            position = sys.argv.index(option)
+            try:
+                value = float(sys.argv[position + 1])
+            except (IndexError, ValueError):
+                print(f"❌ {option} requiere un número")
+                return
+            if option == '--stream-tps':
+                stream_tps = value
+            elif option == '--stream-workers':
+                stream_workers = int(value)
+            else:
+                refresh_interval = value
     
     # Verificar argumentos de línea de comandos
     if len(sys.argv) > 1:
@@ -664,6 +827,18 @@ Opciones:
   --create-indexes        Solo crear índices
   --drop-indexes          Solo eliminar índices
   --iterations N          Número de iteraciones (por defecto: 10)
+  --reset-mode MODO       vacuum (VACUUM FULL por ejecución, por defecto) o
+                          snapshot (medir sobre un clon TEMPLATE por fase)
+  --stream-tps N          Medir con un flujo de pedidos de N TPS en segundo
+                          plano (stream_orders.py)
+  --stream-workers N      Conexiones del flujo de pedidos (por defecto: 4)
+  --report-views          Comparar cada consulta en vivo con su vista
+                          materializada: latencia, coste de refresco y desfase
+                          (report_views.py; combinar con --stream-tps)
+  --refresh-interval S    Segundos entre refrescos de las vistas (por defecto: 30)
+  --rollups               Comparar consultas 1-3 con rollups diarios mantenidos
+                          por triggers: mejora de lectura y coste por escritura
+                          (rollups.py; el flujo usa --stream-tps, por defecto 50)
   
 Sin argumentos: Ejecutar test completo de rendimiento
 
@@ -691,6 +866,20 @@ Ejemplo de uso completo:
             tester = DatabasePerformanceTester()
             tester.drop_indexes()
             return
+        elif sys.argv[1] in ['--report-views', '--rollups']:
+            iterations = 10
+            if '--iterations' in sys.argv:
+                try:
+                    iterations = int(sys.argv[sys.argv.index('--iterations') + 1])
+                except (IndexError, ValueError):
+                    print("❌ Número de iteraciones inválido")
+                    return
+            tester = DatabasePerformanceTester(stream_tps=stream_tps, stream_workers=stream_workers)
+            if sys.argv[1] == '--rollups':
+                tester.run_rollups_test(iterations)
+            else:
+                tester.run_report_views_test(iterations, refresh_interval)
+            return
         elif sys.argv[1] == '--iterations' and len(sys.argv) > 2:
             try:
                 num_iterations = int(sys.argv[2])
@@ -703,7 +892,8 @@ Ejemplo de uso completo:
                 return
     
     # Crear instancia del tester con el número de iteraciones
-    tester = DatabasePerformanceTester()
+    tester = DatabasePerformanceTester(reset_mode=reset_mode, stream_tps=stream_tps,
+                                       stream_workers=stream_workers)
     
     # Ejecutar test completo
     try:
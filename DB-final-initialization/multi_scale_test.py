@@ -20,6 +20,8 @@ import time
 import json
 from datetime import datetime
 
+from snapshots import SnapshotManager
+
 class MultiScalePerformanceTester:
     def __init__(self):
         self.scales = [1000, 10000, 100000, 1000000]
@@ -32,6 +34,13 @@ class MultiScalePerformanceTester:
             1000000: 1     # 1M: 1 iteración
         }
         self.results = {}
+        # Artefactos de --export por escala; se reutilizan en vez de regenerar
+        self.dataset_dir = "datasets"
+        # Una base plantilla sembrada por escala (CREATE DATABASE ... TEMPLATE)
+        self.snapshots = SnapshotManager()
+        # Escala cargada en la base principal (None si se desconoce); permite
+        # crecer a la siguiente escala con main.py --grow-to
+        self.loaded_scale = None
         
     def run_command(self, command, description):
         """Ejecutar comando del sistema con manejo de errores"""
@@ -54,16 +63,59 @@ class MultiScalePerformanceTester:
         success, _ = self.run_command("python run_schema.py", "Recreando esquema")
         return success
     
-    def generate_data(self, scale):
-        """Generar datos para la escala especificada"""
+    def generate_data(self, scale, grow_from=None):
+        """Generar datos para la escala especificada (grow_from: ampliar la escala cargada)"""
         scale_name = self.scale_names[self.scales.index(scale)]
-        print(f"\n📊 Generando {scale:,} registros ({scale_name})...")
+        artifact = os.path.join(self.dataset_dir, scale_name)
+        if os.path.exists(os.path.join(artifact, "manifest.json")):
+            print(f"\n📦 Restaurando {scale:,} registros ({scale_name}) desde {artifact}...")
+            success, output = self.run_command(f"python main.py --import {artifact}",
+                                               f"Restauración de datos {scale_name}")
+            if success:
+                print(f"✅ {scale:,} registros restaurados exitosamente")
+            return success
+
+        if grow_from:
+            print(f"\n📈 Creciendo de {grow_from:,} a {scale:,} registros ({scale_name})...")
+            command = f"python main.py --grow-to {scale} --export {artifact}"
+        else:
+            print(f"\n📊 Generando {scale:,} registros ({scale_name})...")
+            command = f"python main.py {scale} --export {artifact}"
         
-        success, output = self.run_command(f"python main.py {scale}", f"Generación de datos {scale_name}")
+        success, output = self.run_command(command, f"Generación de datos {scale_name}")
         if success:
             print(f"✅ {scale:,} registros generados exitosamente")
         return success
     
+    def prepare_scale(self, scale):
+        """Dejar la base con los datos de la escala: desde su snapshot o sembrando y guardándolo"""
+        scale_name = self.scale_names[self.scales.index(scale)]
+        if self.snapshots.has_snapshot(scale_name):
+            print(f"\n📸 Restaurando {scale_name} desde su snapshot...")
+            self.snapshots.restore(scale_name)
+            self.loaded_scale = scale
+            return True
+
+        artifact = os.path.join(self.dataset_dir, scale_name, "manifest.json")
+        grow_from = None
+        if self.loaded_scale is not None and self.loaded_scale < scale and not os.path.exists(artifact):
+            grow_from = self.loaded_scale
+        self.loaded_scale = None
+
+        # Paso 1: Limpiar y recrear esquema (no hace falta si se crece desde la escala anterior)
+        if not grow_from and not self.clean_and_recreate_schema():
+            print(f"❌ Error recreando esquema para {scale_name}")
+            return False
+        
+        # Paso 2: Generar datos
+        if not self.generate_data(scale, grow_from=grow_from):
+            print(f"❌ Error generando datos para {scale_name}")
+            return False
+
+        self.loaded_scale = scale
+        self.snapshots.save(scale_name)
+        return True
+    
     def run_performance_test(self, scale):
         """Ejecutar test de rendimiento para la escala actual"""
         scale_name = self.scale_names[self.scales.index(scale)]
@@ -73,7 +125,7 @@ class MultiScalePerformanceTester:
         print(f"🔄 Número de iteraciones: {iterations}")
         
         # Ejecutar con el número específico de iteraciones
-        command = f"python measure_performance.py --iterations {iterations}"
+        command = f"python measure_performance.py --iterations {iterations} --reset-mode snapshot"
         success, output = self.run_command(command, f"Pruebas de rendimiento {scale_name}")
         
         if success:
@@ -137,14 +189,8 @@ class MultiScalePerformanceTester:
             print(f"⏱️  Tiempo estimado: {estimated_time}")
             print("="*70)
             
-            # Paso 1: Limpiar y recrear esquema
-            if not self.clean_and_recreate_schema():
-                print(f"❌ Error recreando esquema para {scale_name}")
-                continue
-            
-            # Paso 2: Generar datos
-            if not self.generate_data(scale):
-                print(f"❌ Error generando datos para {scale_name}")
+            # Pasos 1 y 2: Esquema y datos (reutiliza el snapshot de la escala)
+            if not self.prepare_scale(scale):
                 continue
             
             # Paso 3: Ejecutar pruebas de rendimiento
@@ -234,6 +280,8 @@ class MultiScalePerformanceTester:
         """Generar tablas LaTeX comparativas"""
         if not self.results:
             return
+        # Antes de Python 3.12 una expresión de f-string no admite barras invertidas
+        scale_headers = ' & '.join(f'\\textbf{{{scale}}}' for scale in self.results.keys())
             
         latex_content = f"""% Reporte Comparativo Multi-Escala - {datetime.now().strftime('%Y-%m-%d %H:%M')}
 % Análisis de rendimiento con y sin índices en diferentes volúmenes de datos
@@ -245,7 +293,7 @@ class MultiScalePerformanceTester:
 \\centering
 \\begin{{tabular}}{{|l|{'c|' * len(self.results)}}}
 \\hline
-\\textbf{{Consulta}} & {' & '.join([f'\\textbf{{{scale}}}' for scale in self.results.keys()])} \\\\
+\\textbf{{Consulta}} & {scale_headers} \\\\
 \\hline
 """
         
@@ -275,7 +323,7 @@ class MultiScalePerformanceTester:
 \\centering
 \\begin{{tabular}}{{|l|{'c|' * len(self.results)}}}
 \\hline
-\\textbf{{Consulta}} & {' & '.join([f'\\textbf{{{scale}}}' for scale in self.results.keys()])} \\\\
+\\textbf{{Consulta}} & {scale_headers} \\\\
 \\hline
 """
         
@@ -305,7 +353,7 @@ class MultiScalePerformanceTester:
 \\centering
 \\begin{{tabular}}{{|l|{'c|' * len(self.results)}}}
 \\hline
-\\textbf{{Consulta}} & {' & '.join([f'\\textbf{{{scale}}}' for scale in self.results.keys()])} \\\\
+\\textbf{{Consulta}} & {scale_headers} \\\\
 \\hline
 """
         
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Particionado Mensual de Pedido por fecha
+Proyecto: Fredys Food Database Performance Analysis
+
+Las cuatro consultas experimentales filtran Pedido.fecha por los últimos 30
+o 60 días. Con Pedido particionado por rango mensual (create_schema_partitioned.sql),
+el planificador descarta las particiones fuera del rango (partition pruning).
+
+Gestión de particiones:
+- ensure_partitions: crea los meses que faltan entre dos fechas y MONTHS_AHEAD
+  meses futuros. Si la partición DEFAULT ya tiene filas de ese mes, las mueve
+- detach_partitions: separa (y opcionalmente borra) los meses anteriores a
+  los que se conservan. Las particiones separadas quedan como tablas de archivo
+- build_partitioned_copy: copia particionada de Pedido en otro esquema, para
+  comparar con la tabla plana sobre los mismos datos (benchmark_partitions.py)
+
+Uso:
+  python partitions.py status
+  python partitions.py maintain [--ahead N] [--keep MESES] [--drop]
+"""
+
+import re
+import sys
+from datetime import date
+
+from fast_load import capture_secondary_indexes
+
+PARENT = 'Pedido'
+PARTITION_COLUMN = 'fecha'
+# Meses futuros que se crean por adelantado en cada mantenimiento
+MONTHS_AHEAD = 3
+
+_BOUND = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def add_months(day, months):
+    years, month = divmod(day.month - 1 + months, 12)
+    return date(day.year + years, month + 1, 1)
+
+
+def partition_name(month, table=PARENT):
+    return f"{table.lower()}_{month:%Y_%m}"
+
+
+def default_partition(table=PARENT):
+    return f"{table.lower()}_default"
+
+
+def is_partitioned(cursor, table=PARENT):
+    cursor.execute("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))",
+                   (table.lower(),))
+    return cursor.fetchone()[0]
+
+
+def list_partitions(cursor, table=PARENT):
+    """[(nombre, primer día, día siguiente al último o None si es DEFAULT, filas estimadas)]"""
+    cursor.execute("""
+        SELECT c.oid::regclass::text, pg_get_expr(c.relpartbound, c.oid), c.reltuples::bigint
+        FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = %s::regclass
+    """, (table.lower(),))
+    partitions = []
+    for name, bound, rows in cursor.fetchall():
+        match = _BOUND.search(bound)
+        if match:
+            lower, upper = (date.fromisoformat(value[:10]) for value in match.groups())
+        else:
+            lower = upper = None
+        partitions.append((name, lower, upper, max(rows, 0)))
+    return sorted(partitions, key=lambda p: (p[1] is None, p[1] or date.min))
+
+
+def create_partition(cursor, month, table=PARENT):
+    """Crear la partición del mes; las filas de ese mes en DEFAULT pasan a la nueva partición"""
+    name, lower, upper = partition_name(month, table), month_start(month), add_months(month, 1)
+    bounds = f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+    default = default_partition(table)
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (default,))
+    moving = False
+    if cursor.fetchone()[0]:
+        cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {default} "
+                       f"WHERE {PARTITION_COLUMN} >= %s AND {PARTITION_COLUMN} < %s)", (lower, upper))
+        moving = cursor.fetchone()[0]
+    if not moving:
+        cursor.execute(f"CREATE TABLE {name} PARTITION OF {table} {bounds}")
+        return name
+    # PostgreSQL no crea la partición si DEFAULT tiene filas de su rango
+    cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {default}")
+    cursor.execute(f"CREATE TABLE {name} PARTITION OF {table} {bounds}")
+    cursor.execute(f"""
+        WITH moved AS (
+            DELETE FROM {default} WHERE {PARTITION_COLUMN} >= %s AND {PARTITION_COLUMN} < %s RETURNING *
+        )
+        INSERT INTO {table} SELECT * FROM moved
+    """, (lower, upper))
+    cursor.execute(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT")
+    return name
+
+
+def ensure_partitions(cursor, first, last, ahead=MONTHS_AHEAD, table=PARENT):
+    """Crear las particiones mensuales que falten de first a last más ahead meses; devuelve las nuevas"""
+    existing = {lower for _, lower, _, _ in list_partitions(cursor, table) if lower}
+    created = []
+    month, end = month_start(first), add_months(month_start(last), ahead)
+    while month <= end:
+        if month not in existing:
+            created.append(create_partition(cursor, month, table))
+        month = add_months(month, 1)
+    return created
+
+
+def detach_partitions(cursor, keep_months, today=None, drop=False, table=PARENT):
+    """Separar las particiones anteriores a los keep_months meses completos previos al actual"""
+    cutoff = add_months(month_start(today or date.today()), -keep_months)
+    detached = []
+    for name, _, upper, _ in list_partitions(cursor, table):
+        if upper is not None and upper <= cutoff:
+            cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {name}")
+            if drop:
+                cursor.execute(f"DROP TABLE {name}")
+            detached.append(name)
+    return detached
+
+
+def build_partitioned_copy(cursor, schema, table=PARENT, ahead=MONTHS_AHEAD):
+    """Crear schema.table particionada por mes con los datos, CHECK e índices secundarios de table"""
+    target = f"{schema}.{table}"
+    cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+    cursor.execute(f"CREATE SCHEMA {schema}")
+    cursor.execute(f"CREATE TABLE {target} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+                   f"PARTITION BY RANGE ({PARTITION_COLUMN})")
+    # La clave primaria de una tabla particionada debe incluir la columna de partición
+    cursor.execute(f"ALTER TABLE {target} ADD PRIMARY KEY (id_{table.lower()}, {PARTITION_COLUMN})")
+    cursor.execute(f"CREATE TABLE {default_partition(target)} PARTITION OF {target} DEFAULT")
+    cursor.execute(f"SELECT min({PARTITION_COLUMN}), max({PARTITION_COLUMN}) FROM {table}")
+    first, last = cursor.fetchone()
+    if first is not None:
+        ensure_partitions(cursor, first.date(), last.date(), ahead, target)
+    source = re.compile(rf" ON (\w+\.)?{table.lower()} ")
+    for _, definition in capture_secondary_indexes(cursor, [table]):
+        cursor.execute(source.sub(f" ON {target.lower()} ", definition, count=1))
+    cursor.execute(f"INSERT INTO {target} SELECT * FROM {table}")
+    cursor.execute(f"ANALYZE {target}")
+    return list_partitions(cursor, target)
+
+
+def print_status(partitions):
+    if not partitions:
+        print(f"{PARENT} no está particionada (ver create_schema_partitioned.sql)")
+        return
+    for name, lower, upper, rows in partitions:
+        span = f"{lower} → {upper}" if lower else "DEFAULT"
+        print(f"  {name:<28} {span:<26} ~{rows:>12,} filas")
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] in ['-h', '--help']:
+        print(__doc__)
+        return
+    from main import connect_db
+
+    command = sys.argv[1]
+    ahead, keep = MONTHS_AHEAD, None
+    for option in ['--ahead', '--keep']:
+        if option in sys.argv:
+            position = sys.argv.index(option)
+            try:
+                value = int(sys.argv[position + 1])
+            except (IndexError, ValueError):
+                print(f"❌ {option} requiere un número de meses")
+                return
+            if option == '--ahead':
+                ahead = value
+            else:
+                keep = value
+
+    conn = connect_db()
+    cur = conn.cursor()
+    if not is_partitioned(cur):
+        print_status([])
+    elif command == 'status':
+        print_status(list_partitions(cur))
+    elif command == 'maintain':
+        today = date.today()
+        for name in ensure_partitions(cur, today, today, ahead):
+            print(f"🆕 Partición creada: {name}")
+        if keep is not None:
+            for name in detach_partitions(cur, keep, today, drop='--drop' in sys.argv):
+                print(f"📦 Partición {'eliminada' if '--drop' in sys.argv else 'separada'}: {name}")
+        conn.commit()
+        print_status(list_partitions(cur))
+    else:
+        print(__doc__)
+    cur.close()
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
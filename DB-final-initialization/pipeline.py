@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Pipeline asyncio de Generación y Escritura Solapadas (--pipeline)
+Proyecto: Fredys Food Database Performance Analysis
+
+Un productor genera los bloques de filas de cada tabla (en el pool de
+procesos de DataGenerator, vía run_in_executor) y los deja en una cola
+asyncio acotada. Varias corrutinas escritoras, cada una con su conexión, la
+vacían hacia PostgreSQL en paralelo. Con la cola llena el productor espera
+(contrapresión), así que la memoria no pasa de queue_size bloques.
+
+Con claves foráneas cada tabla es una barrera: sus bloques se confirman en
+todas las conexiones antes de generar la siguiente tabla. Sin FKs
+(--fast-load) varias tablas se generan a la vez y no hay barreras.
+
+Un monitor muestra periódicamente la profundidad de la cola y el ritmo de
+cada etapa; al final se indica cuál fue el cuello de botella.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import psycopg2
+
+from loader import BulkLoader
+
+
+class _StepCapture:
+    """Loader que, en vez de insertar, anota (tabla, columnas, filas) de cada paso de carga"""
+
+    def __init__(self):
+        self.inserts = []
+
+    def insert(self, table, columns, rows):
+        self.inserts.append((table, list(columns), rows))
+        return 0
+
+
+def _chunked(rows, size):
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class _StageStats:
+    def __init__(self):
+        self.rows = 0
+        self.chunks = 0
+        self.busy = 0.0
+        # Productor: tiempo bloqueado con la cola llena; escritores: esperando bloques
+        self.waiting = 0.0
+
+
+class AsyncPipeline:
+    """Solapa la generación de bloques con su escritura a través de una cola acotada"""
+
+    def __init__(self, db_params, writers=2, queue_size=8, producers=2, barriers=True,
+                 monitor_interval=2.0):
+        self.db_params = db_params
+        self.writers = writers
+        self.queue_size = queue_size
+        self.producers = producers if not barriers else 1
+        self.barriers = barriers
+        self.monitor_interval = monitor_interval
+        self.generation = _StageStats()
+        self.writing = _StageStats()
+        self.max_depth = 0
+        self.elapsed = 0.0
+
+    # --- Etapas ---
+
+    async def _produce(self, queue, table, columns, rows, chunk_size):
+        loop = asyncio.get_running_loop()
+        batches = _chunked(rows, chunk_size)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            while True:
+                start = time.perf_counter()
+                batch = await loop.run_in_executor(executor, next, batches, None)
+                self.generation.busy += time.perf_counter() - start
+                if batch is None:
+                    return
+                self.generation.rows += len(batch)
+                self.generation.chunks += 1
+
+                start = time.perf_counter()
+                await queue.put((table, columns, batch))
+                self.generation.waiting += time.perf_counter() - start
+                self.max_depth = max(self.max_depth, queue.qsize())
+
+    async def _write(self, queue, loader, executor):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = time.perf_counter()
+            item = await queue.get()
+            self.writing.waiting += time.perf_counter() - start
+            if item is None:
+                queue.task_done()
+                return
+            table, columns, batch = item
+            start = time.perf_counter()
+            await loop.run_in_executor(executor, loader.insert, table, columns, batch)
+            self.writing.busy += time.perf_counter() - start
+            self.writing.rows += len(batch)
+            self.writing.chunks += 1
+            queue.task_done()
+
+    async def _feed(self, queue, inserts, chunk_size):
+        """Producir los bloques de inserts (hasta self.producers tablas a la vez) y esperar a que se escriban"""
+        slots = asyncio.Semaphore(self.producers)
+
+        async def produce(table, columns, rows):
+            async with slots:
+                await self._produce(queue, table, columns, rows, chunk_size)
+
+        await asyncio.gather(*(produce(*insert) for insert in inserts))
+        await queue.join()
+
+    async def _guard(self, work, writers):
+        """Esperar a work; si antes falla un escritor, la cola no se vaciaría: cancelar y propagar"""
+        task = asyncio.ensure_future(work)
+        while not task.done():
+            done, _ = await asyncio.wait([task, *writers], return_when=asyncio.FIRST_COMPLETED)
+            for failed in done - {task}:
+                task.cancel()
+                failed.result()
+        return task.result()
+
+    async def _monitor(self, queue):
+        start = time.perf_counter()
+        while True:
+            await asyncio.sleep(self.monitor_interval)
+            elapsed = time.perf_counter() - start
+            print(f"  ⏳ cola {queue.qsize():>3}/{self.queue_size}  "
+                  f"generadas {self.generation.rows:>10,} ({self.generation.rows / elapsed:>10,.0f}/s)  "
+                  f"escritas {self.writing.rows:>10,} ({self.writing.rows / elapsed:>10,.0f}/s)")
+
+    async def _run(self, inserts, loader, chunk_size):
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        connections = [psycopg2.connect(**self.db_params) for _ in range(self.writers)]
+        loaders = [BulkLoader(conn.cursor(), loader.strategy, loader.page_size) for conn in connections]
+        # Un hilo por escritor: las llamadas bloqueantes de psycopg2 no frenan el bucle
+        executor = ThreadPoolExecutor(max_workers=self.writers)
+        writers = [asyncio.create_task(self._write(queue, writer, executor)) for writer in loaders]
+        monitor = asyncio.create_task(self._monitor(queue))
+
+        async def commit_all():
+            await asyncio.gather(*(loop.run_in_executor(executor, conn.commit) for conn in connections))
+
+        try:
+            if self.barriers:
+                for insert in inserts:
+                    await self._guard(self._feed(queue, [insert], chunk_size), writers)
+                    # Barrera: la tabla queda confirmada antes de cargar sus hijas
+                    await commit_all()
+            else:
+                await self._guard(self._feed(queue, inserts, chunk_size), writers)
+                await commit_all()
+            for _ in writers:
+                await queue.put(None)
+            await asyncio.gather(*writers)
+        except BaseException:
+            for task in writers:
+                task.cancel()
+            executor.shutdown(wait=True)
+            for conn in connections:
+                conn.rollback()
+            raise
+        finally:
+            monitor.cancel()
+            executor.shutdown(wait=True)
+            for conn in connections:
+                conn.close()
+        return loaders
+
+    def run(self, steps, loader, gen, plan):
+        """Cargar todas las tablas de steps; las estadísticas por tabla se suman a loader"""
+        capture = _StepCapture()
+        for step in steps.values():
+            step(capture, gen, plan)
+
+        start = time.perf_counter()
+        loaders = asyncio.run(self._run(capture.inserts, loader, gen.chunk_size))
+        self.elapsed = time.perf_counter() - start
+
+        for writer_loader in loaders:
+            for table, entry in writer_loader.stats.items():
+                total = loader.stats.setdefault(table, dict.fromkeys(entry, 0))
+                for key in total:
+                    total[key] += entry[key]
+
+    def report(self):
+        gen, out = self.generation, self.writing
+        print(f"\n🔀 Pipeline asyncio ({self.writers} escritores, cola de {self.queue_size} bloques, "
+              f"{'con' if self.barriers else 'sin'} barreras por tabla)")
+        print(f"  Generación: {gen.rows:>12,} filas  ocupada {gen.busy:>8.2f} s  "
+              f"bloqueada por cola llena {gen.waiting:>8.2f} s")
+        print(f"  Escritura:  {out.rows:>12,} filas  ocupada {out.busy:>8.2f} s  "
+              f"esperando bloques {out.waiting:>8.2f} s (suma de {self.writers} escritores)")
+        print(f"  Profundidad máxima de la cola: {self.max_depth}/{self.queue_size}")
+        rate = out.rows / self.elapsed if self.elapsed > 0 else 0
+        print(f"  Total: {self.elapsed:.2f} s ({rate:,.0f} filas/s)")
+        # La etapa que hace esperar a la otra es el cuello de botella
+        bottleneck = 'escritura' if gen.waiting > out.waiting / max(1, self.writers) else 'generación'
+        print(f"  Cuello de botella: {bottleneck}")
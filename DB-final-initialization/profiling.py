@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Perfilado del Sembrado (--profile)
+Proyecto: Fredys Food Database Performance Analysis
+
+Descompone el tiempo de cada función create_* (una por tabla) de main.py:
+- generación: espera del proceso principal por bloques de filas (Faker y
+  armado de tuplas en los procesos generadores) y CPU de esos procesos
+- envío: resto del tiempo de inserción, separado en CPU del cliente
+  (codificación de filas) y espera de red y servidor (round trips,
+  escritura, comprobación de restricciones e índices)
+Además se registran filas/s y la estimación del loader de bytes enviados y
+round trips.
+
+Con --profile-stacks los generadores muestrean su pila cada SAMPLE_INTERVAL
+segundos; el resultado se guarda en formato de pilas colapsadas
+("marco;marco;marco cuenta"), listo para flamegraph.pl o speedscope.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+SAMPLE_INTERVAL = 0.005
+_FIELDS = ['rows', 'seconds', 'generation_seconds', 'generation_main_cpu', 'worker_cpu',
+           'insert_cpu', 'round_trips_est', 'bytes_est']
+
+
+def _collapse(frame, root):
+    """Pila de un marco como 'archivo:función;...' desde root hasta la hoja"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        if frame is root:
+            break
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class StackSampler:
+    """Muestrea periódicamente la pila del hilo que llama a start() desde un hilo auxiliar
+
+    Las pilas empiezan en el marco que llamó a start(): en un generador creado
+    con fork no aparecen los marcos heredados del proceso principal.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+        self._target = None
+        self._root = None
+
+    def start(self):
+        self._target = threading.get_ident()
+        self._root = sys._getframe(1)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is not None:
+                self.stacks[_collapse(frame, self._root)] += 1
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self._root = None
+        return self.stacks
+
+
+def run_profiled(fn, task, sample):
+    """Ejecutar fn(task) en un generador: (filas, segundos de CPU, pilas muestreadas o None)"""
+    sampler = StackSampler() if sample else None
+    if sampler:
+        sampler.start()
+    cpu = time.thread_time()
+    rows = fn(task)
+    cpu = time.thread_time() - cpu
+    return rows, cpu, dict(sampler.stop()) if sampler else None
+
+
+class ProfilingLoader:
+    """Envuelve el loader: cronometra cada insert (una función create_*) y acumula sus estadísticas"""
+
+    def __init__(self, loader, profiler):
+        self.loader = loader
+        self.cursor = loader.cursor
+        self.stats = loader.stats
+        self.profiler = profiler
+
+    def insert(self, table, columns, rows):
+        before = dict(self.stats.get(table, {}))
+        start, cpu = time.perf_counter(), time.thread_time()
+        count = self.loader.insert(table, columns, rows)
+        entry = self.profiler.entry(table)
+        entry['seconds'] += time.perf_counter() - start
+        entry['insert_cpu'] += time.thread_time() - cpu
+        after = self.stats.get(table, {})
+        for key in ('rows', 'round_trips_est', 'bytes_est'):
+            entry[key] += after.get(key, 0) - before.get(key, 0)
+        return count
+
+
+class SeedProfiler:
+    """Tiempos por tabla del sembrado y, opcionalmente, pilas muestreadas de la generación"""
+
+    def __init__(self, sample=False):
+        self.sample = sample
+        self.tables = {}
+        self.stacks = Counter()
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time()
+        self.elapsed = 0.0
+        self.cpu = 0.0
+
+    def entry(self, table):
+        return self.tables.setdefault(table, dict.fromkeys(_FIELDS, 0))
+
+    def wrap(self, loader):
+        return ProfilingLoader(loader, self)
+
+    def _record(self, table, wait, main_cpu, worker_cpu, stacks):
+        with self.lock:
+            entry = self.entry(table)
+            entry['generation_seconds'] += wait
+            entry['generation_main_cpu'] += main_cpu
+            entry['worker_cpu'] += worker_cpu
+            if stacks:
+                self.stacks.update(stacks)
+
+    def run(self, table, fn, task):
+        """Generar un bloque en este proceso (sin pool)"""
+        start = time.perf_counter()
+        rows, cpu, stacks = run_profiled(fn, task, self.sample)
+        self._record(table, time.perf_counter() - start, cpu, cpu, stacks)
+        return rows
+
+    def collect(self, table, future):
+        """Esperar un bloque de un generador del pool"""
+        start, cpu = time.perf_counter(), time.thread_time()
+        rows, worker_cpu, stacks = future.result()
+        self._record(table, time.perf_counter() - start, time.thread_time() - cpu, worker_cpu, stacks)
+        return rows
+
+    def finish(self):
+        self.elapsed = time.perf_counter() - self.started
+        self.cpu = time.process_time() - self.cpu_started
+
+    def summary(self, info):
+        tables = {}
+        for table, entry in self.tables.items():
+            send = max(0.0, entry['seconds'] - entry['generation_seconds'])
+            send_cpu = max(0.0, entry['insert_cpu'] - entry['generation_main_cpu'])
+            tables[table] = dict(entry,
+                                 send_seconds=send,
+                                 send_cpu=send_cpu,
+                                 server_wait_seconds=max(0.0, send - send_cpu),
+                                 rows_per_second=entry['rows'] / entry['seconds'] if entry['seconds'] else 0.0)
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'parameters': info,
+            'wall_seconds': self.elapsed,
+            'main_cpu_seconds': self.cpu,
+            'tables': tables,
+        }
+
+    def report(self, summary):
+        print("\n⏱️  Perfil del sembrado por tabla (segundos)")
+        print(f"  {'Tabla':<14}{'Filas':>11}{'Total':>9}{'Generar':>9}{'CPU gen':>9}"
+              f"{'CPU envío':>10}{'Red+BD':>9}{'Filas/s':>11}{'MB est':>8}{'RT est':>7}")
+        for table, t in summary['tables'].items():
+            print(f"  {table:<14}{t['rows']:>11,}{t['seconds']:>9.2f}{t['generation_seconds']:>9.2f}"
+                  f"{t['worker_cpu']:>9.2f}{t['send_cpu']:>10.2f}{t['server_wait_seconds']:>9.2f}"
+                  f"{t['rows_per_second']:>11,.0f}{t['bytes_est'] / 1e6:>8.1f}{t['round_trips_est']:>7,}")
+        print(f"  Total: {summary['wall_seconds']:.2f} s de pared, "
+              f"{summary['main_cpu_seconds']:.2f} s de CPU en el proceso principal")
+
+    def dump(self, path, info):
+        """Guardar el resumen JSON y, si se muestreó, las pilas colapsadas junto a él"""
+        summary = self.summary(info)
+        if self.stacks:
+            stacks_path = os.path.splitext(path)[0] + '.collapsed'
+            with open(stacks_path, 'w', encoding='utf-8') as f:
+                for stack, count in self.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            summary['stacks_file'] = os.path.basename(stacks_path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        return summary
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Vistas Materializadas de los Reportes con Refresco Concurrente
+Proyecto: Fredys Food Database Performance Analysis
+
+Capa opcional para los tableros: cada consulta experimental se materializa
+como mv_consulta_N. La vista guarda todos los grupos del reporte (sin ORDER BY
+ni LIMIT) junto con las claves que los identifican, y sobre ellas hay un
+índice único. Así REFRESH MATERIALIZED VIEW CONCURRENTLY puede actualizarla
+sin bloquear las lecturas. Leer el reporte es solo ordenar la vista.
+
+Un programador (RefreshScheduler) refresca las vistas cada cierto intervalo.
+Cada refresco guarda en report_view_refresh el instante de su snapshot y el
+último id_pedido que existía entonces. Con eso se mide el desfase de una
+lectura: segundos desde el refresco y pedidos nuevos que la vista aún no
+incluye. Los cambios de estado de pedidos existentes no se cuentan.
+measure_performance.py --report-views compara lectura en vivo y sobre la
+vista, coste de refresco y desfase; al terminar elimina las vistas y
+report_view_refresh.
+
+Uso:
+  python report_views.py create | refresh | drop
+  python report_views.py schedule [--interval SEGUNDOS]
+"""
+
+import re
+import statistics
+import sys
+import threading
+import time
+
+import psycopg2
+
+REFRESH_INTERVAL = 30.0
+STATE_TABLE = 'report_view_refresh'
+
+# consulta -> (columnas que se añaden al SELECT para identificar cada grupo,
+#              columnas del índice único que exige el refresco concurrente)
+VIEW_KEYS = {
+    'consulta_1': ('p.id_plato, u.nombre AS nombre_admin, u.apellido AS apellido_admin',
+                   ['id_plato', 'nombre_admin', 'apellido_admin', 'zona_entrega']),
+    'consulta_2': (None, ['zona_entrega']),
+    'consulta_3': ('u.id_usuario AS id_repartidor', ['id_repartidor', 'zona_entrega']),
+    'consulta_4': ('u.id_usuario AS id_cliente', ['id_cliente', 'zona_entrega']),
+}
+
+# Alias de tabla en el ORDER BY final (c.zona_entrega): en la vista son columnas
+_QUALIFIER = re.compile(r"\b[a-z]+\.(?=[a-z_])")
+
+
+def view_name(query_id):
+    return f"mv_{query_id}"
+
+
+def split_query(sql):
+    """(cuerpo sin ORDER BY final, ORDER BY [LIMIT] para leer la vista)"""
+    body, order = sql.strip().rstrip(';').rsplit('ORDER BY', 1)
+    return body, _QUALIFIER.sub('', ' '.join(order.split()))
+
+
+def view_definitions(queries):
+    """query_id -> {'create': sentencias, 'read': consulta sobre la vista}"""
+    definitions = {}
+    for query_id, (extra, unique) in VIEW_KEYS.items():
+        body, order = split_query(queries[query_id]['sql'])
+        if extra:
+            body = body.replace('SELECT', f"SELECT {extra},", 1)
+        view = view_name(query_id)
+        definitions[query_id] = {
+            'create': [f"CREATE MATERIALIZED VIEW {view} AS {body}",
+                       f"CREATE UNIQUE INDEX {view}_key ON {view} ({', '.join(unique)})"],
+            'read': f"SELECT * FROM {view} ORDER BY {order}",
+        }
+    return definitions
+
+
+def create_views(cursor, definitions):
+    """(Re)crear las vistas y la tabla de estado; la creación cuenta como primer refresco"""
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {STATE_TABLE} (
+            vista VARCHAR(50) PRIMARY KEY,
+            refreshed_at TIMESTAMPTZ NOT NULL,
+            max_id_pedido INT NOT NULL,
+            refresh_seconds DOUBLE PRECISION NOT NULL
+        )
+    """)
+    for query_id, definition in definitions.items():
+        cursor.execute(f"DROP MATERIALIZED VIEW IF EXISTS {view_name(query_id)}")
+        _timed_refresh(cursor, query_id, definition['create'])
+
+
+def drop_views(cursor):
+    for query_id in VIEW_KEYS:
+        cursor.execute(f"DROP MATERIALIZED VIEW IF EXISTS {view_name(query_id)}")
+    cursor.execute(f"DROP TABLE IF EXISTS {STATE_TABLE}")
+
+
+def _timed_refresh(cursor, query_id, statements):
+    # now() y max(id_pedido) antes del refresco: el snapshot de la vista es al menos igual de reciente
+    cursor.execute("SELECT now(), COALESCE(max(id_pedido), 0) FROM Pedido")
+    snapshot, max_id = cursor.fetchone()
+    start = time.perf_counter()
+    for sql in statements:
+        cursor.execute(sql)
+    seconds = time.perf_counter() - start
+    cursor.execute(f"""
+        INSERT INTO {STATE_TABLE} (vista, refreshed_at, max_id_pedido, refresh_seconds)
+        VALUES (%s, %s, %s, %s)
+        ON CONFLICT (vista) DO UPDATE SET refreshed_at = EXCLUDED.refreshed_at,
+            max_id_pedido = EXCLUDED.max_id_pedido, refresh_seconds = EXCLUDED.refresh_seconds
+    """, (view_name(query_id), snapshot, max_id, seconds))
+    return seconds
+
+
+def refresh_view(cursor, query_id):
+    """REFRESH ... CONCURRENTLY de una vista; devuelve los segundos que tardó"""
+    return _timed_refresh(cursor, query_id,
+                          [f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view_name(query_id)}"])
+
+
+def staleness(cursor, query_id):
+    """(segundos desde el snapshot del último refresco, pedidos creados después)"""
+    cursor.execute(f"""
+        SELECT EXTRACT(EPOCH FROM clock_timestamp() - r.refreshed_at)::float,
+               (SELECT count(*) FROM Pedido WHERE id_pedido > r.max_id_pedido)
+        FROM {STATE_TABLE} r WHERE r.vista = %s
+    """, (view_name(query_id),))
+    return cursor.fetchone()
+
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class RefreshScheduler:
+    """Refresca las vistas una tras otra cada interval segundos desde un hilo con su conexión"""
+
+    def __init__(self, db_params, interval=REFRESH_INTERVAL, query_ids=None):
+        self.db_params = db_params
+        self.interval = interval
+        self.query_ids = list(query_ids or VIEW_KEYS)
+        self.stop_event = threading.Event()
+        self.thread = None
+        # Por refresco: (query_id, segundos)
+        self.samples = []
+        self.errors = 0
+        self.lock = threading.Lock()
+
+    def _run(self):
+        conn = psycopg2.connect(**self.db_params)
+        conn.autocommit = True
+        cur = conn.cursor()
+        try:
+            while not self.stop_event.wait(self.interval):
+                for query_id in self.query_ids:
+                    if self.stop_event.is_set():
+                        break
+                    try:
+                        seconds = refresh_view(cur, query_id)
+                    except psycopg2.Error as e:
+                        print(f"⚠️  Error refrescando {view_name(query_id)}: {e}")
+                        with self.lock:
+                            self.errors += 1
+                        continue
+                    with self.lock:
+                        self.samples.append((query_id, seconds))
+        finally:
+            cur.close()
+            conn.close()
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Detener tras el refresco en curso y devolver el resumen"""
+        self.stop_event.set()
+        self.thread.join()
+        return self.summary()
+
+    def summary(self):
+        with self.lock:
+            samples = list(self.samples)
+        views = {}
+        for query_id in self.query_ids:
+            times = [s * 1000 for q, s in samples if q == query_id]
+            views[query_id] = {'refreshes': len(times),
+                               'mean_ms': statistics.mean(times) if times else 0.0,
+                               'p95_ms': _percentile(times, 0.95),
+                               'max_ms': max(times, default=0.0)}
+        return {'interval_seconds': self.interval, 'errors': self.errors, 'views': views}
+
+
+def _execution_ms(cursor, sql):
+    cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}")
+    return cursor.fetchone()[0][0]['Execution Time']
+
+
+def benchmark_views(db_params, queries, runs=10, interval=REFRESH_INTERVAL):
+    """Alternar lectura en vivo y sobre la vista con el programador activo
+
+    Devuelve por consulta las medianas de ambas lecturas y el desfase observado
+    en cada lectura de la vista, más el coste de los refrescos. Las vistas y la
+    tabla de estado se eliminan al terminar, también si la medición falla.
+    """
+    definitions = view_definitions(queries)
+    conn = psycopg2.connect(**db_params)
+    conn.autocommit = True
+    cur = conn.cursor()
+    print("🔄 Creando vistas materializadas...")
+    create_views(cur, definitions)
+
+    scheduler = RefreshScheduler(db_params, interval)
+    scheduler.start()
+    print(f"⏲️  Refresco concurrente cada {interval:g} s")
+    results = {}
+    try:
+        for query_id, definition in definitions.items():
+            live, view, ages, pending = [], [], [], []
+            # Una ejecución de calentamiento de cada lectura, que se descarta
+            for i in range(runs + 1):
+                live_ms = _execution_ms(cur, queries[query_id]['sql'])
+                view_ms = _execution_ms(cur, definition['read'])
+                age, behind = staleness(cur, query_id)
+                if i > 0:
+                    live.append(live_ms)
+                    view.append(view_ms)
+                    ages.append(age)
+                    pending.append(behind)
+            results[query_id] = {
+                'name': queries[query_id]['name'],
+                'live_ms': statistics.median(live),
+                'view_ms': statistics.median(view),
+                'speedup': statistics.median(live) / statistics.median(view) if statistics.median(view) else 0.0,
+                'staleness_seconds': {'mean': statistics.mean(ages), 'max': max(ages)},
+                'orders_behind': {'mean': statistics.mean(pending), 'max': max(pending)},
+            }
+            r = results[query_id]
+            print(f"  {query_id}: en vivo {r['live_ms']:.2f} ms, vista {r['view_ms']:.2f} ms "
+                  f"({r['speedup']:.1f}x), desfase medio {r['staleness_seconds']['mean']:.1f} s")
+    finally:
+        refresh = scheduler.stop()
+        try:
+            drop_views(cur)
+            print("🗑️  Vistas eliminadas")
+        finally:
+            cur.close()
+            conn.close()
+    return {'queries': results, 'refresh': refresh}
+
+
+def print_summary(summary):
+    print("\n" + "=" * 86)
+    print("📊 VISTAS MATERIALIZADAS FRENTE A CONSULTAS EN VIVO")
+    print("=" * 86)
+    print(f"{'Consulta':<12}{'Vivo (ms)':>11}{'Vista (ms)':>12}{'Mejora':>9}{'Desfase s':>11}"
+          f"{'Pedidos atrás':>15}{'Refresco ms':>13}{'Refrescos':>11}")
+    for query_id, r in summary['queries'].items():
+        refresh = summary['refresh']['views'][query_id]
+        print(f"{query_id:<12}{r['live_ms']:>11.2f}{r['view_ms']:>12.2f}{r['speedup']:>8.1f}x"
+              f"{r['staleness_seconds']['mean']:>11.1f}{r['orders_behind']['mean']:>15.1f}"
+              f"{refresh['mean_ms']:>13.1f}{refresh['refreshes']:>11}")
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] in ['-h', '--help']:
+        print(__doc__)
+        return
+    from main import DB_PARAMS
+    from measure_performance import DatabasePerformanceTester
+
+    command = sys.argv[1]
+    interval = REFRESH_INTERVAL
+    if '--interval' in sys.argv:
+        try:
+            interval = float(sys.argv[sys.argv.index('--interval') + 1])
+        except (IndexError, ValueError):
+            print("❌ --interval requiere un número de segundos")
+            return
+
+    conn = psycopg2.connect(**DB_PARAMS)
+    conn.autocommit = True
+    cur = conn.cursor()
+    if command == 'create':
+        create_views(cur, view_definitions(DatabasePerformanceTester().get_query_definitions()))
+        print(f"✅ Vistas creadas: {', '.join(view_name(q) for q in VIEW_KEYS)}")
+    elif command == 'refresh':
+        for query_id in VIEW_KEYS:
+            print(f"🔄 {view_name(query_id)}: {refresh_view(cur, query_id):.2f} s")
+    elif command == 'drop':
+        drop_views(cur)
+        print("🗑️  Vistas eliminadas")
+    elif command == 'schedule':
+        scheduler = RefreshScheduler(DB_PARAMS, interval)
+        scheduler.start()
+        print(f"⏲️  Refrescando cada {interval:g} s (Ctrl+C para terminar)")
+        try:
+            while True:
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+        for query_id, view in scheduler.stop()['views'].items():
+            print(f"  {view_name(query_id)}: {view['refreshes']} refrescos, media {view['mean_ms']:.1f} ms")
+    else:
+        print(__doc__)
+    cur.close()
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
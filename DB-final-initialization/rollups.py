@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+Rollups Diarios Mantenidos por Triggers
+Proyecto: Fredys Food Database Performance Analysis
+
+Las consultas 1 a 3 vuelven a agregar todos los pedidos de la ventana en cada
+ejecución. Estas tablas guardan por día los conteos y sumas de cada reporte:
+- rollup_plato_dia   (dia, plato, administrador, zona): consulta 1
+- rollup_zona_dia    (dia, zona): consulta 2
+- rollup_reparto_dia (dia, zona): consulta 3. Esta consulta asigna a cada
+  repartidor todos los pedidos de las zonas que cubre (join por Cubre), así
+  que sus métricas son las de la zona y el repartidor se añade al leer; una
+  clave (dia, repartidor, zona) repetiría las mismas sumas por repartidor
+
+Las sumas reproducen la multiplicidad de los joins de las consultas
+originales (una fila por menú del pedido y por fila de Hace), así que las
+versiones reescritas (ROLLUP_QUERIES) devuelven los mismos valores sumando
+como mucho 30-60 filas por clave.
+
+Los triggers son de sentencia, con tablas de transición, sobre Pedido, Tiene
+y Hace:
+- INSERT y UPDATE recalculan la contribución de los pedidos afectados antes
+  y después de la sentencia y suman la diferencia
+- DELETE recalcula por completo los días de los pedidos afectados. Con ON
+  DELETE CASCADE, Tiene y Hace pierden sus filas después que Pedido, así que
+  su estado anterior ya no puede reconstruirse; el trigger de Pedido se
+  dispara después de las cascadas y recalcula sus días
+- TRUNCATE recalcula los rollups que dependen de la tabla
+Los cambios en Menu o Pertenece (fuera de las cascadas a Tiene) no se
+siguen: después de ellos, use rebuild.
+
+Uso: python rollups.py install | rebuild | verify | drop
+"""
+
+import statistics
+import sys
+import time
+
+import psycopg2
+
+from compact import is_compact
+from stream_orders import OrderStream
+
+# Segundos de flujo de pedidos con y sin triggers para medir el coste por escritura
+WRITE_SECONDS = 30
+WRITE_TPS = 50
+
+# Eventos con trigger en cada tabla base
+EVENTS = ['INSERT', 'UPDATE', 'DELETE', 'TRUNCATE']
+
+# Tablas base -> columnas de su clave primaria (todas empiezan por id_pedido)
+TABLE_KEYS = {
+    'Pedido': ['id_pedido'],
+    'Tiene': ['id_pedido', 'id_menu'],
+    'Hace': ['id_pedido', 'id_usuario'],
+}
+
+# rollup -> claves, métricas, tablas de las que depende y contribución de un
+# conjunto de pedidos ({Pedido}, {Tiene}, {Hace} son las relaciones de origen)
+ROLLUPS = {
+    'rollup_plato_dia': {
+        'keys': [('dia', 'DATE'), ('id_plato', 'INTEGER'), ('id_administrador', 'INTEGER'),
+                 ('zona_entrega', 'VARCHAR(50)')],
+        'metrics': [('pedidos', 'BIGINT'), ('filas', 'BIGINT'), ('calificaciones', 'BIGINT'),
+                    ('suma_calificacion', 'BIGINT')],
+        'tables': ['Pedido', 'Tiene', 'Hace'],
+        'sql': """
+            SELECT pd.fecha::date, pe.id_plato, m.id_administrador, pd.zona_entrega,
+                   COUNT(DISTINCT pd.id_pedido), COUNT(*), COUNT(h.calificacion),
+                   COALESCE(SUM(h.calificacion), 0)
+            FROM {Pedido} pd
+            JOIN {Tiene} t ON t.id_pedido = pd.id_pedido
+            JOIN Menu m ON m.id_menu = t.id_menu
+            JOIN Pertenece pe ON pe.id_menu = m.id_menu
+            LEFT JOIN {Hace} h ON h.id_pedido = pd.id_pedido
+            WHERE pd.estado = 'Entregado'
+            GROUP BY 1, 2, 3, 4
+        """,
+    },
+    'rollup_zona_dia': {
+        'keys': [('dia', 'DATE'), ('zona_entrega', 'VARCHAR(50)')],
+        'metrics': [('pedidos', 'BIGINT'), ('entregados', 'BIGINT'), ('minutos_entrega', 'NUMERIC'),
+                    ('minutos_desvio', 'NUMERIC')],
+        'tables': ['Pedido'],
+        'sql': """
+            SELECT pd.fecha::date, pd.zona_entrega,
+                   COUNT(*), COUNT(*) FILTER (WHERE pd.estado = 'Entregado'),
+                   SUM(EXTRACT(EPOCH FROM (pd.hora_entrega - pd.hora_salida)) / 60),
+                   SUM(EXTRACT(EPOCH FROM (pd.hora_entrega - pd.hora_entrega_estimada)) / 60)
+            FROM {Pedido} pd
+            WHERE pd.hora_salida IS NOT NULL
+              AND pd.hora_entrega IS NOT NULL
+              AND pd.hora_entrega_estimada IS NOT NULL
+            GROUP BY 1, 2
+        """,
+    },
+    'rollup_reparto_dia': {
+        'keys': [('dia', 'DATE'), ('zona_entrega', 'VARCHAR(50)')],
+        'metrics': [('filas', 'BIGINT'), ('entregados', 'BIGINT'), ('calificaciones', 'BIGINT'),
+                    ('suma_calificacion', 'BIGINT'), ('minutos_entrega', 'NUMERIC')],
+        'tables': ['Pedido', 'Hace'],
+        'sql': """
+            SELECT pd.fecha::date, pd.zona_entrega,
+                   COUNT(*), COUNT(*) FILTER (WHERE pd.estado = 'Entregado'),
+                   COUNT(h.calificacion), COALESCE(SUM(h.calificacion), 0),
+                   SUM(EXTRACT(EPOCH FROM (pd.hora_entrega - pd.hora_salida)) / 60)
+            FROM {Pedido} pd
+            LEFT JOIN {Hace} h ON h.id_pedido = pd.id_pedido
+            WHERE pd.estado IN ('Entregado', 'En reparto')
+              AND pd.hora_salida IS NOT NULL
+              AND pd.hora_entrega IS NOT NULL
+            GROUP BY 1, 2
+        """,
+    },
+}
+
+# Consultas 1-3 reescritas sobre los rollups, con las mismas columnas
+ROLLUP_QUERIES = {
+    "consulta_1": """
+        SELECT
+            p.nombre AS nombre_plato,
+            p.categoria,
+            p.precio,
+            u.nombre || ' ' || u.apellido AS administrador_creador,
+            r.zona_entrega,
+            SUM(r.pedidos) AS total_pedidos,
+            ROUND(SUM(r.suma_calificacion)::numeric / NULLIF(SUM(r.calificaciones), 0), 2) AS calificacion_promedio,
+            SUM(r.calificaciones) AS total_calificaciones,
+            SUM(r.filas) * p.precio AS ingresos_generados
+        FROM rollup_plato_dia r
+        JOIN Plato p ON p.id_plato = r.id_plato
+        JOIN Administrador a ON a.id_usuario = r.id_administrador
+        JOIN Usuario u ON a.id_usuario = u.id_usuario
+        WHERE r.dia >= CURRENT_DATE - 30
+        GROUP BY p.id_plato, p.nombre, p.categoria, p.precio,
+                 u.nombre, u.apellido, r.zona_entrega
+        HAVING SUM(r.pedidos) >= 5
+        ORDER BY total_pedidos DESC, calificacion_promedio DESC
+        LIMIT 15;
+    """,
+    "consulta_2": """
+        WITH zonas AS (
+            SELECT zona_entrega, SUM(pedidos) AS pedidos, SUM(entregados) AS entregados,
+                   SUM(minutos_entrega) AS minutos_entrega, SUM(minutos_desvio) AS minutos_desvio
+            FROM rollup_zona_dia
+            WHERE dia >= CURRENT_DATE - 30
+            GROUP BY zona_entrega
+            HAVING SUM(pedidos) > 0
+        ),
+        cobertura AS (
+            SELECT c.zona_entrega, COUNT(*) AS filas, COUNT(DISTINCT c.id_usuario) AS repartidores,
+                   STRING_AGG(DISTINCT u.nombre || ' ' || u.apellido, ', ') AS nombres
+            FROM Cubre c
+            JOIN Usuario u ON c.id_usuario = u.id_usuario
+            GROUP BY c.zona_entrega
+        )
+        SELECT
+            z.zona_entrega,
+            ze.costo AS costo_zona,
+            z.pedidos * c.filas AS total_entregas,
+            z.entregados * c.filas AS entregas_exitosas,
+            ROUND(z.entregados::numeric / z.pedidos::numeric * 100, 2) AS porcentaje_exito,
+            ROUND(z.minutos_entrega / z.pedidos, 2) AS tiempo_promedio_minutos,
+            ROUND(z.minutos_desvio / z.pedidos, 2) AS diferencia_estimado_real,
+            c.repartidores AS repartidores_activos,
+            c.nombres AS nombres_repartidores
+        FROM zonas z
+        JOIN ZonaEntrega ze ON z.zona_entrega = ze.nombre
+        JOIN cobertura c ON z.zona_entrega = c.zona_entrega
+        WHERE z.pedidos * c.filas >= 5
+        ORDER BY porcentaje_exito DESC, tiempo_promedio_minutos ASC;
+    """,
+    "consulta_3": """
+        WITH zonas AS (
+            SELECT zona_entrega, SUM(filas) AS filas, SUM(entregados) AS entregados,
+                   SUM(suma_calificacion)::numeric / NULLIF(SUM(calificaciones), 0) AS calificacion,
+                   SUM(minutos_entrega) AS minutos_entrega,
+                   COUNT(*) FILTER (WHERE filas > 0) AS dias
+            FROM rollup_reparto_dia
+            WHERE dia >= CURRENT_DATE - 30
+            GROUP BY zona_entrega
+        )
+        SELECT
+            u.nombre || ' ' || u.apellido AS nombre_repartidor,
+            t.nro_telef_emergencia AS telefono_emergencia,
+            c.zona_entrega,
+            z.filas AS entregas_realizadas,
+            z.entregados AS entregas_exitosas,
+            ROUND(z.entregados::numeric / z.filas::numeric * 100, 2) AS tasa_exito,
+            ROUND(z.calificacion, 2) AS calificacion_promedio,
+            ROUND(z.minutos_entrega / z.filas, 2) AS tiempo_promedio_entrega,
+            z.dias AS dias_trabajados,
+            ROW_NUMBER() OVER (
+                PARTITION BY c.zona_entrega
+                ORDER BY z.entregados DESC, z.calificacion DESC
+            ) AS ranking_zona
+        FROM Usuario u
+        JOIN Trabajador t ON u.id_usuario = t.id_usuario
+        JOIN Repartidor r ON t.id_usuario = r.id_usuario
+        JOIN Cubre c ON r.id_usuario = c.id_usuario
+        JOIN zonas z ON z.zona_entrega = c.zona_entrega
+        WHERE z.filas >= 3
+        ORDER BY c.zona_entrega, ranking_zona;
+    """,
+}
+
+
+def _columns(rollup):
+    return [name for name, _ in rollup['keys'] + rollup['metrics']]
+
+
+def _contribution(rollup, sources):
+    return rollup['sql'].format(**sources)
+
+
+def _sources(table, update):
+    """Relaciones de origen (antes, después) para un trigger de sentencia sobre table
+
+    Solo entran los pedidos de las filas nuevas. Antes de la sentencia, table
+    no tenía las filas nuevas y, en un UPDATE, tenía las viejas.
+    """
+    affected = "(SELECT id_pedido FROM nuevos)"
+    after = {name: f"(SELECT * FROM {name} WHERE id_pedido IN {affected})" for name in TABLE_KEYS}
+    keys = ', '.join(TABLE_KEYS[table])
+    before = dict(after)
+    before[table] = (f"(SELECT * FROM {table} WHERE id_pedido IN {affected} "
+                     f"AND ({keys}) NOT IN (SELECT {keys} FROM nuevos)"
+                     + (" UNION ALL SELECT * FROM viejos)" if update else ")"))
+    return before, after
+
+
+def _delta_sql(name, rollup, before, after):
+    """Sumar al rollup la contribución posterior menos la anterior de los pedidos afectados"""
+    keys = [key for key, _ in rollup['keys']]
+    metrics = [metric for metric, _ in rollup['metrics']]
+    columns = ', '.join(keys + metrics)
+    return f"""
+        INSERT INTO {name} AS r ({columns})
+        SELECT {', '.join(keys)}, {', '.join(f'SUM({m})' for m in metrics)}
+        FROM (
+            SELECT * FROM ({_contribution(rollup, after)}) AS despues ({columns})
+            UNION ALL
+            SELECT {', '.join(keys + [f'-{m}' for m in metrics])}
+            FROM ({_contribution(rollup, before)}) AS antes ({columns})
+        ) d
+        GROUP BY {', '.join(keys)}
+        HAVING {' OR '.join(f'SUM({m}) <> 0' for m in metrics)}
+        ON CONFLICT ({', '.join(keys)}) DO UPDATE SET
+            {', '.join(f'{m} = r.{m} + EXCLUDED.{m}' for m in metrics)}
+    """
+
+
+def _rebuild_sql(name, rollup, sources, overwrite=False):
+    """INSERT de la contribución de sources; con overwrite, reemplaza las claves que ya existan"""
+    sql = (f"INSERT INTO {name} ({', '.join(_columns(rollup))}) "
+           f"{_contribution(rollup, sources)}")
+    if overwrite:
+        keys = [key for key, _ in rollup['keys']]
+        sql += (f"\nON CONFLICT ({', '.join(keys)}) DO UPDATE SET "
+                f"{', '.join(f'{m} = EXCLUDED.{m}' for m, _ in rollup['metrics'])}")
+    return sql
+
+
+def _recompute_days_sql(name, rollup):
+    """Borrar y recalcular desde las tablas base los días de los pedidos borrados (viejos)
+
+    Entre el DELETE y el INSERT, el trigger de otra transacción puede volver a
+    insertar una clave de esos días; el recálculo la reemplaza en lugar de
+    fallar por la clave primaria.
+    """
+    sources = {other: other for other in TABLE_KEYS}
+    sources['Pedido'] = "(SELECT * FROM Pedido WHERE fecha::date = ANY(dias))"
+    return (f"DELETE FROM {name} WHERE dia = ANY(dias);\n"
+            f"{_rebuild_sql(name, rollup, sources, overwrite=True)}")
+
+
+def _days_sql(table):
+    """Días de los pedidos de las filas borradas; vacío si sus Pedido ya no existen"""
+    if table == 'Pedido':
+        return "SELECT DISTINCT fecha::date FROM viejos"
+    return ("SELECT DISTINCT pd.fecha::date FROM Pedido pd "
+            "WHERE pd.id_pedido IN (SELECT id_pedido FROM viejos)")
+
+
+def trigger_statements(table):
+    """Funciones y triggers de INSERT, UPDATE, DELETE y TRUNCATE sobre una tabla base"""
+    statements = []
+    rollups = {name: rollup for name, rollup in ROLLUPS.items() if table in rollup['tables']}
+    for event in EVENTS:
+        function = f"rollup_{table.lower()}_{event.lower()}"
+        declare = ""
+        if event in ('INSERT', 'UPDATE'):
+            before, after = _sources(table, event == 'UPDATE')
+            body = ';\n'.join(_delta_sql(name, rollup, before, after) for name, rollup in rollups.items())
+        elif event == 'DELETE':
+            declare = f"DECLARE\n    dias date[] := ARRAY({_days_sql(table)});\n"
+            body = ';\n'.join(_recompute_days_sql(name, rollup) for name, rollup in rollups.items())
+        else:
+            full = {name: name for name in TABLE_KEYS}
+            body = ';\n'.join(f"TRUNCATE {name};\n{_rebuild_sql(name, rollup, full)}"
+                              for name, rollup in rollups.items())
+        referencing = {
+            'INSERT': "REFERENCING NEW TABLE AS nuevos ",
+            'UPDATE': "REFERENCING OLD TABLE AS viejos NEW TABLE AS nuevos ",
+            'DELETE': "REFERENCING OLD TABLE AS viejos ",
+            'TRUNCATE': "",
+        }[event]
+        statements += [
+            f"CREATE OR REPLACE FUNCTION {function}() RETURNS trigger LANGUAGE plpgsql AS $$\n"
+            f"{declare}BEGIN\n{body};\n    RETURN NULL;\nEND\n$$",
+            f"DROP TRIGGER IF EXISTS {function} ON {table}",
+            f"CREATE TRIGGER {function} AFTER {event} ON {table} {referencing}"
+            f"FOR EACH STATEMENT EXECUTE FUNCTION {function}()",
+        ]
+    return statements
+
+
+def rebuild_rollups(cursor):
+    """Recalcular los rollups desde las tablas base; devuelve las filas por rollup"""
+    full = {name: name for name in TABLE_KEYS}
+    rows = {}
+    for name, rollup in ROLLUPS.items():
+        cursor.execute(f"TRUNCATE {name}")
+        cursor.execute(_rebuild_sql(name, rollup, full))
+        rows[name] = cursor.rowcount
+        cursor.execute(f"ANALYZE {name}")
+    return rows
+
+
+def install_rollups(cursor):
+    """Crear las tablas, llenarlas desde los datos actuales e instalar los triggers"""
+    for name, rollup in ROLLUPS.items():
+        keys = [key for key, _ in rollup['keys']]
+        columns = [f"{key} {kind} NOT NULL" for key, kind in rollup['keys']]
+        columns += [f"{metric} {kind} NOT NULL DEFAULT 0" for metric, kind in rollup['metrics']]
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {name} ({', '.join(columns)}, "
+                       f"PRIMARY KEY ({', '.join(keys)}))")
+    rows = rebuild_rollups(cursor)
+    for table in TABLE_KEYS:
+        for sql in trigger_statements(table):
+            cursor.execute(sql)
+    return rows
+
+
+def drop_rollups(cursor):
+    for table in TABLE_KEYS:
+        for event in EVENTS:
+            function = f"rollup_{table.lower()}_{event.lower()}"
+            cursor.execute(f"DROP TRIGGER IF EXISTS {function} ON {table}")
+            cursor.execute(f"DROP FUNCTION IF EXISTS {function}()")
+    for name in ROLLUPS:
+        cursor.execute(f"DROP TABLE IF EXISTS {name}")
+
+
+def verify_rollups(cursor):
+    """Filas en las que cada rollup difiere de recalcularlo desde las tablas base"""
+    full = {name: name for name in TABLE_KEYS}
+    differences = {}
+    for name, rollup in ROLLUPS.items():
+        columns = ', '.join(_columns(rollup))
+        stored = (f"SELECT {columns} FROM {name} "
+                  f"WHERE NOT ({' AND '.join(f'{m} = 0' for m, _ in rollup['metrics'])})")
+        fresh = f"SELECT * FROM ({_contribution(rollup, full)}) AS c ({columns})"
+        cursor.execute(f"SELECT (SELECT count(*) FROM ({stored} EXCEPT ALL {fresh}) a) "
+                       f"+ (SELECT count(*) FROM ({fresh} EXCEPT ALL {stored}) b)")
+        differences[name] = cursor.fetchone()[0]
+    return differences
+
+
+def _median_ms(cursor, sql, runs):
+    times = []
+    for i in range(runs + 1):
+        cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}")
+        if i > 0:
+            times.append(cursor.fetchone()[0][0]['Execution Time'])
+    return statistics.median(times)
+
+
+def benchmark_rollups(db_params, queries, runs=10, tps=WRITE_TPS, workers=4, duration=WRITE_SECONDS):
+    """Coste por escritura (flujo de pedidos sin y con triggers) y mejora de lectura
+
+    Los rollups se eliminan al terminar para no frenar la siembra con main.py.
+    """
+    conn = psycopg2.connect(**db_params)
+    conn.autocommit = True
+    cur = conn.cursor()
+    if is_compact(cur):
+        conn.close()
+        raise RuntimeError("Los rollups no admiten el esquema compacto "
+                           "(create_schema_compact.sql): cree el esquema con create_schema.sql")
+    drop_rollups(cur)
+    try:
+        print(f"\n🚚 Flujo de pedidos SIN triggers: {tps:g} TPS durante {duration} s")
+        without = OrderStream(dict(db_params), tps, workers).run(duration)
+
+        print("\n🔄 Creando rollups e instalando triggers...")
+        start = time.perf_counter()
+        rows = install_rollups(cur)
+        build = time.perf_counter() - start
+        print(f"✅ Rollups llenados en {build:.2f} s: " + ', '.join(f"{n} {r:,}" for n, r in rows.items()))
+
+        print(f"\n🚚 Flujo de pedidos CON triggers: {tps:g} TPS durante {duration} s")
+        with_triggers = OrderStream(dict(db_params), tps, workers).run(duration)
+        differences = verify_rollups(cur)
+        if any(differences.values()):
+            print(f"⚠️  Los rollups difieren del recálculo: {differences}")
+        else:
+            print("✅ Los rollups coinciden con el recálculo desde las tablas base")
+
+        results = {}
+        for query_id, sql in ROLLUP_QUERIES.items():
+            live = _median_ms(cur, queries[query_id]['sql'], runs)
+            rollup = _median_ms(cur, sql, runs)
+            results[query_id] = {'name': queries[query_id]['name'], 'live_ms': live, 'rollup_ms': rollup,
+                                 'speedup': live / rollup if rollup else 0.0}
+            print(f"  {query_id}: en vivo {live:.2f} ms, rollup {rollup:.2f} ms ({results[query_id]['speedup']:.1f}x)")
+    finally:
+        drop_rollups(cur)
+        cur.close()
+        conn.close()
+
+    return {
+        'queries': results,
+        'build_seconds': build,
+        'rollup_rows': rows,
+        'differences': differences,
+        'writes': {
+            'without_triggers': without,
+            'with_triggers': with_triggers,
+            'added_transaction_ms': {
+                q: with_triggers['transaction_ms'][q] - without['transaction_ms'][q] for q in ('p50', 'p95', 'p99')
+            },
+        },
+    }
+
+
+def print_summary(summary):
+    print("\n" + "=" * 60)
+    print("📊 ROLLUPS DIARIOS FRENTE A CONSULTAS EN VIVO")
+    print("=" * 60)
+    print(f"{'Consulta':<12}{'Vivo (ms)':>14}{'Rollup (ms)':>14}{'Mejora':>10}")
+    for query_id, r in summary['queries'].items():
+        print(f"{query_id:<12}{r['live_ms']:>14.2f}{r['rollup_ms']:>14.2f}{r['speedup']:>9.1f}x")
+    writes = summary['writes']
+    print("\n✍️  Latencia de transacción del flujo (ms), sin → con triggers:")
+    for q in ('p50', 'p95', 'p99'):
+        print(f"  {q}: {writes['without_triggers']['transaction_ms'][q]:.2f} → "
+              f"{writes['with_triggers']['transaction_ms'][q]:.2f} "
+              f"(+{writes['added_transaction_ms'][q]:.2f})")
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] in ['-h', '--help']:
+        print(__doc__)
+        return
+    from main import connect_db
+
+    conn = connect_db()
+    conn.autocommit = True
+    cur = conn.cursor()
+    command = sys.argv[1]
+    if command == 'install':
+        rows = install_rollups(cur)
+        print("✅ Rollups instalados: " + ', '.join(f"{n} {r:,} filas" for n, r in rows.items()))
+    elif command == 'rebuild':
+        rows = rebuild_rollups(cur)
+        print("✅ Rollups recalculados: " + ', '.join(f"{n} {r:,} filas" for n, r in rows.items()))
+    elif command == 'verify':
+        for name, count in verify_rollups(cur).items():
+            print(f"  {'✅' if count == 0 else '❌'} {name}: {count} filas distintas")
+    elif command == 'drop':
+        drop_rollups(cur)
+        print("🗑️  Rollups y triggers eliminados")
+    else:
+        print(__doc__)
+    cur.close()
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
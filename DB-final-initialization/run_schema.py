@@ -1,12 +1,17 @@
 #!/usr/bin/env python3
 """
 Script temporal para ejecutar create_schema.sql
+
+Uso: python run_schema.py [archivo.sql]   (p. ej. create_schema_partitioned.sql)
 """
+import sys
+
 import psycopg2
 
 def main():
     # Leer el archivo SQL
-    with open('create_schema.sql', 'r', encoding='utf-8') as f:
+    schema_file = sys.argv[1] if len(sys.argv) > 1 else 'create_schema.sql'
+    with open(schema_file, 'r', encoding='utf-8') as f:
         sql_content = f.read()
 
     try:
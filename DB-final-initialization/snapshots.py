@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Snapshots de Base de Datos con CREATE DATABASE ... TEMPLATE
+Proyecto: Fredys Food Database Performance Analysis
+
+Restablecer el estado entre experimentos cuesta una copia de archivos en
+lugar de reescribir todas las tablas (VACUUM FULL) o volver a sembrar:
+- save(etiqueta):    congela la base actual como plantilla final_project_tpl_<etiqueta>
+- restore(etiqueta): recrea la base principal a partir de la plantilla
+- clone(destino):    copia prístina de la base principal para medir sobre ella
+
+Uso:
+  python snapshots.py list
+  python snapshots.py save 10K
+  python snapshots.py restore 10K
+  python snapshots.py drop 10K
+"""
+
+import sys
+import time
+
+import psycopg2
+
+# Base de mantenimiento: CREATE/DROP DATABASE no pueden ejecutarse conectados
+# a la base que se copia o se elimina
+MAINTENANCE_DB = 'postgres'
+
+
+class SnapshotManager:
+    def __init__(self, host="localhost", database="final_project",
+                 user="postgres", password="password123", port=5433):
+        self.database = database
+        self.connection_params = {
+            'host': host,
+            'database': MAINTENANCE_DB,
+            'user': user,
+            'password': password,
+            'port': port
+        }
+
+    def _execute(self, *queries):
+        conn = psycopg2.connect(**self.connection_params)
+        conn.autocommit = True
+        cursor = conn.cursor()
+        try:
+            for query, params in queries:
+                cursor.execute(query, params)
+            return cursor.fetchall() if cursor.description else None
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _copy_strategy(self):
+        """Desde PostgreSQL 15 la copia por defecto pasa por el WAL; forzar copia de archivos"""
+        conn = psycopg2.connect(**self.connection_params)
+        version = conn.server_version
+        conn.close()
+        return " STRATEGY = FILE_COPY" if version >= 150000 else ""
+
+    def template_name(self, label):
+        return f"{self.database}_tpl_{label.lower()}"
+
+    def exists(self, name):
+        rows = self._execute(("SELECT 1 FROM pg_database WHERE datname = %s", (name,)))
+        return bool(rows)
+
+    def has_snapshot(self, label):
+        return self.exists(self.template_name(label))
+
+    def list_snapshots(self):
+        rows = self._execute(("""
+            SELECT datname, pg_size_pretty(pg_database_size(datname))
+            FROM pg_database
+            WHERE datistemplate AND datname LIKE %s
+            ORDER BY datname
+        """, (f"{self.database}_tpl_%",)))
+        return rows
+
+    def _copy_database(self, source, target):
+        """DROP + CREATE DATABASE target TEMPLATE source; devuelve los segundos empleados"""
+        start = time.perf_counter()
+        self._execute(
+            (f'DROP DATABASE IF EXISTS "{target}" WITH (FORCE)', None),
+            (f'CREATE DATABASE "{target}" TEMPLATE "{source}"{self._copy_strategy()}', None),
+        )
+        return time.perf_counter() - start
+
+    def save(self, label):
+        """Congelar la base principal como plantilla de la etiqueta (reemplaza la anterior)"""
+        name = self.template_name(label)
+        if self.exists(name):
+            self._execute((f'ALTER DATABASE "{name}" WITH IS_TEMPLATE false', None))
+        seconds = self._copy_database(self.database, name)
+        # Sin conexiones permitidas nadie puede modificar la plantilla por accidente
+        self._execute((f'ALTER DATABASE "{name}" WITH IS_TEMPLATE true ALLOW_CONNECTIONS false', None))
+        print(f"📸 Snapshot {name} creado en {seconds:.2f} s")
+        return name
+
+    def restore(self, label):
+        """Reemplazar la base principal por una copia de la plantilla de la etiqueta"""
+        seconds = self._copy_database(self.template_name(label), self.database)
+        print(f"♻️  {self.database} restaurada desde {self.template_name(label)} en {seconds:.2f} s")
+        return seconds
+
+    def clone(self, target):
+        """Copia prístina de la base principal en target (se reemplaza si existe)"""
+        seconds = self._copy_database(self.database, target)
+        print(f"🧬 Clon {target} creado en {seconds:.2f} s")
+        return seconds
+
+    def create_empty(self, name):
+        """Crear (o reemplazar) una base vacía llamada name"""
+        self._execute((f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)', None),
+                      (f'CREATE DATABASE "{name}"', None))
+
+    def drop(self, name):
+        if self.exists(name):
+            self._execute((f'ALTER DATABASE "{name}" WITH IS_TEMPLATE false', None),
+                          (f'DROP DATABASE "{name}" WITH (FORCE)', None))
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] in ['-h', '--help']:
+        print(__doc__)
+        return
+
+    manager = SnapshotManager()
+    command = sys.argv[1]
+
+    if command == 'list':
+        rows = manager.list_snapshots()
+        if not rows:
+            print("No hay snapshots")
+        for name, size in rows:
+            print(f"  {name:<32} {size}")
+    elif command in ['save', 'restore', 'drop'] and len(sys.argv) > 2:
+        label = sys.argv[2]
+        if command == 'save':
+            manager.save(label)
+        elif command == 'restore':
+            manager.restore(label)
+        else:
+            manager.drop(manager.template_name(label))
+            print(f"🗑️  Snapshot {manager.template_name(label)} eliminado")
+    else:
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main()
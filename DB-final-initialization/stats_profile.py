@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Perfiles de Estadísticas de Producción (--stats-profile)
+Proyecto: Fredys Food Database Performance Analysis
+
+Exporta de una base de datos real solo estadísticas agregadas, nunca filas:
+- tables:  filas de cada tabla
+- columns: pg_stats (null_frac, n_distinct, valores más comunes con sus
+           frecuencias, histograma y correlación) de las columnas de valores
+- fanout:  histograma de filas hijas por clave padre de cada clave foránea
+           (p. ej. cuántos pedidos tienen 1, 2, 3... filas en Tiene)
+
+main.py --stats-profile genera con ese perfil: las cardinalidades se escalan
+a num_registros_base usuarios, las claves foráneas se sesgan con el fan-out
+medido (perfil "empirical" de distributions.py), Tiene y Pertenece toman el
+número de filas por padre del histograma, y las columnas de COLUMNS se
+sortean con la distribución de pg_stats. Si la correlación física de una
+columna es alta, los valores se asignan por posición para conservarla.
+
+Uso: python stats_profile.py export <perfil.json> [base_de_datos]
+     python stats_profile.py compare <perfil.json> [base_de_datos]
+"""
+
+import json
+import sys
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+import psycopg2
+
+from distributions import SkewProfile
+from loader import COLUMN_TYPES
+
+PROFILE_VERSION = 1
+
+# Columnas de valores (no claves) que se generan según el perfil
+COLUMNS = {
+    'Menu': ['fecha'],
+    'Plato': ['tipo', 'categoria'],
+    'Pedido': ['fecha', 'estado', 'hora_salida', 'hora_entrega', 'hora_entrega_estimada'],
+    'Hace': ['calificacion'],
+}
+
+# Clave foránea -> (tabla padre, clave primaria)
+FANOUTS = {
+    'Menu.id_administrador': ('Administrador', 'id_usuario'),
+    'Pertenece.id_menu': ('Menu', 'id_menu'),
+    'Pertenece.id_plato': ('Plato', 'id_plato'),
+    'Pedido.zona_entrega': ('ZonaEntrega', 'nombre'),
+    'Tiene.id_pedido': ('Pedido', 'id_pedido'),
+    'Tiene.id_menu': ('Menu', 'id_menu'),
+    'Hace.id_usuario': ('Usuario', 'id_usuario'),
+}
+# Relación de sesgo (distributions.RELATIONS) -> fan-out que la reproduce
+SKEW_FANOUTS = {
+    'administrador': 'Menu.id_administrador',
+    'plato': 'Pertenece.id_plato',
+    'menu': 'Tiene.id_menu',
+    'usuario': 'Hace.id_usuario',
+    'zona': 'Pedido.zona_entrega',
+}
+# Tabla hija -> fan-out que fija cuántas filas genera cada fila padre
+CHILD_FANOUTS = {'Tiene': 'Tiene.id_pedido', 'Pertenece': 'Pertenece.id_menu'}
+# Tablas cuyo tamaño se escala desde el perfil; las demás salen del fan-out
+SCALED_TABLES = ['Usuario', 'Cliente', 'Trabajador', 'Repartidor', 'Administrador', 'Menu', 'Plato', 'Pedido']
+# Con |correlación| por encima de esto los valores se asignan en orden de id
+CORRELATED = 0.9
+
+_EPOCH = datetime(2000, 1, 1)
+# tipo -> (texto -> valor, valor -> número, número -> valor); sin número: no se interpola
+_CONVERTERS = {
+    'int4': (int, float, lambda x: int(round(x))),
+    'numeric': (float, float, lambda x: round(float(x), 2)),
+    'date': (date.fromisoformat, date.toordinal, lambda x: date.fromordinal(int(x))),
+    'timestamp': (datetime.fromisoformat, lambda v: (v - _EPOCH).total_seconds(),
+                  lambda x: _EPOCH + timedelta(seconds=int(x))),
+    'time': (time.fromisoformat, lambda v: v.hour * 3600 + v.minute * 60 + v.second,
+             lambda x: time(int(x) // 3600 % 24, int(x) // 60 % 60, int(x) % 60)),
+    'text': (str, None, None),
+}
+
+
+# --- Exportación ---
+
+def _column_stats(cursor, table, column):
+    cursor.execute("""
+        SELECT null_frac, n_distinct, most_common_vals::text::text[], most_common_freqs,
+               histogram_bounds::text::text[], correlation
+        FROM pg_stats
+        WHERE schemaname = current_schema() AND tablename = %s AND attname = %s
+    """, (table.lower(), column))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    null_frac, n_distinct, mcv, freqs, bounds, correlation = row
+    return {
+        'null_frac': null_frac,
+        'n_distinct': n_distinct,
+        'most_common_vals': mcv or [],
+        'most_common_freqs': freqs or [],
+        'histogram_bounds': bounds or [],
+        'correlation': correlation,
+    }
+
+
+def _fanout_histogram(cursor, key):
+    child, column = key.split('.')
+    parent, pk = FANOUTS[key]
+    cursor.execute(f"""
+        SELECT hijos, COUNT(*) FROM (
+            SELECT COUNT(h.{column}) AS hijos
+            FROM {parent} p LEFT JOIN {child} h ON h.{column} = p.{pk}
+            GROUP BY p.{pk}
+        ) f
+        GROUP BY hijos ORDER BY hijos
+    """)
+    return [list(row) for row in cursor.fetchall()]
+
+
+def export_profile(cursor):
+    """Perfil de la base de datos del cursor (requiere ANALYZE reciente para pg_stats)"""
+    cursor.execute("SELECT current_database()")
+    profile = {
+        'version': PROFILE_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'database': cursor.fetchone()[0],
+        'tables': {},
+        'columns': {},
+        'fanout': {},
+    }
+    for table in COLUMN_TYPES:
+        cursor.execute(f"SELECT COUNT(*) FROM {table}")
+        profile['tables'][table] = cursor.fetchone()[0]
+    for table, columns in COLUMNS.items():
+        for column in columns:
+            stats = _column_stats(cursor, table, column)
+            if stats is None:
+                print(f"⚠️  Sin pg_stats para {table}.{column} (¿falta ANALYZE?)")
+                continue
+            profile['columns'][f"{table}.{column}"] = stats
+    for key, (parent, _) in FANOUTS.items():
+        profile['fanout'][key] = {'parent': parent, 'histogram': _fanout_histogram(cursor, key)}
+    return profile
+
+
+# --- Generación ---
+
+class FanoutDistribution:
+    """Número de filas hijas por clave padre según el histograma medido"""
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        values, counts = np.array(histogram, dtype=np.float64).reshape(-1, 2).T
+        self.values = values.astype(np.int64)
+        self.cdf = np.cumsum(counts) / counts.sum()
+        self.max = int(self.values.max())
+        self.mean = float(np.dot(values, counts) / counts.sum())
+
+    def sample(self, nrng, count):
+        index = np.searchsorted(self.cdf, nrng.random(count), side='right')
+        return self.values[np.minimum(index, len(self.values) - 1)]
+
+
+class ColumnSampler:
+    """Valores de una columna con la distribución de su entrada de pg_stats"""
+
+    def __init__(self, column_type, stats):
+        parse, self.to_number, self.from_number = _CONVERTERS[column_type]
+        self.null_frac = stats['null_frac'] or 0.0
+        self.correlation = stats['correlation'] or 0.0
+        mcv = [parse(v) for v in stats['most_common_vals']]
+        freqs = np.array(stats['most_common_freqs'], dtype=np.float64)
+        bounds = [parse(v) for v in stats['histogram_bounds']]
+        # Masa del histograma: lo que no es NULL ni valor común, repartido por igual entre cubos
+        rest = max(0.0, 1.0 - self.null_frac - freqs.sum()) if len(bounds) > 1 else 0.0
+        if self.to_number is None:
+            # Texto: valores comunes con su frecuencia y cada límite del histograma como valor
+            self.values = np.array(mcv + bounds, dtype=object)
+            weights = np.concatenate([freqs, np.full(len(bounds), rest / max(len(bounds), 1))])
+            self.cdf = np.cumsum(weights) / weights.sum()
+        else:
+            self._build_inverse(mcv, freqs, bounds, rest)
+
+    def _build_inverse(self, mcv, freqs, bounds, rest):
+        """CDF inversa lineal a trozos: saltos en los valores comunes, rampas en los cubos"""
+        atoms = np.array([self.to_number(v) for v in mcv], dtype=np.float64)
+        edges = np.array([self.to_number(v) for v in bounds], dtype=np.float64)
+        knots = np.unique(np.concatenate([atoms, edges]))
+        if len(edges) > 1:
+            continuous = np.interp(knots, edges, np.linspace(0.0, rest, len(edges)))
+        else:
+            continuous = np.zeros(len(knots))
+        before = np.array([freqs[atoms < k].sum() for k in knots])
+        at = np.array([freqs[atoms == k].sum() for k in knots])
+        # Cada nudo aporta dos puntos (antes y después de su salto) con el mismo valor
+        cdf = np.column_stack([continuous + before, continuous + before + at]).ravel()
+        self.cdf = cdf / cdf[-1] if cdf[-1] > 0 else cdf
+        self.keys = np.repeat(knots, 2)
+
+    def _inverse(self, u):
+        j = np.clip(np.searchsorted(self.cdf, u, side='right') - 1, 0, len(self.cdf) - 2)
+        low, high = self.cdf[j], self.cdf[j + 1]
+        fraction = np.where(high > low, (u - low) / np.maximum(high - low, 1e-12), 0.0)
+        return self.keys[j] + fraction * (self.keys[j + 1] - self.keys[j])
+
+    def sample(self, nrng, count, offset=None, total=None):
+        """count valores; con offset/total y correlación alta, ordenados por posición"""
+        u = nrng.random(count)
+        if offset is not None and abs(self.correlation) >= CORRELATED:
+            u = (offset + np.arange(count) + u) / total
+            if self.correlation < 0:
+                u = 1.0 - u
+        nulls = nrng.random(count) < self.null_frac
+        if self.to_number is None:
+            index = np.minimum(np.searchsorted(self.cdf, u, side='right'), len(self.values) - 1)
+            values = self.values[index].tolist()
+        else:
+            values = [self.from_number(x) for x in self._inverse(u).tolist()]
+        return [None if null else value for value, null in zip(values, nulls.tolist())]
+
+
+class StatsProfile:
+    """Perfil cargado de JSON; se envía a los procesos generadores con los datos compartidos"""
+
+    def __init__(self, profile):
+        if profile.get('version') != PROFILE_VERSION:
+            raise ValueError(f"Versión de perfil no soportada: {profile.get('version')}")
+        self.source = profile.get('database')
+        self.tables = profile['tables']
+        self.columns = {}
+        for key, stats in profile['columns'].items():
+            table, column = key.split('.')
+            if stats['most_common_vals'] or len(stats['histogram_bounds']) > 1:
+                self.columns[key] = ColumnSampler(COLUMN_TYPES[table][column], stats)
+        self.fanout = {key: FanoutDistribution(entry['histogram'])
+                       for key, entry in profile['fanout'].items() if entry['histogram']}
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def counts(self, n):
+        """Filas de SCALED_TABLES para n usuarios, con las proporciones del perfil"""
+        factor = n / max(self.tables['Usuario'], 1)
+        counts = {t: max(1, round(self.tables[t] * factor)) for t in SCALED_TABLES if t in self.tables}
+        # Subtipos: nunca más que su tabla padre
+        for child, parent in [('Cliente', 'Usuario'), ('Trabajador', 'Usuario'),
+                              ('Repartidor', 'Trabajador'), ('Administrador', 'Trabajador')]:
+            if child in counts:
+                counts[child] = min(counts[child], counts.get(parent, n))
+        return counts
+
+    def skew(self):
+        """{relación: perfil empirical} para las claves foráneas con fan-out medido"""
+        return {relation: SkewProfile('empirical', fanout=self.fanout[key].histogram)
+                for relation, key in SKEW_FANOUTS.items() if key in self.fanout}
+
+    def rows_per_parent(self, table):
+        return self.fanout.get(CHILD_FANOUTS.get(table))
+
+    def column(self, table, column):
+        return self.columns.get(f"{table}.{column}")
+
+
+# --- Comparación ---
+
+def compare_profiles(expected, actual):
+    """Mostrar lado a lado un perfil y el de la base generada"""
+    print(f"\n📐 Perfil {expected['database']} frente a {actual['database']}")
+    users = max(expected['tables'].get('Usuario', 1), 1)
+    actual_users = max(actual['tables'].get('Usuario', 1), 1)
+    print(f"  {'Tabla':<16}{'filas/usuario':>16}{'generado':>12}")
+    for table, rows in expected['tables'].items():
+        print(f"  {table:<16}{rows / users:>16.3f}{actual['tables'].get(table, 0) / actual_users:>12.3f}")
+
+    print(f"\n  {'Columna':<30}{'n_distinct':>12}{'generado':>12}{'MCV top':>10}{'generado':>10}")
+    for key, stats in expected['columns'].items():
+        other = actual['columns'].get(key)
+        if other is None:
+            continue
+        top = stats['most_common_freqs'][0] if stats['most_common_freqs'] else 0.0
+        top_other = other['most_common_freqs'][0] if other['most_common_freqs'] else 0.0
+        print(f"  {key:<30}{stats['n_distinct']:>12.3g}{other['n_distinct']:>12.3g}"
+              f"{top:>10.3f}{top_other:>10.3f}")
+
+    print(f"\n  {'Fan-out':<26}{'media':>8}{'generado':>10}{'máx':>8}{'generado':>10}")
+    for key, entry in expected['fanout'].items():
+        other = actual['fanout'].get(key)
+        if not entry['histogram'] or not other or not other['histogram']:
+            continue
+        a, b = FanoutDistribution(entry['histogram']), FanoutDistribution(other['histogram'])
+        print(f"  {key:<26}{a.mean:>8.2f}{b.mean:>10.2f}{a.max:>8}{b.max:>10}")
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ('export', 'compare'):
+        print("Uso: python stats_profile.py export <perfil.json> [base_de_datos]")
+        print("     python stats_profile.py compare <perfil.json> [base_de_datos]")
+        sys.exit(1)
+
+    # main.py importa este módulo: importar sus parámetros solo al usarlo como script
+    from main import DB_PARAMS
+
+    command, path = sys.argv[1], sys.argv[2]
+    params = dict(DB_PARAMS, database=sys.argv[3]) if len(sys.argv) > 3 else DB_PARAMS
+    conn = psycopg2.connect(**params)
+    cur = conn.cursor()
+    profile = export_profile(cur)
+    cur.close()
+    conn.close()
+
+    if command == 'export':
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(profile, f, indent=2, ensure_ascii=False)
+        print(f"📁 Perfil de {profile['database']} guardado en: {path}")
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            compare_profiles(json.load(f), profile)
+
+
+if __name__ == "__main__":
+    main()
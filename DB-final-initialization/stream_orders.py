@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Flujo Continuo de Pedidos a un Ritmo Objetivo (TPS)
+Proyecto: Fredys Food Database Performance Analysis
+
+Simula la operación en vivo sobre una base ya sembrada con main.py. Cada
+transacción es una de dos cosas:
+- un pedido nuevo: Pedido 'Pendiente' + 1 a 3 filas de Tiene + su fila de Hace
+- un avance de estado de un pedido del propio flujo:
+  Pendiente → En preparación → En reparto → Entregado, o Cancelado antes de
+  salir. Al salir se fija hora_salida y al entregarse hora_entrega y la
+  calificación
+
+Varios hilos, cada uno con su conexión, comparten un token bucket que limita
+el ritmo total a --tps transacciones por segundo. Al final (y cada pocos
+segundos) se informa del TPS logrado y de la latencia de commit y de
+transacción (p50/p95/p99). measure_performance.py --stream-tps mide las
+consultas con este flujo activo en segundo plano. Requiere el esquema original
+(zona_entrega y estado como texto), no el de create_schema_compact.sql.
+"""
+
+import argparse
+import random
+import statistics
+import threading
+import time
+from collections import deque
+
+import psycopg2
+from faker import Faker
+
+from compact import is_compact
+from estados import ESTADOS
+
+PENDIENTE, PREPARACION, REPARTO, ENTREGADO, CANCELADO = ESTADOS
+# Transiciones del ciclo de vida: estado -> [(siguiente, probabilidad)]
+LIFECYCLE = {
+    PENDIENTE: [(PREPARACION, 0.95), (CANCELADO, 0.05)],
+    PREPARACION: [(REPARTO, 0.97), (CANCELADO, 0.03)],
+    REPARTO: [(ENTREGADO, 1.0)],
+}
+# Fracción de transacciones que crean un pedido; el resto hace avanzar uno en curso
+NEW_ORDER_SHARE = 0.3
+REPORT_INTERVAL = 5.0
+
+
+class TokenBucket:
+    """Limita el ritmo conjunto de todos los hilos a rate operaciones por segundo"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate / 10)
+        self.tokens = self.capacity
+        self.updated = time.perf_counter()
+        self.lock = threading.Lock()
+
+    def acquire(self, stop):
+        while not stop.is_set():
+            with self.lock:
+                now = time.perf_counter()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            stop.wait(wait)
+        return False
+
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class OrderStream:
+    """Inserta y hace avanzar pedidos desde varias conexiones al ritmo del token bucket"""
+
+    def __init__(self, db_params, tps=50, workers=4, seed=None):
+        self.db_params = db_params
+        self.tps = tps
+        self.workers = workers
+        self.seed = seed
+        self.bucket = TokenBucket(tps)
+        self.stop_event = threading.Event()
+        self.threads = []
+        # Pedidos del flujo que aún no terminaron: estado -> cola de ids
+        self.in_flight = {state: deque() for state in LIFECYCLE}
+        self.lock = threading.Lock()
+        # Por transacción: (fin, tipo, segundos de commit, segundos totales)
+        self.samples = []
+        self.errors = 0
+        self.keys = None
+        self.started = None
+        self.elapsed = 0.0
+
+    def _load_keys(self):
+        conn = psycopg2.connect(**self.db_params)
+        cur = conn.cursor()
+        if is_compact(cur):
+            conn.close()
+            raise RuntimeError("El flujo de pedidos no admite el esquema compacto "
+                               "(create_schema_compact.sql): cree el esquema con create_schema.sql")
+        keys = {}
+        for name, sql in [('zonas', "SELECT nombre FROM ZonaEntrega"),
+                          ('menus', "SELECT id_menu FROM Menu"),
+                          ('usuarios', "SELECT id_usuario FROM Cliente")]:
+            cur.execute(sql)
+            keys[name] = [row[0] for row in cur.fetchall()]
+        cur.close()
+        conn.close()
+        if not all(keys.values()):
+            raise RuntimeError("La base no tiene zonas, menús o clientes: ejecute main.py antes")
+        return keys
+
+    # --- Transacciones ---
+
+    def _new_order(self, cur, rng, fake):
+        cur.execute("""
+            INSERT INTO Pedido (fecha, estado, hora_entrega_estimada, direccion_exacta, zona_entrega)
+            VALUES (LOCALTIMESTAMP, %s, (LOCALTIME + %s * INTERVAL '1 minute')::time, %s, %s)
+            RETURNING id_pedido
+        """, (PENDIENTE, rng.randint(25, 50), fake.address()[:200], rng.choice(self.keys['zonas'])))
+        id_pedido = cur.fetchone()[0]
+        menus = rng.sample(self.keys['menus'], k=min(rng.randint(1, 3), len(self.keys['menus'])))
+        cur.executemany("INSERT INTO Tiene (id_pedido, id_menu) VALUES (%s, %s)",
+                        [(id_pedido, id_menu) for id_menu in menus])
+        cur.execute("INSERT INTO Hace (id_pedido, id_usuario, comentario) VALUES (%s, %s, %s)",
+                    (id_pedido, rng.choice(self.keys['usuarios']), fake.text(max_nb_chars=100)))
+        return PENDIENTE, id_pedido
+
+    def _take_order(self, rng):
+        """Sacar un pedido en curso (de un estado al azar con pedidos); None si no hay"""
+        with self.lock:
+            states = [state for state, queue in self.in_flight.items() if queue]
+            if not states:
+                return None
+            state = rng.choice(states)
+            return state, self.in_flight[state].popleft()
+
+    def _advance(self, cur, rng, state, id_pedido):
+        targets, weights = zip(*LIFECYCLE[state])
+        target = rng.choices(targets, weights)[0]
+        if target == REPARTO:
+            cur.execute("UPDATE Pedido SET estado = %s, hora_salida = LOCALTIME WHERE id_pedido = %s",
+                        (target, id_pedido))
+        elif target == ENTREGADO:
+            cur.execute("UPDATE Pedido SET estado = %s, hora_entrega = LOCALTIME WHERE id_pedido = %s",
+                        (target, id_pedido))
+            cur.execute("UPDATE Hace SET calificacion = %s WHERE id_pedido = %s",
+                        (rng.randint(1, 5), id_pedido))
+        else:
+            cur.execute("UPDATE Pedido SET estado = %s WHERE id_pedido = %s", (target, id_pedido))
+        return target, id_pedido
+
+    def _worker(self, index):
+        rng = random.Random(None if self.seed is None else f"{self.seed}:{index}")
+        fake = Faker()
+        fake.seed_instance(rng.getrandbits(32))
+        conn = psycopg2.connect(**self.db_params)
+        cur = conn.cursor()
+        try:
+            while self.bucket.acquire(self.stop_event):
+                start = time.perf_counter()
+                taken = None if rng.random() < NEW_ORDER_SHARE else self._take_order(rng)
+                try:
+                    if taken is None:
+                        kind = 'nuevo'
+                        state, id_pedido = self._new_order(cur, rng, fake)
+                    else:
+                        kind = 'avance'
+                        state, id_pedido = self._advance(cur, rng, *taken)
+                    commit_start = time.perf_counter()
+                    conn.commit()
+                except psycopg2.Error:
+                    conn.rollback()
+                    with self.lock:
+                        self.errors += 1
+                        if taken is not None:
+                            self.in_flight[taken[0]].append(taken[1])
+                    continue
+                end = time.perf_counter()
+                with self.lock:
+                    if state in self.in_flight:
+                        self.in_flight[state].append(id_pedido)
+                    self.samples.append((end - self.started, kind, end - commit_start, end - start))
+        finally:
+            cur.close()
+            conn.close()
+
+    # --- Control ---
+
+    def start(self):
+        """Arrancar los hilos en segundo plano; stop() los detiene y devuelve el resumen"""
+        self.keys = self._load_keys()
+        self.started = time.perf_counter()
+        self.threads = [threading.Thread(target=self._worker, args=(i,), daemon=True)
+                        for i in range(self.workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        for thread in self.threads:
+            thread.join()
+        self.elapsed = time.perf_counter() - self.started
+        return self.summary()
+
+    def run(self, duration):
+        """Ejecutar durante duration segundos (o hasta Ctrl+C) mostrando el progreso"""
+        self.start()
+        last, last_time = 0, 0.0
+        try:
+            while True:
+                now = time.perf_counter() - self.started
+                if duration and now >= duration:
+                    break
+                time.sleep(min(REPORT_INTERVAL, duration - now) if duration else REPORT_INTERVAL)
+                now = time.perf_counter() - self.started
+                with self.lock:
+                    done = len(self.samples)
+                    pending = sum(len(queue) for queue in self.in_flight.values())
+                print(f"  ⏱️  {now:>7.1f} s  {(done - last) / max(now - last_time, 1e-9):>8.1f} TPS  "
+                      f"{done:>9,} transacciones  {pending:>6,} pedidos en curso")
+                last, last_time = done, now
+        except KeyboardInterrupt:
+            print("\n⚠️  Flujo interrumpido por el usuario")
+        return self.stop()
+
+    def summary(self):
+        with self.lock:
+            samples = list(self.samples)
+        commits = [s[2] * 1000 for s in samples]
+        totals = [s[3] * 1000 for s in samples]
+        kinds = {kind: sum(1 for s in samples if s[1] == kind) for kind in ('nuevo', 'avance')}
+        return {
+            'target_tps': self.tps,
+            'workers': self.workers,
+            'seconds': self.elapsed,
+            'transactions': len(samples),
+            'achieved_tps': len(samples) / self.elapsed if self.elapsed > 0 else 0.0,
+            'new_orders': kinds['nuevo'],
+            'transitions': kinds['avance'],
+            'errors': self.errors,
+            'commit_ms': {'p50': _percentile(commits, 0.5), 'p95': _percentile(commits, 0.95),
+                          'p99': _percentile(commits, 0.99), 'max': max(commits, default=0.0)},
+            'transaction_ms': {'p50': _percentile(totals, 0.5), 'p95': _percentile(totals, 0.95),
+                               'p99': _percentile(totals, 0.99),
+                               'mean': statistics.mean(totals) if totals else 0.0},
+        }
+
+    def report(self, summary=None):
+        summary = summary or self.summary()
+        print(f"\n🚚 Flujo de pedidos ({summary['workers']} conexiones, objetivo {summary['target_tps']} TPS)")
+        print(f"  Transacciones: {summary['transactions']:,} en {summary['seconds']:.1f} s "
+              f"→ {summary['achieved_tps']:.1f} TPS")
+        print(f"  Pedidos nuevos: {summary['new_orders']:,}  avances de estado: {summary['transitions']:,}  "
+              f"errores: {summary['errors']}")
+        c, t = summary['commit_ms'], summary['transaction_ms']
+        print(f"  Commit (ms):      p50 {c['p50']:.2f}  p95 {c['p95']:.2f}  p99 {c['p99']:.2f}  máx {c['max']:.2f}")
+        print(f"  Transacción (ms): p50 {t['p50']:.2f}  p95 {t['p95']:.2f}  p99 {t['p99']:.2f}  "
+              f"media {t['mean']:.2f}")
+
+
+def main():
+    # Solo como script: measure_performance.py usa este módulo sin cargar el generador
+    from main import DB_PARAMS
+
+    parser = argparse.ArgumentParser(description="Flujo continuo de pedidos a un ritmo objetivo")
+    parser.add_argument('--tps', type=float, default=50, help="transacciones por segundo (por defecto: 50)")
+    parser.add_argument('--workers', type=int, default=4, help="conexiones concurrentes (por defecto: 4)")
+    parser.add_argument('--duration', type=float, help="segundos de ejecución (por defecto: hasta Ctrl+C)")
+    parser.add_argument('--seed', type=int, help="semilla de las decisiones de cada conexión")
+    args = parser.parse_args()
+
+    print(f"🎯 FLUJO DE PEDIDOS - {args.tps:g} TPS con {args.workers} conexiones")
+    stream = OrderStream(DB_PARAMS, args.tps, args.workers, args.seed)
+    stream.report(stream.run(args.duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Subconjuntos Consistentes de un Dataset Grande
+Proyecto: Fredys Food Database Performance Analysis
+
+Recorta una base pequeña (1K, 10K...) a partir de una grande sin usar Faker:
+1. En la base origen se sortean N pedidos y se calcula su cierre por claves
+   foráneas (menús de Tiene, platos de Pertenece, usuarios de Hace y
+   administradores de los menús) en el esquema auxiliar "subset"
+2. Se crea la base destino con create_schema.sql
+3. La base destino lee el origen con postgres_fdw y copia cada tabla con
+   INSERT ... SELECT en el servidor; los JOIN contra "subset" se ejecutan
+   en el origen, así que solo viajan las filas elegidas
+
+Todas las claves foráneas de create_schema.sql se siguen cumpliendo.
+
+Uso:
+  python subset.py 1000
+  python subset.py 10000 --target final_project_ci --seed 7
+"""
+
+import argparse
+import time
+
+import psycopg2
+
+from main import ALL_TABLES, DEFAULT_SEED, SERIAL_COLUMNS
+from snapshots import SnapshotManager
+
+# Cierre por claves foráneas, calculado en el origen (una tabla de ids por entidad)
+CLOSURE_SQL = [
+    "DROP SCHEMA IF EXISTS subset CASCADE",
+    "CREATE SCHEMA subset",
+    """CREATE UNLOGGED TABLE subset.pedido AS
+       SELECT id_pedido FROM Pedido ORDER BY md5(%(seed)s || ':' || id_pedido) LIMIT %(n)s""",
+    """CREATE UNLOGGED TABLE subset.menu AS
+       SELECT DISTINCT t.id_menu FROM Tiene t JOIN subset.pedido s USING (id_pedido)""",
+    """CREATE UNLOGGED TABLE subset.plato AS
+       SELECT DISTINCT pe.id_plato FROM Pertenece pe JOIN subset.menu s USING (id_menu)""",
+    """CREATE UNLOGGED TABLE subset.usuario AS
+       SELECT h.id_usuario FROM Hace h JOIN subset.pedido s USING (id_pedido)
+       UNION
+       SELECT m.id_administrador FROM Menu m JOIN subset.menu s USING (id_menu)""",
+    "ALTER TABLE subset.pedido ADD PRIMARY KEY (id_pedido)",
+    "ALTER TABLE subset.menu ADD PRIMARY KEY (id_menu)",
+    "ALTER TABLE subset.plato ADD PRIMARY KEY (id_plato)",
+    "ALTER TABLE subset.usuario ADD PRIMARY KEY (id_usuario)",
+]
+
+# Tabla destino -> (tabla de ids en "subset", columna de unión); None copia la tabla entera.
+# En orden de dependencias para que cada FK encuentre ya su fila padre.
+COPY_PLAN = [
+    ('ZonaEntrega', None),
+    ('Usuario', ('usuario', 'id_usuario')),
+    ('Cliente', ('usuario', 'id_usuario')),
+    ('Trabajador', ('usuario', 'id_usuario')),
+    ('Repartidor', ('usuario', 'id_usuario')),
+    ('Administrador', ('usuario', 'id_usuario')),
+    ('Menu', ('menu', 'id_menu')),
+    ('Plato', ('plato', 'id_plato')),
+    ('Pertenece', ('menu', 'id_menu')),
+    ('Pedido', ('pedido', 'id_pedido')),
+    ('Tiene', ('pedido', 'id_pedido')),
+    ('Hace', ('pedido', 'id_pedido')),
+    ('Vive', ('usuario', 'id_usuario')),
+    ('Cubre', ('usuario', 'id_usuario')),
+]
+
+
+def _connect(params, database):
+    conn = psycopg2.connect(**dict(params, database=database))
+    conn.autocommit = True
+    return conn
+
+
+def build_closure(params, source, n, seed):
+    """Sortear n pedidos en el origen y materializar su cierre en el esquema subset"""
+    conn = _connect(params, source)
+    cursor = conn.cursor()
+    for sql in CLOSURE_SQL:
+        cursor.execute(sql, {'seed': str(seed), 'n': n})
+    cursor.close()
+    conn.close()
+
+
+def drop_closure(params, source):
+    conn = _connect(params, source)
+    conn.cursor().execute("DROP SCHEMA IF EXISTS subset CASCADE")
+    conn.close()
+
+
+def link_source(cursor, params, source):
+    """Exponer en la base destino las tablas del origen (origen.*) y su cierre (origen_subset.*)"""
+    cursor.execute("CREATE EXTENSION IF NOT EXISTS postgres_fdw")
+    cursor.execute("CREATE SERVER origen_srv FOREIGN DATA WRAPPER postgres_fdw "
+                   "OPTIONS (host %s, port %s, dbname %s)",
+                   (params['host'], str(params['port']), source))
+    cursor.execute("CREATE USER MAPPING FOR CURRENT_USER SERVER origen_srv "
+                   "OPTIONS (user %s, password %s)", (params['user'], params['password']))
+    cursor.execute("CREATE SCHEMA origen")
+    cursor.execute("CREATE SCHEMA origen_subset")
+    cursor.execute("IMPORT FOREIGN SCHEMA public FROM SERVER origen_srv INTO origen")
+    cursor.execute("IMPORT FOREIGN SCHEMA subset FROM SERVER origen_srv INTO origen_subset")
+
+
+def unlink_source(cursor):
+    cursor.execute("DROP SCHEMA origen, origen_subset CASCADE")
+    cursor.execute("DROP SERVER origen_srv CASCADE")
+
+
+def copy_subset(cursor):
+    """INSERT ... SELECT de cada tabla; devuelve las filas copiadas por tabla"""
+    counts = {}
+    for table, key in COPY_PLAN:
+        source = f"origen.{table.lower()}"
+        if key is None:
+            cursor.execute(f"INSERT INTO {table} SELECT * FROM {source}")
+        else:
+            ids, column = key
+            cursor.execute(f"INSERT INTO {table} SELECT x.* FROM {source} x "
+                           f"JOIN origen_subset.{ids} s ON s.{column} = x.{column}")
+        counts[table] = cursor.rowcount
+        print(f"  ✅ {table:<14} {cursor.rowcount:>10,} filas")
+    return counts
+
+
+def create_subset(n, target=None, source="final_project", seed=DEFAULT_SEED):
+    manager = SnapshotManager(database=source)
+    params = dict(manager.connection_params)
+    target = target or f"{source}_subset_{n}"
+    start = time.perf_counter()
+
+    print(f"✂️  Sorteando {n:,} pedidos de {source} y calculando su cierre por FKs...")
+    build_closure(params, source, n, seed)
+
+    print(f"🔨 Creando {target} con create_schema.sql...")
+    manager.create_empty(target)
+    conn = _connect(params, target)
+    cursor = conn.cursor()
+    with open('create_schema.sql', 'r', encoding='utf-8') as f:
+        cursor.execute(f.read())
+
+    try:
+        link_source(cursor, params, source)
+        counts = copy_subset(cursor)
+        for table, column in SERIAL_COLUMNS.items():
+            cursor.execute(f"SELECT setval(pg_get_serial_sequence(%s, %s), "
+                           f"COALESCE((SELECT max({column}) FROM {table}), 0) + 1, false)",
+                           (table, column))
+        unlink_source(cursor)
+        cursor.execute("ANALYZE")
+    finally:
+        cursor.close()
+        conn.close()
+        drop_closure(params, source)
+
+    total = sum(counts[t] for t in ALL_TABLES if t in counts)
+    print(f"\n🎉 {target}: {total:,} filas en {time.perf_counter() - start:.2f} s")
+    return target, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recortar un subconjunto consistente por FKs de una base grande")
+    parser.add_argument('pedidos', type=int, help="número de pedidos a sortear")
+    parser.add_argument('--source', default="final_project", help="base origen (por defecto: final_project)")
+    parser.add_argument('--target', help="base destino (por defecto: <origen>_subset_<pedidos>)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                        help=f"semilla del sorteo de pedidos (por defecto: {DEFAULT_SEED})")
+    args = parser.parse_args()
+    create_subset(args.pedidos, args.target, args.source, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Pruebas del Sembrado con Checkpoints
+Proyecto: Fredys Food Database Performance Analysis
+
+Uso: python -m pytest test_checkpoint.py
+"""
+
+from checkpoint import CheckpointLoader, _decode_ids, _encode_ids, discard_run
+
+
+def test_ids_contiguos_se_guardan_como_rango():
+    assert _encode_ids(range(5, 11)) == [5, 10]
+    assert _decode_ids([5, 10]) == range(5, 11)
+
+
+def test_ids_sueltos_se_guardan_como_lista():
+    assert _encode_ids([3, 1, 7]) == {'valores': [3, 1, 7]}
+    assert _decode_ids({'valores': [3, 1, 7]}) == [3, 1, 7]
+
+
+class _Connection:
+    def __init__(self):
+        self.commits = 0
+
+    def commit(self):
+        self.commits += 1
+
+
+class _Cursor:
+    def __init__(self, exists=True):
+        self.connection = _Connection()
+        self.statements = []
+        self.exists = exists
+
+    def execute(self, sql, params=None):
+        self.statements.append(' '.join(sql.split()))
+
+    def fetchone(self):
+        return (self.exists,)
+
+
+class _Loader:
+    def __init__(self):
+        self.cursor = _Cursor()
+        self.stats = {}
+        self.blocks = []
+
+    def insert(self, table, columns, rows):
+        self.blocks.append(list(rows))
+        return len(self.blocks[-1])
+
+
+class _Chunked:
+    """Como los iterables de main.py: bloques desde un índice dado"""
+
+    def __init__(self, blocks):
+        self.blocks = blocks
+
+    def chunks(self, start=0):
+        return iter(self.blocks[start:])
+
+
+def test_cada_bloque_se_confirma_con_su_checkpoint():
+    loader = _Loader()
+    checkpointed = CheckpointLoader(loader, seed=7)
+    assert checkpointed.insert('Pedido', ['id'], _Chunked([[1, 2], [3]])) == 3
+    assert checkpointed.progress['Pedido'] == (2, 3, True)
+    # Un commit por bloque y uno al marcar la tabla completa
+    assert loader.cursor.connection.commits == 3
+
+
+def test_reanudar_salta_los_bloques_confirmados():
+    loader = _Loader()
+    checkpointed = CheckpointLoader(loader, seed=7)
+    checkpointed.progress = {'Pedido': (1, 2, False), 'Usuario': (1, 4, True)}
+    assert checkpointed.insert('Usuario', ['id'], _Chunked([[1, 2, 3, 4]])) == 0
+    assert checkpointed.insert('Pedido', ['id'], _Chunked([[1, 2], [3]])) == 1
+    assert loader.blocks == [[3]]
+    assert checkpointed.progress['Pedido'] == (2, 3, True)
+    assert checkpointed.resumed == {'Pedido': 1}
+
+
+def test_lista_materializada_completa_no_se_repite():
+    loader = _Loader()
+    checkpointed = CheckpointLoader(loader, seed=7)
+    checkpointed.progress = {'ZonaEntrega': (1, 5, False)}
+    assert checkpointed.insert('ZonaEntrega', ['nombre'], ['a', 'b']) == 0
+    assert loader.blocks == []
+
+
+def test_discard_run_borra_la_carga_anterior():
+    cursor = _Cursor()
+    discard_run(cursor)
+    assert cursor.statements[1:] == ["DELETE FROM seed_checkpoint", "DELETE FROM seed_run"]
+
+
+def test_discard_run_sin_tablas_de_control():
+    cursor = _Cursor(exists=False)
+    discard_run(cursor)
+    assert len(cursor.statements) == 1
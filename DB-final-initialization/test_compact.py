@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Pruebas del Esquema Compacto
+Proyecto: Fredys Food Database Performance Analysis
+
+Uso: python -m pytest test_compact.py
+"""
+
+from compact import COMPACT_TABLES, ESTADO_CODES, compact_ddl, compact_index
+from estados import ESTADOS
+
+
+def test_codigos_de_estado_por_posicion():
+    assert [ESTADO_CODES[estado] for estado in ESTADOS] == list(range(len(ESTADOS)))
+
+
+def test_compact_index_usa_id_zona_y_codigos_de_estado():
+    sql = ("CREATE INDEX idx_pedido_fecha_estado_zona ON Pedido(fecha DESC, estado, zona_entrega) "
+           "WHERE estado = 'Entregado'")
+    assert compact_index(sql) == ("CREATE INDEX idx_pedido_fecha_estado_zona ON Pedido(fecha DESC, estado, id_zona) "
+                                  f"WHERE estado = {ESTADO_CODES['Entregado']}")
+
+
+def test_compact_index_con_varios_estados_y_esquema():
+    sql = ("CREATE INDEX idx_pedido_zona_estado ON Pedido(zona_entrega, estado) "
+           "WHERE estado IN ('Entregado', 'En reparto')")
+    assert compact_index(sql, 'bench') == ("CREATE INDEX idx_pedido_zona_estado ON bench.Pedido(id_zona, estado) "
+                                           "WHERE estado IN (3, 2)")
+
+
+def test_compact_index_de_zona_entrega_por_nombre():
+    sql = "CREATE INDEX idx_zona_entrega_nombre_costo ON ZonaEntrega(nombre, costo)"
+    assert compact_index(sql) == "CREATE INDEX idx_zona_entrega_nombre_costo ON ZonaEntrega(id_zona, costo)"
+
+
+def test_compact_index_ignora_las_tablas_sin_cambios():
+    assert compact_index("CREATE INDEX idx_hace_pedido ON Hace(id_pedido, calificacion)") is None
+    assert compact_index("CREATE INDEX idx_usuario ON Usuario(id_usuario)") is None
+
+
+def test_compact_ddl_toma_las_tablas_del_script():
+    statements = compact_ddl('bench')
+    created = [s.split()[2] for s in statements if s.startswith('CREATE TABLE')]
+    assert sorted(created) == sorted(f"bench.{t}" for t in ['EstadoPedido', *COMPACT_TABLES])
+    # Dependencias antes que las tablas que las referencian
+    assert created.index('bench.ZonaEntrega') < created.index('bench.Pedido')
+    assert created.index('bench.EstadoPedido') < created.index('bench.Pedido')
+    pedido = next(s for s in statements if s.startswith('CREATE TABLE bench.Pedido'))
+    assert 'REFERENCES bench.ZonaEntrega(id_zona)' in pedido
+    assert 'REFERENCES bench.EstadoPedido(codigo)' in pedido
+    cubre = next(s for s in statements if s.startswith('CREATE TABLE bench.Cubre'))
+    assert 'REFERENCES Repartidor(id_usuario)' in cubre
+    assert "CREATE INDEX idx_pedido_fecha ON bench.Pedido(fecha)" in statements
+    assert not any('Usuario(nombre' in s for s in statements)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Pruebas del Planificador de Carga por el DAG de Claves Foráneas
+Proyecto: Fredys Food Database Performance Analysis
+
+Uso: python -m pytest test_dag_loader.py
+"""
+
+import threading
+
+import pytest
+
+import dag_loader
+from dag_loader import DagScheduler, parse_dependencies
+
+
+def test_parse_dependencies_del_esquema():
+    dependencies = parse_dependencies()
+    assert dependencies['Usuario'] == set()
+    assert dependencies['ZonaEntrega'] == set()
+    assert dependencies['Cliente'] == {'Usuario'}
+    assert dependencies['Pedido'] == {'ZonaEntrega'}
+    assert dependencies['Tiene'] == {'Pedido', 'Menu'}
+    assert dependencies['Cubre'] == {'ZonaEntrega', 'Repartidor'}
+
+
+def test_parse_dependencies_ignora_autorreferencias(tmp_path):
+    schema = tmp_path / 'schema.sql'
+    schema.write_text("CREATE TABLE A (\n    id INT PRIMARY KEY\n);\n"
+                      "CREATE TABLE B (\n    id INT REFERENCES A(id),\n"
+                      "    padre INT REFERENCES B (id)\n);\n", encoding='utf-8')
+    assert parse_dependencies(str(schema)) == {'A': set(), 'B': {'A'}}
+
+
+def test_critical_path_sigue_la_cadena_mas_larga():
+    scheduler = DagScheduler({}, 2, {'A': set(), 'B': {'A'}, 'C': set(), 'D': {'B', 'C'}})
+    scheduler.timeline = {'A': (0.0, 1.0), 'C': (0.0, 2.5), 'B': (1.0, 2.0), 'D': (2.5, 3.0)}
+    chain, length = scheduler.critical_path()
+    assert chain == ['C', 'D']
+    assert length == pytest.approx(3.0)
+
+
+class _FakePool:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def closeall(self):
+        pass
+
+
+class _FakeLoader:
+    def __init__(self):
+        self.stats = {}
+
+
+def test_run_respeta_las_dependencias(monkeypatch):
+    monkeypatch.setattr(dag_loader, 'ThreadedConnectionPool', _FakePool)
+    order = []
+    lock = threading.Lock()
+
+    def load(self, pool, table, step, loader, gen, plan):
+        with lock:
+            order.append(table)
+        return {table: {'rows': 1}}
+
+    monkeypatch.setattr(DagScheduler, '_load_table', load)
+    dependencies = {'Usuario': set(), 'Cliente': {'Usuario'}, 'Pedido': {'ZonaEntrega'},
+                    'ZonaEntrega': set(), 'Hace': {'Pedido', 'Cliente'}}
+    steps = {table: None for table in ['Usuario', 'Cliente', 'ZonaEntrega', 'Pedido', 'Hace']}
+    loader = _FakeLoader()
+    DagScheduler({}, 3, dependencies).run(steps, loader, None, None)
+    assert sorted(order) == sorted(steps)
+    for table, parents in dependencies.items():
+        assert all(order.index(parent) < order.index(table) for parent in parents)
+    assert set(loader.stats) == set(steps)
+
+
+def test_run_detecta_dependencias_circulares(monkeypatch):
+    monkeypatch.setattr(dag_loader, 'ThreadedConnectionPool', _FakePool)
+    with pytest.raises(ValueError):
+        DagScheduler({}, 2, {'A': {'B'}, 'B': {'A'}}).run({'A': None, 'B': None}, _FakeLoader(), None, None)
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Pruebas de los Perfiles de Sesgo y los Sorteos sin Repetición
+Proyecto: Fredys Food Database Performance Analysis
+
+Uso: python -m pytest test_distributions.py
+"""
+
+import numpy as np
+import pytest
+
+from distributions import parse_profile
+from value_pools import distinct_draws
+
+
+@pytest.mark.parametrize('spec', ['hotset:0', 'hotset:150', 'hotset:-5', 'hotset:10:101',
+                                  'hotset:10:-1', 'zipf:0', 'zipf:-1', 'zipf:abc'])
+def test_parse_profile_rechaza_parametros_fuera_de_rango(spec):
+    with pytest.raises(ValueError):
+        parse_profile(spec)
+
+
+def test_distinct_draws_termina_con_hotset_degenerado():
+    # El 1% de 100 claves es una sola clave caliente que recibe todas las elecciones
+    rng = np.random.default_rng(0)
+    idx = distinct_draws(rng, 100, 5, 3, parse_profile('hotset:1:100'))
+    assert idx.shape == (5, 3)
+    assert all(len(set(row)) == 3 for row in idx.tolist())
+    assert idx.min() >= 0 and idx.max() < 100
+
+
+def test_distinct_draws_termina_con_zipf_extremo():
+    rng = np.random.default_rng(0)
+    idx = distinct_draws(rng, 10, 1000, 4, parse_profile('zipf:50'))
+    assert all(len(set(row)) == 4 for row in idx.tolist())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Pruebas del Historial de Pedidos con Estacionalidad
+Proyecto: Fredys Food Database Performance Analysis
+
+Uso: python -m pytest test_history.py
+"""
+
+from datetime import date
+
+import numpy as np
+
+import history
+
+TODAY = date(2025, 6, 2)
+
+
+def test_hourly_cdf_es_creciente_y_termina_en_uno():
+    cdf = history.hourly_cdf(14, TODAY)
+    assert len(cdf) == 14 * 24
+    assert np.all(np.diff(cdf) > 0)
+    assert cdf[-1] == 1.0
+
+
+def test_order_timestamps_ordenadas_dentro_del_periodo():
+    rng = np.random.default_rng(1)
+    stamps = history.order_timestamps(rng, 30, TODAY, 0, 1000, 1000)
+    assert np.all(np.diff(stamps.astype(np.int64)) >= 0)
+    assert stamps[0] >= np.datetime64('2025-05-03T00:00:00')
+    assert stamps[-1] < np.datetime64('2025-06-02T00:00:00')
+
+
+def test_order_timestamps_bloques_consecutivos_siguen_ordenados():
+    first = history.order_timestamps(np.random.default_rng(1), 30, TODAY, 0, 500, 1000)
+    second = history.order_timestamps(np.random.default_rng(2), 30, TODAY, 500, 500, 1000)
+    assert first[-1] <= second[0]
+
+
+def test_order_timestamps_siguen_la_estacionalidad():
+    stamps = history.order_timestamps(np.random.default_rng(3), 28, TODAY, 0, 20000, 20000)
+    hours = stamps.astype('datetime64[h]').astype(np.int64) % 24
+    counts = np.bincount(hours, minlength=24)
+    # Pico de cena frente a la madrugada
+    assert counts[20] > 10 * counts[3]
+
+
+def test_delivery_horas_coherentes_con_el_estado():
+    rng = np.random.default_rng(4)
+    fechas = history.order_timestamps(rng, 10, TODAY, 0, 5000, 5000)
+    estados, salida, entrega, estimada = history.delivery(rng, fechas, TODAY)
+    estados = np.array(estados)
+    assert set(estados) <= {'Pendiente', 'En preparación', 'En reparto', 'Entregado', 'Cancelado'}
+    assert np.all(salida[np.isin(estados, ['Pendiente', 'En preparación', 'Cancelado'])] == -1)
+    assert np.all(entrega[estados != 'Entregado'] == -1)
+    delivered = estados == 'Entregado'
+    assert delivered.any() and np.all(salida[delivered] >= 0) and np.all(entrega[delivered] >= 0)
+    assert np.all((estimada >= 0) & (estimada < 86400))
+
+
+def test_delivery_los_pedidos_viejos_estan_cerrados():
+    rng = np.random.default_rng(5)
+    fechas = np.array(['2025-05-01T12:00:00'] * 200, dtype='datetime64[s]')
+    estados, *_ = history.delivery(rng, fechas, TODAY)
+    assert set(estados) <= {'Entregado', 'Cancelado'}
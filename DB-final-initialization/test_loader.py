@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la Codificación COPY del Loader Masivo
+Proyecto: Fredys Food Database Performance Analysis
+
+Uso: python -m pytest test_loader.py
+"""
+
+import struct
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from loader import _StreamingFile, _batches, _encode_numeric, encode_binary_rows, encode_text_rows
+
+
+def _numeric(ndigits, weight, sign, dscale, *digits):
+    return struct.pack(f'!hhHH{len(digits)}H', ndigits, weight, sign, dscale, *digits)
+
+
+def test_encode_numeric_base_10000():
+    assert _encode_numeric(Decimal('12.50')) == _numeric(2, 0, 0x0000, 2, 12, 5000)
+    assert _encode_numeric(10000) == _numeric(1, 1, 0x0000, 0, 1)
+    assert _encode_numeric(Decimal('-1.5')) == _numeric(2, 0, 0x4000, 1, 1, 5000)
+    assert _encode_numeric(Decimal('0.0001')) == _numeric(1, -1, 0x0000, 4, 1)
+    assert _encode_numeric(0) == _numeric(0, 0, 0x0000, 0)
+
+
+def test_encode_text_rows_escapa_y_marca_nulos():
+    data = encode_text_rows([(1, 'a\tb', None), (2, 'línea\nbarra\\', 3.5)])
+    assert data == '1\ta\\tb\t\\N\n2\tlínea\\nbarra\\\\\t3.5\n'.encode('utf-8')
+
+
+def test_encode_binary_rows():
+    row = (7, 'ñ', None, date(2000, 1, 2), datetime(2000, 1, 1, 0, 0, 1), '00:01:00')
+    data = encode_binary_rows([row], ['int4', 'text', 'int4', 'date', 'timestamp', 'time'])
+    expected = (struct.pack('!h', 6)
+                + struct.pack('!ii', 4, 7)
+                + struct.pack('!i', 2) + 'ñ'.encode('utf-8')
+                + b'\xff\xff\xff\xff'
+                + struct.pack('!ii', 4, 1)
+                + struct.pack('!iq', 8, 1000000)
+                + struct.pack('!iq', 8, 60000000))
+    assert data == expected
+
+
+def test_encode_binary_rows_acepta_time():
+    data = encode_binary_rows([(time(1, 0, 0, 5),)], ['time'])
+    assert data == struct.pack('!hiq', 1, 8, 3600000005)
+
+
+def test_streaming_file_lee_por_tamano():
+    stream = _StreamingFile([b'abc', b'de', b'f'])
+    assert stream.read(4) == b'abcd'
+    assert stream.read(-1) == b'ef'
+    assert stream.read(4) == b''
+    assert stream.bytes_read == 6
+
+
+def test_batches():
+    assert list(_batches(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(_batches([], 3)) == []
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Pruebas del Particionado Mensual de Pedido
+Proyecto: Fredys Food Database Performance Analysis
+
+Uso: python -m pytest test_partitions.py
+"""
+
+from datetime import date
+
+from partitions import (add_months, default_partition, detach_partitions, ensure_partitions,
+                        month_start, partition_name)
+
+
+def test_month_start_lleva_al_primer_dia():
+    assert month_start(date(2024, 2, 29)) == date(2024, 2, 1)
+    assert month_start(date(2024, 2, 1)) == date(2024, 2, 1)
+
+
+def test_add_months_cruza_el_cambio_de_anio():
+    assert add_months(date(2024, 11, 1), 1) == date(2024, 12, 1)
+    assert add_months(date(2024, 12, 1), 1) == date(2025, 1, 1)
+    assert add_months(date(2024, 12, 1), 14) == date(2026, 2, 1)
+
+
+def test_add_months_hacia_atras():
+    assert add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+    assert add_months(date(2024, 3, 1), -15) == date(2022, 12, 1)
+
+
+def test_nombres_de_particion():
+    assert partition_name(date(2024, 3, 1)) == 'pedido_2024_03'
+    assert partition_name(date(2024, 3, 1), 'bench.Pedido') == 'bench.pedido_2024_03'
+    assert default_partition() == 'pedido_default'
+
+
+class _Cursor:
+    """Cursor falso: list_partitions devuelve partitions y DEFAULT no existe"""
+
+    def __init__(self, partitions):
+        self.partitions = partitions
+        self.statements = []
+
+    def execute(self, sql, params=None):
+        self.statements.append(' '.join(sql.split()))
+
+    def fetchall(self):
+        return self.partitions
+
+    def fetchone(self):
+        return (False,)
+
+
+def _bound(lower, upper):
+    return f"FOR VALUES FROM ('{lower} 00:00:00') TO ('{upper} 00:00:00')"
+
+
+def test_ensure_partitions_crea_solo_los_meses_que_faltan():
+    cur = _Cursor([('pedido_2024_12', _bound('2024-12-01', '2025-01-01'), 10)])
+    created = ensure_partitions(cur, date(2024, 11, 15), date(2024, 12, 20), ahead=1)
+    assert created == ['pedido_2024_11', 'pedido_2025_01']
+    creates = [s for s in cur.statements if s.startswith('CREATE TABLE')]
+    assert creates[-1] == ("CREATE TABLE pedido_2025_01 PARTITION OF Pedido "
+                           "FOR VALUES FROM ('2025-01-01') TO ('2025-02-01')")
+
+
+def test_detach_partitions_conserva_los_meses_recientes():
+    cur = _Cursor([('pedido_2024_01', _bound('2024-01-01', '2024-02-01'), 5),
+                   ('pedido_2024_02', _bound('2024-02-01', '2024-03-01'), 5),
+                   ('pedido_default', 'DEFAULT', 0)])
+    detached = detach_partitions(cur, keep_months=1, today=date(2024, 3, 10), drop=True)
+    assert detached == ['pedido_2024_01']
+    assert cur.statements[-1] == 'DROP TABLE pedido_2024_01'
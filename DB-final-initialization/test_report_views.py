@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Pruebas de las Vistas Materializadas de los Reportes
+Proyecto: Fredys Food Database Performance Analysis
+
+Uso: python -m pytest test_report_views.py
+"""
+
+import pytest
+
+import report_views
+from measure_performance import DatabasePerformanceTester
+from report_views import VIEW_KEYS, split_query, view_definitions, view_name
+
+
+def test_split_query_separa_el_order_by_final():
+    body, order = split_query("""
+        SELECT c.zona_entrega, COUNT(*) AS total
+        FROM Cliente c
+        GROUP BY c.zona_entrega
+        ORDER BY total DESC, c.zona_entrega
+        LIMIT 10;
+    """)
+    assert body.strip().endswith('GROUP BY c.zona_entrega')
+    assert 'ORDER BY' not in body
+    assert order == 'total DESC, zona_entrega LIMIT 10'
+
+
+def test_split_query_conserva_los_order_by_internos():
+    body, order = split_query("SELECT x, ROW_NUMBER() OVER (ORDER BY y) AS r FROM t ORDER BY r")
+    assert 'OVER (ORDER BY y)' in body
+    assert order == 'r'
+
+
+def test_view_definitions_de_las_consultas_experimentales():
+    definitions = view_definitions(DatabasePerformanceTester().get_query_definitions())
+    assert set(definitions) == set(VIEW_KEYS)
+    for query_id, definition in definitions.items():
+        view = view_name(query_id)
+        create, index = definition['create']
+        assert create.startswith(f"CREATE MATERIALIZED VIEW {view} AS SELECT")
+        # La vista guarda todos los grupos: sin ORDER BY ni LIMIT finales
+        assert 'LIMIT' not in create
+        assert index == f"CREATE UNIQUE INDEX {view}_key ON {view} ({', '.join(VIEW_KEYS[query_id][1])})"
+        assert definition['read'].startswith(f"SELECT * FROM {view} ORDER BY ")
+
+
+def test_view_definitions_agrega_las_claves_solo_al_primer_select():
+    queries = {query_id: {'sql': "SELECT a FROM (SELECT b FROM t) s ORDER BY a"} for query_id in VIEW_KEYS}
+    create = view_definitions(queries)['consulta_3']['create'][0]
+    assert create.count('u.id_usuario AS id_repartidor') == 1
+    assert 'AS SELECT u.id_usuario AS id_repartidor, a FROM (SELECT b FROM t)' in create
+
+
+class _Cursor:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, sql, params=None):
+        self.statements.append(' '.join(sql.split()))
+
+    def fetchone(self):
+        return (None, 0)
+
+    def close(self):
+        pass
+
+
+class _Connection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.autocommit = False
+
+    def cursor(self):
+        return self._cursor
+
+    def close(self):
+        pass
+
+
+class _Scheduler:
+    def __init__(self, db_params, interval):
+        pass
+
+    def start(self):
+        pass
+
+    def stop(self):
+        return {'views': {}}
+
+
+def test_benchmark_views_elimina_las_vistas_aunque_falle(monkeypatch):
+    cur = _Cursor()
+    monkeypatch.setattr(report_views.psycopg2, 'connect', lambda **params: _Connection(cur))
+    monkeypatch.setattr(report_views, 'RefreshScheduler', _Scheduler)
+
+    def fail(cursor, sql):
+        raise RuntimeError("fallo de medición")
+
+    monkeypatch.setattr(report_views, '_execution_ms', fail)
+    queries = {query_id: {'sql': "SELECT a FROM t ORDER BY a", 'name': query_id} for query_id in VIEW_KEYS}
+    with pytest.raises(RuntimeError):
+        report_views.benchmark_views({}, queries)
+    assert cur.statements[-1] == f"DROP TABLE IF EXISTS {report_views.STATE_TABLE}"
+    for query_id in VIEW_KEYS:
+        assert f"DROP MATERIALIZED VIEW IF EXISTS {view_name(query_id)}" in cur.statements[-5:]
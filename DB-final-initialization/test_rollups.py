@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Pruebas de los Rollups Diarios Mantenidos por Triggers
+Proyecto: Fredys Food Database Performance Analysis
+
+Uso: python -m pytest test_rollups.py
+"""
+
+from rollups import (EVENTS, ROLLUPS, TABLE_KEYS, _rebuild_sql, _recompute_days_sql, _sources,
+                     trigger_statements)
+
+
+def _compact(sql):
+    return ' '.join(sql.split())
+
+
+def test_trigger_statements_crea_un_trigger_por_evento():
+    for table in TABLE_KEYS:
+        statements = [_compact(s) for s in trigger_statements(table)]
+        assert len(statements) == 3 * len(EVENTS)
+        triggers = [s for s in statements if s.startswith('CREATE TRIGGER')]
+        for event, trigger in zip(EVENTS, triggers):
+            function = f"rollup_{table.lower()}_{event.lower()}"
+            assert trigger.startswith(f"CREATE TRIGGER {function} AFTER {event} ON {table} ")
+            assert trigger.endswith(f"FOR EACH STATEMENT EXECUTE FUNCTION {function}()")
+
+
+def test_trigger_statements_usa_las_tablas_de_transicion():
+    triggers = {s.split()[4]: _compact(s) for s in trigger_statements('Pedido') if s.startswith('CREATE TRIGGER')}
+    assert 'REFERENCING NEW TABLE AS nuevos FOR EACH' in triggers['INSERT']
+    assert 'REFERENCING OLD TABLE AS viejos NEW TABLE AS nuevos FOR EACH' in triggers['UPDATE']
+    assert 'REFERENCING OLD TABLE AS viejos FOR EACH' in triggers['DELETE']
+    assert 'REFERENCING' not in triggers['TRUNCATE']
+
+
+def test_trigger_de_delete_recalcula_los_dias():
+    functions = [_compact(s) for s in trigger_statements('Hace') if s.startswith('CREATE OR REPLACE')]
+    delete = next(f for f in functions if 'rollup_hace_delete()' in f)
+    assert 'DECLARE dias date[] := ARRAY(SELECT DISTINCT pd.fecha::date FROM Pedido pd' in delete
+    # Solo los rollups que dependen de Hace
+    for name, rollup in ROLLUPS.items():
+        assert (f"DELETE FROM {name} WHERE dia = ANY(dias)" in delete) == ('Hace' in rollup['tables'])
+
+
+def test_recalculo_de_dias_reemplaza_las_claves_existentes():
+    rollup = ROLLUPS['rollup_zona_dia']
+    sql = _compact(_recompute_days_sql('rollup_zona_dia', rollup))
+    assert "FROM (SELECT * FROM Pedido WHERE fecha::date = ANY(dias)) pd" in sql
+    assert sql.endswith("ON CONFLICT (dia, zona_entrega) DO UPDATE SET pedidos = EXCLUDED.pedidos, "
+                        "entregados = EXCLUDED.entregados, minutos_entrega = EXCLUDED.minutos_entrega, "
+                        "minutos_desvio = EXCLUDED.minutos_desvio")
+    # La reconstrucción completa parte de tablas vacías y no lo necesita
+    assert 'ON CONFLICT' not in _rebuild_sql('rollup_zona_dia', rollup, {t: t for t in TABLE_KEYS})
+
+
+def test_sources_antes_de_la_sentencia():
+    before, after = _sources('Tiene', update=False)
+    assert after['Tiene'] == "(SELECT * FROM Tiene WHERE id_pedido IN (SELECT id_pedido FROM nuevos))"
+    assert before['Pedido'] == after['Pedido']
+    assert "(id_pedido, id_menu) NOT IN (SELECT id_pedido, id_menu FROM nuevos))" in before['Tiene']
+    before, _ = _sources('Tiene', update=True)
+    assert before['Tiene'].endswith(" UNION ALL SELECT * FROM viejos)")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Pruebas de los Muestreadores del Perfil de Estadísticas
+Proyecto: Fredys Food Database Performance Analysis
+
+Uso: python -m pytest test_stats_profile.py
+"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from stats_profile import PROFILE_VERSION, ColumnSampler, FanoutDistribution, StatsProfile
+
+
+def _stats(mcv=(), freqs=(), bounds=(), null_frac=0.0, correlation=0.0):
+    return {'null_frac': null_frac, 'correlation': correlation, 'most_common_vals': list(mcv),
+            'most_common_freqs': list(freqs), 'histogram_bounds': list(bounds)}
+
+
+def test_fanout_reproduce_el_histograma():
+    fanout = FanoutDistribution([[1, 60], [2, 30], [5, 10]])
+    assert fanout.max == 5
+    assert fanout.mean == pytest.approx(1.7)
+    sample = fanout.sample(np.random.default_rng(0), 20000)
+    assert set(np.unique(sample)) == {1, 2, 5}
+    assert np.mean(sample == 1) == pytest.approx(0.6, abs=0.02)
+
+
+def test_texto_respeta_valores_comunes_y_nulos():
+    sampler = ColumnSampler('text', _stats(['Entregado', 'Cancelado'], [0.7, 0.2], null_frac=0.1))
+    values = sampler.sample(np.random.default_rng(1), 20000)
+    assert values.count('Entregado') / len(values) == pytest.approx(0.7, abs=0.02)
+    assert values.count(None) / len(values) == pytest.approx(0.1, abs=0.01)
+    assert set(values) == {'Entregado', 'Cancelado', None}
+
+
+def test_numeros_dentro_del_histograma():
+    sampler = ColumnSampler('int4', _stats(bounds=[1, 2, 3, 4, 5]))
+    values = sampler.sample(np.random.default_rng(2), 5000)
+    assert min(values) >= 1 and max(values) <= 5
+    assert all(isinstance(v, int) for v in values)
+
+
+def test_valor_comun_numerico_es_un_salto():
+    sampler = ColumnSampler('int4', _stats([5], [0.5], bounds=[1, 10]))
+    values = np.array(sampler.sample(np.random.default_rng(3), 20000))
+    assert np.mean(values == 5) > 0.5
+
+
+def test_correlacion_alta_asigna_por_posicion():
+    sampler = ColumnSampler('date', _stats(bounds=['2025-01-01', '2025-12-31'], correlation=0.99))
+    rng = np.random.default_rng(4)
+    first = sampler.sample(rng, 100, offset=0, total=200)
+    second = sampler.sample(rng, 100, offset=100, total=200)
+    values = first + second
+    assert values == sorted(values)
+    assert date(2025, 1, 1) <= values[0] and values[-1] <= date(2025, 12, 31)
+
+
+def _profile():
+    return {
+        'version': PROFILE_VERSION,
+        'database': 'produccion',
+        'tables': {'Usuario': 1000, 'Cliente': 800, 'Trabajador': 300, 'Repartidor': 400,
+                   'Administrador': 20, 'Pedido': 5000},
+        'columns': {'Hace.calificacion': _stats(bounds=[1, 3, 5]),
+                    'Plato.tipo': _stats()},
+        'fanout': {'Tiene.id_pedido': {'histogram': [[1, 5], [2, 5]]},
+                   'Hace.id_usuario': {'histogram': [[0, 10], [3, 90]]},
+                   'Menu.id_administrador': {'histogram': []}},
+    }
+
+
+def test_stats_profile_escala_y_limita_subtipos():
+    profile = StatsProfile(_profile())
+    counts = profile.counts(100)
+    assert counts['Usuario'] == 100 and counts['Pedido'] == 500
+    # 40 repartidores no caben en 30 trabajadores
+    assert counts['Repartidor'] == counts['Trabajador'] == 30
+    assert profile.column('Hace', 'calificacion') is not None
+    assert profile.column('Plato', 'tipo') is None
+    assert profile.rows_per_parent('Tiene').mean == pytest.approx(1.5)
+    assert set(profile.skew()) == {'usuario'}
+
+
+def test_stats_profile_rechaza_otra_version():
+    with pytest.raises(ValueError):
+        StatsProfile(dict(_profile(), version=PROFILE_VERSION + 1))
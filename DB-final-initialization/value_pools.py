@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Vocabularios de Valores para la Generación Rápida (--fast-faker)
+Proyecto: Fredys Food Database Performance Analysis
+
+Construye una vez, con Faker, un vocabulario acotado por columna (nombres,
+empresas, platos, direcciones, comentarios...) y lo guarda en disco por
+semilla. La generación rápida de main.py sortea índices sobre estos arrays
+con NumPy en lugar de llamar a Faker fila por fila.
+"""
+
+import os
+import random
+
+import numpy as np
+
+# Subir la versión invalida los vocabularios guardados en disco
+POOL_VERSION = 1
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.pool_cache')
+# Re-sorteos con el perfil antes de completar sin reemplazo las filas repetidas
+DISTINCT_RETRIES = 50
+
+# Columna -> (tamaño del vocabulario, función que genera un valor con Faker)
+POOL_SPECS = {
+    'nombre': (3000, lambda f: f.first_name()[:20]),
+    'apellido': (3000, lambda f: f.last_name()[:25]),
+    'telefono': (20000, lambda f: f.phone_number()[:30]),
+    'empresa': (5000, lambda f: f.company()[:50]),
+    'correo': (20000, lambda f: f.email()[:50]),
+    'variacion': (1000, lambda f: f.word()[:50]),
+    'plato': (2000, lambda f: f.dish()),
+    'foto': (5000, lambda f: f.image_url()),
+    'codigo_nutricional': (50000, lambda f: f.uuid4()[:36]),
+    'direccion': (20000, lambda f: f.address()[:200]),
+    'comentario': (10000, lambda f: f.text(max_nb_chars=100)),
+}
+
+
+def _cache_path(seed):
+    return os.path.join(CACHE_DIR, f"pools_seed{seed}_v{POOL_VERSION}.npz")
+
+
+def build_pools(fake, seed):
+    """Generar con Faker todos los vocabularios para una semilla"""
+    pools = {}
+    for i, (column, (size, make)) in enumerate(sorted(POOL_SPECS.items())):
+        fake.seed_instance(seed * 1000 + i)
+        # faker_food elige con el módulo random global
+        random.seed(seed * 1000 + i)
+        pools[column] = np.array([make(fake) for _ in range(size)])
+    return pools
+
+
+def load_pools(fake, seed):
+    """Cargar los vocabularios de la semilla desde disco, generándolos si no existen"""
+    path = _cache_path(seed)
+    if os.path.exists(path):
+        with np.load(path) as data:
+            return {column: data[column] for column in data.files}
+
+    print(f"Construyendo vocabularios para --fast-faker (semilla {seed})...")
+    pools = build_pools(fake, seed)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    np.savez_compressed(path, **pools)
+    return pools
+
+
+def _indices(nrng, population, size, profile):
+    if profile is None:
+        return nrng.integers(0, population, size=size)
+    return profile.sample(nrng, population, size)
+
+
+def draw(nrng, pool, count, profile=None):
+    """Sortear count valores de un vocabulario como lista de Python (profile: sesgo opcional)"""
+    return pool[_indices(nrng, len(pool), count, profile)].tolist()
+
+
+def distinct_draws(nrng, population, count, k, profile=None):
+    """Sortear k índices distintos por fila sobre range(population); devuelve array (count, k)"""
+    k = min(k, population)
+    idx = _indices(nrng, population, (count, k), profile)
+    for _ in range(DISTINCT_RETRIES):
+        ordered = np.sort(idx, axis=1)
+        repeated = np.any(ordered[:, 1:] == ordered[:, :-1], axis=1)
+        if not repeated.any():
+            return idx
+        idx[repeated] = _indices(nrng, population, (int(repeated.sum()), k), profile)
+
+    # Perfil demasiado concentrado (pocas claves con casi todo el peso): las
+    # filas que siguen repetidas se sortean sin reemplazo de forma uniforme
+    ordered = np.sort(idx, axis=1)
+    for row in np.flatnonzero(np.any(ordered[:, 1:] == ordered[:, :-1], axis=1)):
+        idx[row] = nrng.permutation(population)[:k]
+    return idx
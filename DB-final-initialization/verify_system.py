@@ -32,6 +32,13 @@ def check_imports():
         print("❌ faker_food - FALTA (pip install faker_food)")
         return False
     
+    try:
+        import numpy
+        print("✅ numpy - OK")
+    except ImportError:
+        print("❌ numpy - FALTA (pip install numpy)")
+        return False
+    
     return True
 
 def check_database_connection():